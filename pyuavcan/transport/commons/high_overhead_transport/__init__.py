@@ -17,4 +17,11 @@ none of the entities defined in this module can be used with CAN.
 from ._frame import Frame as Frame
 from ._transfer_serializer import serialize_transfer as serialize_transfer
 from ._transfer_reassembler import TransferReassembler as TransferReassembler
+from ._reassembler_table import ReassemblerTable as ReassemblerTable
+from ._transfer_queue import TransferQueue as TransferQueue
+from ._input_session import QueuedInputSession as QueuedInputSession
+from ._input_session import InputSessionStatistics as InputSessionStatistics
+from ._input_session import PromiscuousInputSessionStatistics as PromiscuousInputSessionStatistics
 from ._common import TransferCRC as TransferCRC
+from ._frame_diverting_session import FrameDivertingInputSession as FrameDivertingInputSession
+from ._frame_diverting_session import FrameHandler as FrameHandler
@@ -0,0 +1,39 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+import abc
+import typing
+from ._frame import Frame
+
+
+#: The arguments are the source node-ID and the frame.
+#: The source node-ID is passed separately because not every transport carries it in the frame.
+FrameHandler = typing.Callable[[int, Frame], None]
+
+
+class FrameDivertingInputSession(abc.ABC):
+    """
+    An input session of a high-overhead transport that can hand over the transfer reassembly to an external entity.
+    When a frame handler is installed, every valid frame from a non-anonymous source that has passed the
+    session-level checks (such as the data type hash check) is passed to the handler instead of the own
+    reassembler of the session, so the session does not emit the corresponding transfers.
+    Anonymous transfers are unaffected because they do not require reassembly.
+
+    This is used by the redundant transport to reassemble the transfers received over several interfaces
+    in one place, so that a transfer can be completed from the frames of different interfaces.
+    """
+
+    @abc.abstractmethod
+    def _set_frame_handler(self, handler: typing.Optional[FrameHandler]) -> None:
+        """
+        Installs the frame handler, replacing the previous one; None restores the normal operation.
+        The reassembly state of the session is not affected, so the transfers that were in progress when the
+        handler was installed may be completed by the session later.
+
+        This is a part of the transport-internal API. It's a public method despite the name because Python's
+        visibility handling capabilities are limited.
+        """
+        raise NotImplementedError
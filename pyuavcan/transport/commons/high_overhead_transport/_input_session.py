@@ -0,0 +1,113 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import abc
+import typing
+import logging
+import dataclasses
+import pyuavcan
+from ..._session import SessionStatistics   # Cannot be accessed via the package here because it is not initialized yet.
+from ._transfer_queue import TransferQueue
+from ._transfer_reassembler import TransferReassembler
+
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class InputSessionStatistics(SessionStatistics):
+    """
+    The statistics common for the input sessions of all high-overhead transports.
+    """
+    #: Keys are data type hash values collected from received frames that did not match the local type configuration.
+    #: Values are the number of times each hash value has been encountered.
+    mismatched_data_type_hashes: typing.Dict[int, int] = dataclasses.field(default_factory=dict)
+
+    #: Transfers discarded due to the overflow of the input queue (see ``transfer_queue_capacity``).
+    #: Their frames are also accounted for in the drop counter.
+    dropped_transfers: int = 0
+
+    #: Frames that were rejected early because they are copies of the frames received earlier,
+    #: which is normally caused by the service transfer multiplier (temporal redundancy).
+    #: Duplicates are not errors; they are also accounted for in the frame counter.
+    duplicate_frames: int = 0
+
+
+@dataclasses.dataclass
+class PromiscuousInputSessionStatistics(InputSessionStatistics):
+    """
+    The statistics of the input sessions that reassemble transfers from any remote node;
+    the reassembly-related fields are maintained by :class:`ReassemblerTable`.
+    """
+    #: The number of remote nodes whose transfer reassembly state is currently kept (see ``reassembler_idle_timeout``).
+    live_reassemblers: int = 0
+
+    #: The number of times the transfer reassembly state of a remote node was discarded due to inactivity.
+    evicted_reassemblers: int = 0
+
+    #: Keys are source node-IDs; values are dicts where keys are error enum members and values are counts.
+    #: The entry of a node is removed when its reassembly state is evicted unless there are errors recorded for it.
+    reassembly_errors_per_source_node_id: typing.Dict[int, typing.Dict[TransferReassembler.Error, int]] = \
+        dataclasses.field(default_factory=dict)
+
+
+class QueuedInputSession(abc.ABC):
+    """
+    An input session of a high-overhead transport that stores the received transfers in a :class:`TransferQueue`
+    until they are consumed by the application.
+    The implementation shall assign the queue instance to ``_queue`` in its constructor.
+    """
+    _queue: TransferQueue
+
+    @property
+    def transfer_queue_capacity(self) -> typing.Optional[int]:
+        """
+        Capacity of the input transfer queue. None means that the capacity is unlimited, which is the default.
+        This may deplete the heap if input transfers are not consumed quickly enough so beware.
+
+        When the queue is full, a transfer is discarded according to :attr:`transfer_queue_overflow_policy`
+        and the drop counters are incremented accordingly.
+        If the capacity is changed and the new value is smaller than the number of transfers currently in the queue,
+        the excess transfers are discarded in the same manner.
+        If the value is not None, it must be a positive integer, otherwise you get a :class:`ValueError`.
+        """
+        return self._queue.capacity
+
+    @transfer_queue_capacity.setter
+    def transfer_queue_capacity(self, value: typing.Optional[int]) -> None:
+        for tr in self._queue.set_capacity(value):
+            self._register_dropped_transfer(tr)
+
+    @property
+    def transfer_queue_overflow_policy(self) -> TransferQueue.OverflowPolicy:
+        """
+        Which transfer to discard when the queue is full: the newest one (default) or the oldest one.
+        Dropping the oldest transfer is usually preferable for data that loses its value with age, such as telemetry.
+        """
+        return self._queue.overflow_policy
+
+    @transfer_queue_overflow_policy.setter
+    def transfer_queue_overflow_policy(self, value: TransferQueue.OverflowPolicy) -> None:
+        self._queue.overflow_policy = value
+
+    def _enqueue_transfer(self, transfer: pyuavcan.transport.TransferFrom) -> None:
+        """
+        Pushes the transfer into the queue; if the queue is full, the discarded transfer is accounted for.
+        """
+        dropped = self._queue.push(transfer)
+        if dropped is not None:
+            self._register_dropped_transfer(dropped)
+
+    def _register_dropped_transfer(self, transfer: pyuavcan.transport.TransferFrom) -> None:
+        self._statistics.dropped_transfers += 1
+        self._statistics.drops += len(transfer.fragmented_payload)
+        _logger.info('%s: Input queue overflow; transfer %s is dropped', self, transfer)
+
+    @property
+    @abc.abstractmethod
+    def _statistics(self) -> InputSessionStatistics:
+        raise NotImplementedError
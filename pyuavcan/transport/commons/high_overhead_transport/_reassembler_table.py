@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import typing
+import logging
+import pyuavcan
+from ._transfer_reassembler import TransferReassembler
+from ._input_session import PromiscuousInputSessionStatistics
+
+
+_logger = logging.getLogger(__name__)
+
+
+class ReassemblerTable:
+    """
+    The transfer reassemblers of an input session that accepts transfers from any remote node, one per node-ID.
+
+    The reassembler of a remote node that has not sent any frames for longer than :attr:`idle_timeout`
+    is discarded (evicted), so that the memory footprint is proportional to the number of active remote nodes
+    rather than to the number of nodes ever seen (which matters for long-running monitors on networks
+    with address churn).
+    A reassembler is never evicted before the transfer-ID timeout has expired, because until then its state
+    is needed for deduplication; afterwards, a newly created reassembler behaves identically.
+    Incomplete transfers from the evicted node are lost.
+    The eviction is performed when a reassembler is requested, the amortized complexity is constant.
+
+    The reassembly-related counters (and the total error counter) of the supplied statistics instance
+    are kept up to date by the table.
+    """
+    #: Units are seconds. Can be overridden after instantiation if needed.
+    DEFAULT_IDLE_TIMEOUT = 60.0
+
+    def __init__(self,
+                 max_payload_size_bytes: int,
+                 statistics:             PromiscuousInputSessionStatistics,
+                 contiguous_payload:     bool = False):
+        """
+        :param max_payload_size_bytes: Passed to every reassembler, see :class:`TransferReassembler`.
+
+        :param statistics: The statistics instance owned by the session.
+
+        :param contiguous_payload: Passed to every reassembler, see :class:`TransferReassembler`.
+        """
+        self._max_payload_size_bytes = int(max_payload_size_bytes)
+        self._statistics = statistics
+        self._contiguous_payload = bool(contiguous_payload)
+        self._idle_timeout = self.DEFAULT_IDLE_TIMEOUT
+        # Ordered by the time of the last frame, oldest first (a dict preserves the insertion order).
+        # The values are the reassembler and the monotonic timestamp of its last frame in nanoseconds.
+        self._reassemblers: typing.Dict[int, typing.Tuple[TransferReassembler, int]] = {}
+
+    @property
+    def idle_timeout(self) -> float:
+        """
+        The reassembler of a remote node that has not sent any frames for this long is evicted.
+        Units are seconds; the value shall be positive, otherwise you get a :class:`ValueError`.
+        """
+        return self._idle_timeout
+
+    @idle_timeout.setter
+    def idle_timeout(self, value: float) -> None:
+        if value > 0:
+            self._idle_timeout = float(value)
+        else:
+            raise ValueError(f'Invalid value for reassembler idle timeout [second]: {value}')
+
+    def get(self, source_node_id: int, monotonic_ns: int, transfer_id_timeout: float) -> TransferReassembler:
+        """
+        Returns the reassembler of the specified remote node, creating it if there is none,
+        and marks the node active at the specified time; idle reassemblers are evicted beforehand.
+        The transfer-ID timeout [second] shall be the one the caller is going to use with the reassembler.
+        """
+        self._evict_idle(monotonic_ns, transfer_id_timeout)
+        try:
+            reasm, _ = self._reassemblers.pop(source_node_id)   # Re-inserted below to move it to the end.
+        except LookupError:
+            def on_reassembly_error(error: TransferReassembler.Error) -> None:
+                self._statistics.errors += 1
+                d = self._statistics.reassembly_errors_per_source_node_id[source_node_id]
+                try:
+                    d[error] += 1
+                except LookupError:
+                    d[error] = 1
+
+            self._statistics.reassembly_errors_per_source_node_id.setdefault(source_node_id, {})
+            reasm = TransferReassembler(source_node_id=source_node_id,
+                                        max_payload_size_bytes=self._max_payload_size_bytes,
+                                        on_error_callback=on_reassembly_error,
+                                        contiguous_payload=self._contiguous_payload)
+            _logger.debug('%s: New %s (%d total)', self, reasm, len(self._reassemblers) + 1)
+        self._reassemblers[source_node_id] = reasm, monotonic_ns
+        self._statistics.live_reassemblers = len(self._reassemblers)
+        return reasm
+
+    def clear(self) -> None:
+        """
+        Discards all reassemblers; the transfers whose reassembly is in progress are lost.
+        This is not counted as eviction.
+        """
+        self._reassemblers.clear()
+        self._statistics.live_reassemblers = 0
+
+    def __len__(self) -> int:
+        return len(self._reassemblers)
+
+    def _evict_idle(self, monotonic_ns: int, transfer_id_timeout: float) -> None:
+        horizon_ns = round(max(self._idle_timeout, transfer_id_timeout) * 1e9)
+        while self._reassemblers:
+            source_node_id, (reasm, last_ns) = next(iter(self._reassemblers.items()))
+            if monotonic_ns - last_ns <= horizon_ns:
+                break
+            del self._reassemblers[source_node_id]
+            self._statistics.evicted_reassemblers += 1
+            if not self._statistics.reassembly_errors_per_source_node_id.get(source_node_id):
+                self._statistics.reassembly_errors_per_source_node_id.pop(source_node_id, None)
+            _logger.debug('%s: Evicted idle %s (%d remaining)', self, reasm, len(self._reassemblers))
+        self._statistics.live_reassemblers = len(self._reassemblers)
+
+    def __repr__(self) -> str:
+        return pyuavcan.util.repr_attributes_noexcept(self,
+                                                      live=len(self._reassemblers),
+                                                      idle_timeout=self._idle_timeout)
+
+
+def _unittest_reassembler_table() -> None:
+    from pytest import raises, approx
+    from pyuavcan.transport import Timestamp, Priority
+    from ._frame import Frame
+
+    st = PromiscuousInputSessionStatistics()
+    tab = ReassemblerTable(100, st)
+    assert tab.idle_timeout == approx(ReassemblerTable.DEFAULT_IDLE_TIMEOUT)
+    with raises(ValueError):
+        tab.idle_timeout = 0
+    tab.idle_timeout = 10.0
+
+    def get(monotonic: float, source_node_id: int, transfer_id_timeout: float = 1.0) -> TransferReassembler:
+        return tab.get(source_node_id, round(monotonic * 1e9), transfer_id_timeout)
+
+    r1 = get(100.0, 1)
+    assert get(101.0, 1) is r1
+    r2 = get(102.0, 2)
+    r2.process_frame(Frame(timestamp=Timestamp.now(),       # Reassembly error: empty frame in a multi-frame transfer.
+                           priority=Priority.NOMINAL,
+                           transfer_id=0,
+                           index=0,
+                           end_of_transfer=False,
+                           payload=memoryview(b'')), 1.0)
+    get(103.0, 3)
+    assert len(tab) == 3
+    assert st.live_reassemblers == 3
+    assert st.errors == 1
+    assert st.reassembly_errors_per_source_node_id == {
+        1: {},
+        2: {TransferReassembler.Error.MULTIFRAME_EMPTY_FRAME: 1},
+        3: {},
+    }
+
+    get(112.5, 4)       # Nodes 1 and 2 are evicted, the error entry of node 2 is kept.
+    assert len(tab) == 2
+    assert st.live_reassemblers == 2
+    assert st.evicted_reassemblers == 2
+    assert st.reassembly_errors_per_source_node_id.keys() == {2, 3, 4}
+    assert get(112.5, 1) is not r1
+
+    get(200.0, 5, transfer_id_timeout=100.0)    # The horizon is never shorter than the transfer-ID timeout.
+    assert len(tab) == 4
+    get(200.0, 5)
+    assert len(tab) == 1
+    assert st.evicted_reassemblers == 5
+
+    tab.clear()
+    assert len(tab) == 0
+    assert st.live_reassemblers == 0
+    assert st.evicted_reassemblers == 5
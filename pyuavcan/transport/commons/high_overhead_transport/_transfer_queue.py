@@ -0,0 +1,156 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import enum
+import typing
+import asyncio
+import pyuavcan
+
+
+class TransferQueue:
+    """
+    The queue of received transfers awaiting consumption by the application, optionally bounded.
+    When the queue is full, either the newest transfer (the one being pushed) or the oldest transfer
+    (the one at the head of the queue) is discarded, depending on the overflow policy.
+    Dropping the oldest transfers is preferred when the data loses its value with age (e.g., telemetry),
+    because it keeps the queue populated with the most recent data.
+
+    The underlying asyncio queue is never replaced, so a capacity change does not affect pending readers.
+    """
+    class OverflowPolicy(enum.Enum):
+        #: The transfer that does not fit into the queue is discarded. This is the default.
+        DROP_NEWEST = enum.auto()
+
+        #: The oldest transfer in the queue is discarded to make room for the new one.
+        DROP_OLDEST = enum.auto()
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[pyuavcan.transport.TransferFrom] = asyncio.Queue()
+        self._capacity: typing.Optional[int] = None
+        self._overflow_policy = TransferQueue.OverflowPolicy.DROP_NEWEST
+
+    @property
+    def capacity(self) -> typing.Optional[int]:
+        """
+        None means that the capacity is unlimited, which is the default.
+        If the new capacity is smaller than the number of transfers currently in the queue,
+        the excess transfers are discarded according to the overflow policy and returned to the caller
+        (the setter cannot return anything, so use :meth:`set_capacity` instead if that is needed).
+        If the value is not None, it must be a positive integer, otherwise you get a :class:`ValueError`.
+        """
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, value: typing.Optional[int]) -> None:
+        self.set_capacity(value)
+
+    def set_capacity(self, value: typing.Optional[int]) -> typing.List[pyuavcan.transport.TransferFrom]:
+        """
+        Same as the capacity setter, but returns the discarded transfers, oldest first.
+        The complexity may be up to linear of the number of transfers currently in the queue.
+        """
+        if value is not None and not value > 0:
+            raise ValueError(f'Invalid value for queue capacity: {value}')
+        self._capacity = int(value) if value is not None else None
+        if self._capacity is None or self._queue.qsize() <= self._capacity:
+            return []
+
+        items = [self._queue.get_nowait() for _ in range(self._queue.qsize())]
+        if self._overflow_policy == TransferQueue.OverflowPolicy.DROP_OLDEST:
+            dropped, items = items[:-self._capacity], items[-self._capacity:]
+        else:
+            dropped, items = items[self._capacity:], items[:self._capacity]
+        for it in items:
+            self._queue.put_nowait(it)
+        return dropped
+
+    @property
+    def overflow_policy(self) -> TransferQueue.OverflowPolicy:
+        return self._overflow_policy
+
+    @overflow_policy.setter
+    def overflow_policy(self, value: TransferQueue.OverflowPolicy) -> None:
+        if not isinstance(value, TransferQueue.OverflowPolicy):
+            raise ValueError(f'Invalid overflow policy: {value!r}')
+        self._overflow_policy = value
+
+    def push(self, transfer: pyuavcan.transport.TransferFrom) -> typing.Optional[pyuavcan.transport.TransferFrom]:
+        """
+        :returns: The discarded transfer if the queue has overflowed (which may be the argument itself), else None.
+        """
+        dropped: typing.Optional[pyuavcan.transport.TransferFrom] = None
+        if self._capacity is not None and self._queue.qsize() >= self._capacity:
+            if self._overflow_policy == TransferQueue.OverflowPolicy.DROP_NEWEST:
+                return transfer
+            dropped = self._queue.get_nowait()
+        self._queue.put_nowait(transfer)
+        return dropped
+
+    async def get(self) -> pyuavcan.transport.TransferFrom:
+        return await self._queue.get()
+
+    def get_nowait(self) -> pyuavcan.transport.TransferFrom:
+        """
+        :raises: :class:`asyncio.QueueEmpty`
+        """
+        return self._queue.get_nowait()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def __repr__(self) -> str:
+        return pyuavcan.util.repr_attributes_noexcept(self,
+                                                      size=len(self),
+                                                      capacity=self._capacity,
+                                                      overflow_policy=self._overflow_policy)
+
+
+def _unittest_transfer_queue() -> None:
+    from pytest import raises
+    from pyuavcan.transport import TransferFrom, Priority, Timestamp
+
+    def mk(transfer_id: int) -> TransferFrom:
+        return TransferFrom(timestamp=Timestamp.now(),
+                            priority=Priority.NOMINAL,
+                            transfer_id=transfer_id,
+                            fragmented_payload=[],
+                            source_node_id=None)
+
+    def drain() -> typing.List[int]:
+        out: typing.List[int] = []
+        while len(q) > 0:
+            out.append(q.get_nowait().transfer_id)
+        return out
+
+    q = TransferQueue()
+    assert q.capacity is None
+    assert q.overflow_policy == TransferQueue.OverflowPolicy.DROP_NEWEST
+    with raises(ValueError):
+        q.capacity = 0
+    with raises(ValueError):
+        q.overflow_policy = 'DROP_OLDEST'   # type: ignore
+
+    assert all(q.push(mk(i)) is None for i in range(5))   # Unlimited.
+    assert len(q) == 5
+    assert [x.transfer_id for x in q.set_capacity(3)] == [3, 4]
+    assert q.capacity == 3
+    assert q.push(mk(5)).transfer_id == 5   # type: ignore
+    assert drain() == [0, 1, 2]
+
+    q.overflow_policy = TransferQueue.OverflowPolicy.DROP_OLDEST
+    assert all(q.push(mk(i)) is None for i in range(3))
+    assert q.push(mk(3)).transfer_id == 0   # type: ignore
+    assert q.push(mk(4)).transfer_id == 1   # type: ignore
+    assert [x.transfer_id for x in q.set_capacity(1)] == [2, 3]
+    assert drain() == [4]
+    print(q)
+
+    q.capacity = None
+    assert all(q.push(mk(i)) is None for i in range(100))
+    assert drain() == list(range(100))
+    with raises(asyncio.QueueEmpty):
+        q.get_nowait()
@@ -18,6 +18,8 @@ _logger = logging.getLogger(__name__)
 
 _CRC_SIZE_BYTES = len(TransferCRC().value_as_bytes)
 
+_EMPTY = memoryview(b'')
+
 
 class TransferReassembler:
     """
@@ -43,6 +45,9 @@ class TransferReassembler:
     Distantly relevant discussion: https://github.com/UAVCAN/specification/issues/8.
 
     A multi-frame transfer shall not contain frames with empty payload.
+
+    The bookkeeping is incremental: the number of received frames and the number of accumulated payload bytes
+    are updated per frame, so the processing cost per frame does not depend on the number of frames in the transfer.
     """
     class Error(enum.Enum):
         """
@@ -73,7 +78,8 @@ class TransferReassembler:
     def __init__(self,
                  source_node_id:         int,
                  max_payload_size_bytes: int,
-                 on_error_callback:      typing.Callable[[TransferReassembler.Error], None]):
+                 on_error_callback:      typing.Callable[[TransferReassembler.Error], None],
+                 contiguous_payload:     bool = False):
         """
         :param source_node_id: The remote node-ID whose transfers this instance will be listening for.
             Anonymous transfers cannot be multi-frame transfers, so they are to be accepted as-is without any
@@ -85,19 +91,32 @@ class TransferReassembler:
         :param on_error_callback: The callback is invoked whenever an error is detected.
             This is intended for diagnostic purposes only; the error information is not actionable.
             The error is logged by the caller at the DEBUG verbosity level together with reassembly context info.
+
+        :param contiguous_payload: If True, the payload of a reassembled multi-frame transfer will be copied into one
+            buffer allocated at once (its size is known exactly by the time the last frame is received),
+            so that the transfer is delivered as a single contiguous fragment.
+            This costs one copy of the payload but relieves the consumer from having to deal with fragmentation,
+            and releases the memory of the received frames (e.g., socket receive buffers) as soon as the
+            transfer is reassembled.
+            If False (default), the fragments are delivered as-is (one per frame), which is zero-copy.
+            Single-frame transfers are always delivered as-is.
         """
         # Constant configuration.
         self._source_node_id = int(source_node_id)
         self._max_payload_size_bytes = int(max_payload_size_bytes)
         self._on_error_callback = on_error_callback
+        self._contiguous_payload = bool(contiguous_payload)
         if self._source_node_id < 0 or self._max_payload_size_bytes < 0 or not callable(self._on_error_callback):
             raise ValueError('Invalid parameters')
 
         # Internal state.
         self._payloads: typing.List[memoryview] = []            # Payload fragments from the received frames.
+        self._num_received_frames = 0                           # Number of non-empty slots in the above.
+        self._num_received_bytes = 0                            # Total length of the fragments in the above.
         self._max_index: typing.Optional[int] = None            # Max frame index in transfer, None if unknown.
         self._timestamp = pyuavcan.transport.Timestamp(0, 0)    # First frame timestamp.
         self._transfer_id = 0                                   # Transfer-ID of the current transfer.
+        self._completed_transfer_id: typing.Optional[int] = None  # Transfer-ID of the last completed transfer.
 
     def process_frame(self,
                       frame:               Frame,
@@ -145,9 +164,15 @@ class TransferReassembler:
             return None
 
         # ACCEPT THE PAYLOAD. Duplicates are accepted too, assuming they carry the same payload.
-        while len(self._payloads) <= frame.index:
-            self._payloads.append(memoryview(b''))
+        if frame.index >= len(self._payloads):
+            self._payloads.extend([_EMPTY] * (frame.index + 1 - len(self._payloads)))
+        previous = self._payloads[frame.index]
+        if previous:
+            self._num_received_bytes -= len(previous)   # Duplicate, replace the old payload.
+        elif frame.payload:
+            self._num_received_frames += 1
         self._payloads[frame.index] = frame.payload
+        self._num_received_bytes += len(frame.payload)
 
         # ENFORCE PAYLOAD SIZE LIMIT. Don't let a babbling sender exhaust our memory quota.
         if self._pure_payload_size_bytes > self._max_payload_size_bytes:
@@ -158,23 +183,46 @@ class TransferReassembler:
 
         # CHECK IF ALL FRAMES ARE RECEIVED. If not, simply wait for next frame.
         # Single-frame transfers with empty payload are legal.
-        if self._max_index is None or (self._max_index > 0 and not all(self._payloads)):
+        if self._max_index is None or (self._max_index > 0 and self._num_received_frames <= self._max_index):
             return None
         assert self._max_index is not None
         assert self._max_index == len(self._payloads) - 1
-        assert all(self._payloads) if self._max_index > 0 else True
+        assert self._num_received_frames == len(self._payloads) if self._max_index > 0 else True
 
         # FINALIZE THE TRANSFER. All frames are received here.
+        frame_payloads = self._payloads
+        if self._contiguous_payload and len(frame_payloads) > 1:
+            frame_payloads = [_concatenate(frame_payloads, self._num_received_bytes)]
         result = _validate_and_finalize_transfer(timestamp=self._timestamp,
                                                  priority=frame.priority,
                                                  transfer_id=frame.transfer_id,
-                                                 frame_payloads=self._payloads,
-                                                 source_node_id=self._source_node_id)
+                                                 frame_payloads=frame_payloads,
+                                                 source_node_id=self._source_node_id,
+                                                 multi_frame=len(self._payloads) > 1)
         self._restart(frame.timestamp,
                       frame.transfer_id + 1,
                       self.Error.MULTIFRAME_INTEGRITY_ERROR if result is None else None)
+        if result is not None:
+            self._completed_transfer_id = frame.transfer_id
         return result
 
+    def is_duplicate(self, frame: Frame, transfer_id_timeout: float) -> bool:
+        """
+        Checks whether the frame is a copy of a frame that has already been accepted, that is,
+        it belongs to the last completed transfer, or its index has already been received in the transfer
+        that is currently being reassembled. Such frames occur with temporal redundancy (e.g., the service transfer
+        multiplier), where every transfer is emitted several times.
+
+        Duplicates do not affect the outcome of :meth:`process_frame`, so they can be rejected using this
+        cheap check before the frame is processed (the payload is not inspected).
+        A frame received after the transfer-ID timeout has expired is never considered a duplicate.
+        """
+        if frame.timestamp.monotonic_ns - self._timestamp.monotonic_ns > transfer_id_timeout * 1e9:
+            return False
+        if frame.transfer_id == self._transfer_id:
+            return frame.index < len(self._payloads) and bool(self._payloads[frame.index])
+        return frame.transfer_id == self._completed_transfer_id
+
     @property
     def source_node_id(self) -> int:
         return self._source_node_id
@@ -190,7 +238,7 @@ class TransferReassembler:
                     'ts':      self._timestamp,
                     'tid':     self._transfer_id,
                     'max_idx': self._max_index,
-                    'payload': f'{len(list(x for x in self._payloads if x))}/{len(self._payloads)}',
+                    'payload': f'{self._num_received_frames}/{len(self._payloads)}',
                 }
                 _logger.debug(f'{self}: {error.name}: ' + ' '.join(f'{k}={v}' for k, v in context.items()))
         # The error must be processed before the state is reset because when the state is destroyed
@@ -199,11 +247,13 @@ class TransferReassembler:
         self._transfer_id = transfer_id
         self._max_index = None
         self._payloads = []
+        self._num_received_frames = 0
+        self._num_received_bytes = 0
 
     @property
     def _pure_payload_size_bytes(self) -> int:
         """May return a negative if the transfer is malformed."""
-        size = sum(map(len, self._payloads))
+        size = self._num_received_bytes
         if len(self._payloads) > 1:
             size -= _CRC_SIZE_BYTES
         return size
@@ -235,7 +285,8 @@ def _validate_and_finalize_transfer(timestamp:      pyuavcan.transport.Timestamp
                                     priority:       pyuavcan.transport.Priority,
                                     transfer_id:    int,
                                     frame_payloads: typing.List[memoryview],
-                                    source_node_id: int) -> typing.Optional[pyuavcan.transport.TransferFrom]:
+                                    source_node_id: int,
+                                    multi_frame:    bool) -> typing.Optional[pyuavcan.transport.TransferFrom]:
     assert all(isinstance(x, memoryview) for x in frame_payloads)
     assert frame_payloads
 
@@ -246,7 +297,7 @@ def _validate_and_finalize_transfer(timestamp:      pyuavcan.transport.Timestamp
                                                fragmented_payload=fragmented_payload,
                                                source_node_id=source_node_id)
 
-    if len(frame_payloads) > 1:
+    if multi_frame:
         size_ok = sum(map(len, frame_payloads)) > _CRC_SIZE_BYTES
         crc_ok = TransferCRC.new(*frame_payloads).check_residue()
         return package(_drop_crc(frame_payloads)) if size_ok and crc_ok else None
@@ -254,6 +305,16 @@ def _validate_and_finalize_transfer(timestamp:      pyuavcan.transport.Timestamp
         return package(frame_payloads)
 
 
+def _concatenate(fragments: typing.Sequence[memoryview], total_size: int) -> memoryview:
+    buf = bytearray(total_size)
+    offset = 0
+    for frag in fragments:
+        buf[offset:offset + len(frag)] = frag
+        offset += len(frag)
+    assert offset == total_size
+    return memoryview(buf)
+
+
 def _drop_crc(fragments: typing.List[memoryview]) -> typing.Sequence[memoryview]:
     remaining = _CRC_SIZE_BYTES
     while fragments and remaining > 0:
@@ -692,6 +753,94 @@ def _unittest_transfer_reassembler() -> None:
     }
 
 
+def _unittest_transfer_reassembler_contiguous() -> None:
+    import random
+    from pyuavcan.transport import Priority, Timestamp
+
+    rng = random.Random(1234)
+    errors: typing.List[TransferReassembler.Error] = []
+    payload = bytes(rng.getrandbits(8) for _ in range(10_000))
+    crc = TransferCRC.new(payload).value_as_bytes
+    chunks = [payload[i:i + 17] for i in range(0, len(payload), 17)]
+    chunks[-1] += crc
+
+    def mk_frames(transfer_id: int) -> typing.List[Frame]:
+        ts = Timestamp.now()
+        return [
+            Frame(timestamp=ts,
+                  priority=Priority.LOW,
+                  transfer_id=transfer_id,
+                  index=index,
+                  end_of_transfer=index == len(chunks) - 1,
+                  payload=memoryview(chunk))
+            for index, chunk in enumerate(chunks)
+        ]
+
+    for contiguous in (False, True):
+        ta = TransferReassembler(source_node_id=123,
+                                 max_payload_size_bytes=len(payload),
+                                 on_error_callback=errors.append,
+                                 contiguous_payload=contiguous)
+        # Shuffled and some frames duplicated; hundreds of frames per transfer.
+        # The last frame to arrive is not duplicated, otherwise the transfer would be completed earlier.
+        frames = mk_frames(1)
+        rng.shuffle(frames)
+        last = frames.pop(-1)
+        frames += frames[::7]
+        rng.shuffle(frames)
+        for f in frames:
+            assert ta.process_frame(f, 1.0) is None
+        tr = ta.process_frame(last, 1.0)
+        assert tr is not None
+        assert b''.join(tr.fragmented_payload) == payload
+        assert len(tr.fragmented_payload) == (1 if contiguous else len(chunks))
+        assert tr.transfer_id == 1 and tr.source_node_id == 123
+
+    assert not errors
+
+    # Exceeding the size limit by one byte.
+    ta = TransferReassembler(source_node_id=123,
+                             max_payload_size_bytes=len(payload) - 1,
+                             on_error_callback=errors.append,
+                             contiguous_payload=True)
+    assert all(ta.process_frame(f, 1.0) is None for f in mk_frames(2))
+    assert errors == [TransferReassembler.Error.PAYLOAD_SIZE_EXCEEDS_LIMIT]
+
+
+def _unittest_transfer_reassembler_duplicates() -> None:
+    from pyuavcan.transport import Priority, Timestamp
+
+    errors: typing.List[TransferReassembler.Error] = []
+    payload = b'0123456789'
+    chunks = [payload[:5], payload[5:] + TransferCRC.new(payload).value_as_bytes]
+    ta = TransferReassembler(source_node_id=123, max_payload_size_bytes=100, on_error_callback=errors.append)
+
+    def mk(transfer_id: int, index: int, monotonic_ns: int = 0) -> Frame:
+        return Frame(timestamp=Timestamp(system_ns=0, monotonic_ns=monotonic_ns),
+                     priority=Priority.LOW,
+                     transfer_id=transfer_id,
+                     index=index,
+                     end_of_transfer=index == len(chunks) - 1,
+                     payload=memoryview(chunks[index]))
+
+    assert not ta.is_duplicate(mk(0, 0), 1.0)
+    assert ta.process_frame(mk(0, 0), 1.0) is None
+    assert ta.is_duplicate(mk(0, 0), 1.0)           # Already received in the current transfer.
+    assert not ta.is_duplicate(mk(0, 1), 1.0)
+    assert ta.process_frame(mk(0, 1), 1.0) is not None
+    assert ta.is_duplicate(mk(0, 0), 1.0)           # Belongs to the completed transfer.
+    assert ta.is_duplicate(mk(0, 1), 1.0)
+    assert not ta.is_duplicate(mk(1, 0), 1.0)
+    assert not ta.is_duplicate(mk(0, 0, 2 * 10 ** 9), 1.0)   # Transfer-ID timeout.
+
+    # A duplicate of a transfer that failed to complete is not recognized as such.
+    assert ta.process_frame(mk(1, 0), 1.0) is None
+    assert ta.process_frame(mk(2, 0), 1.0) is None
+    assert errors == [TransferReassembler.Error.MULTIFRAME_MISSING_FRAMES]
+    assert not ta.is_duplicate(mk(1, 1), 1.0)
+    assert ta.is_duplicate(mk(0, 1), 1.0)
+
+
 def _unittest_transfer_reassembler_anonymous() -> None:
     from pyuavcan.transport import Timestamp, Priority, TransferFrom
 
@@ -749,7 +898,8 @@ def _unittest_validate_and_finalize_transfer() -> None:
                                                priority=prio,
                                                transfer_id=tid,
                                                frame_payloads=list(map(memoryview, fp)),
-                                               source_node_id=src_nid)
+                                               source_node_id=src_nid,
+                                               multi_frame=len(fp) > 1)
 
     assert call([b'']) == mk_transfer([b''])
     assert call([b'hello world']) == mk_transfer([b'hello world'])
@@ -758,6 +908,16 @@ def _unittest_validate_and_finalize_transfer() -> None:
     ]) == mk_transfer([b'hello world', b'0123456789'])
     assert call([b'hello world', b'0123456789']) is None  # no CRC
 
+    # A multi-frame transfer that has been concatenated into one fragment.
+    assert _validate_and_finalize_transfer(
+        timestamp=ts,
+        priority=prio,
+        transfer_id=tid,
+        frame_payloads=[memoryview(b'hello world' + TransferCRC.new(b'hello world').value_as_bytes)],
+        source_node_id=src_nid,
+        multi_frame=True,
+    ) == mk_transfer([b'hello world'])
+
 
 # noinspection PyProtectedMember
 def _unittest_drop_crc() -> None:
@@ -42,6 +42,7 @@ class LoopbackOutputSession(pyuavcan.transport.OutputSession):
         self._feedback_handler: typing.Optional[typing.Callable[[pyuavcan.transport.Feedback], None]] = None
         self._injected_exception: typing.Optional[Exception] = None
         self._should_timeout = False
+        self._delay = 0.0
 
     def enable_feedback(self, handler: typing.Callable[[pyuavcan.transport.Feedback], None]) -> None:
         self._feedback_handler = handler
@@ -53,7 +54,13 @@ class LoopbackOutputSession(pyuavcan.transport.OutputSession):
         if self._injected_exception is not None:
             raise self._injected_exception
 
-        out = False if self._should_timeout else await self._router(transfer, monotonic_deadline)
+        timed_out = self._should_timeout
+        if self._delay > 0:
+            remaining = max(0.0, monotonic_deadline - self._loop.time())
+            timed_out = timed_out or self._delay > remaining
+            await asyncio.sleep(min(self._delay, remaining))
+
+        out = False if timed_out else await self._router(transfer, monotonic_deadline)
         if out:
             self._stats.transfers += 1
             self._stats.frames += 1
@@ -105,6 +112,22 @@ class LoopbackOutputSession(pyuavcan.transport.OutputSession):
     def should_timeout(self, value: bool) -> None:
         self._should_timeout = bool(value)
 
+    @property
+    def delay(self) -> float:
+        """
+        This is a test rigging.
+        If positive, :func:`send_until` waits this many seconds before sending, emulating a congested medium.
+        If the deadline is reached while waiting, the transfer times out.
+        """
+        return self._delay
+
+    @delay.setter
+    def delay(self, value: float) -> None:
+        if value >= 0:
+            self._delay = float(value)
+        else:
+            raise ValueError(f'Invalid value for delay [second]: {value}')
+
 
 def _unittest_session() -> None:
     closed = False
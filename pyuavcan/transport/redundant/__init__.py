@@ -42,6 +42,16 @@ In accordance with its design goals, PyUAVCAN implements the transfer-level redu
 since it offers greater flexibility and a wider set of available design options.
 It is expected though that real-time embedded applications may often find frame-level redundancy preferable.
 
+As a middle ground, the frames received by the inferiors of high-overhead transports (such as UDP and serial)
+configured with the same MTU can be reassembled by one state machine shared by all interfaces,
+while the transfers are still deduplicated and delivered as usual.
+This mode is enabled via :attr:`RedundantTransport.frame_level_redundancy`.
+
+By default, every outgoing transfer is sent via all inferiors.
+If the links differ in cost (e.g., a shared radio channel next to a wired network),
+an :class:`InferiorSelector` such as :class:`HealthScoringSelector` can be installed on an output session
+to send the transfers via the healthiest inferiors only, falling back to the others if the selected ones fail.
+
 This implementation uses the term *inferior* to refer to a member of a redundant group:
 
 - *Inferior transport* is a transport that belongs to a redundant transport group.
@@ -368,4 +378,8 @@ from ._session import RedundantOutputSession as RedundantOutputSession
 from ._session import RedundantSessionStatistics as RedundantSessionStatistics
 from ._session import RedundantFeedback as RedundantFeedback
 
+from ._selector import InferiorSelector as InferiorSelector
+from ._selector import HealthScoringSelector as HealthScoringSelector
+from ._selector import InferiorHealth as InferiorHealth
+
 from ._error import InconsistentInferiorConfigurationError as InconsistentInferiorConfigurationError
@@ -15,3 +15,63 @@ class Deduplicator(abc.ABC):
                                transfer_id_timeout: float,
                                transfer:            pyuavcan.transport.TransferFrom) -> bool:
         raise NotImplementedError
+
+
+class RemoteStateTable:
+    """
+    The deduplication state of every remote node stored in flat preallocated lists indexed by node-ID,
+    so that there are no per-node objects on the heap and the lookup cost does not depend on the number of nodes.
+    If a similar architecture is used on an embedded system, these would be static arrays.
+    The lists are grown geometrically if a node-ID beyond the preallocated capacity is encountered.
+    Plain lists are used rather than NumPy arrays because the state is accessed one element at a time,
+    where the boxing of NumPy scalars would dominate the cost.
+
+    >>> t = RemoteStateTable(4)
+    >>> t.is_known(2), t.is_known(100)
+    (False, False)
+    >>> t.update(100, iface_index=1, transfer_id=2 ** 64 - 1, monotonic_ns=123)
+    >>> t.is_known(100), t.last_transfer_id[100], t.last_monotonic_ns[100], t.iface_index[100]
+    (True, 18446744073709551615, 123, 1)
+    >>> t.capacity >= 101
+    True
+    """
+
+    #: This value of the interface index marks the nodes that have not been seen yet.
+    UNKNOWN_IFACE_INDEX = -1
+
+    def __init__(self, capacity: int = 128) -> None:
+        """
+        :param capacity: The number of node-IDs to preallocate the state for.
+            The default matches the node-ID space of UAVCAN/CAN.
+        """
+        capacity = int(capacity)
+        if capacity < 1:
+            raise ValueError(f'Invalid remote state table capacity: {capacity}')
+        self.last_transfer_id = [0] * capacity
+        self.last_monotonic_ns = [0] * capacity
+        self.iface_index = [self.UNKNOWN_IFACE_INDEX] * capacity
+
+    @property
+    def capacity(self) -> int:
+        return len(self.iface_index)
+
+    def is_known(self, node_id: int) -> bool:
+        return node_id < len(self.iface_index) and self.iface_index[node_id] != self.UNKNOWN_IFACE_INDEX
+
+    def update(self, node_id: int, iface_index: int, transfer_id: int, monotonic_ns: int) -> None:
+        if node_id >= len(self.iface_index):
+            self.grow(node_id + 1)
+        self.last_transfer_id[node_id] = transfer_id
+        self.last_monotonic_ns[node_id] = monotonic_ns
+        self.iface_index[node_id] = iface_index
+
+    def grow(self, min_capacity: int) -> None:
+        """
+        Ensures that the capacity is at least the specified value. The deduplicators write the state directly
+        into the lists on the hot path, so they invoke this method explicitly before that.
+        """
+        if min_capacity > len(self.iface_index):
+            extra = max(min_capacity, len(self.iface_index) * 2) - len(self.iface_index)
+            self.last_transfer_id += [0] * extra
+            self.last_monotonic_ns += [0] * extra
+            self.iface_index += [self.UNKNOWN_IFACE_INDEX] * extra
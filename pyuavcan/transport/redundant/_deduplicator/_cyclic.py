@@ -5,58 +5,81 @@
 #
 
 import typing
-import dataclasses
 import pyuavcan.transport
-from ._base import Deduplicator
+from ._base import Deduplicator, RemoteStateTable
 
 
 class CyclicDeduplicator(Deduplicator):
+    """
+    Transfers from a remote node are accepted from the interface that delivered the latest transfer.
+    A transfer from another interface is accepted if it is new, which is the case if its transfer-ID
+    is ahead of the last accepted one by less than half of the transfer-ID modulo (the forward distance
+    in the modular arithmetic), or if the transfer-ID timeout has expired since the last accepted transfer.
+    Hence, if an interface fails, the reception fails over to another one on the first new transfer
+    received from it, without waiting for the transfer-ID timeout and without losing transfers.
+    A transfer from another interface whose transfer-ID is not ahead of the last accepted one is a duplicate.
+    """
+
     def __init__(self, transfer_id_modulo: int) -> None:
         self._tid_modulo = int(transfer_id_modulo)
         assert self._tid_modulo > 0
-        self._remote_states: typing.List[typing.Optional[_RemoteState]] = []
+        self._remote_states = RemoteStateTable()
 
     def should_accept_transfer(self,
                                iface_index:         int,
                                transfer_id_timeout: float,
                                transfer:            pyuavcan.transport.TransferFrom) -> bool:
-        if transfer.source_node_id is None:
+        node_id = transfer.source_node_id
+        if node_id is None:
             # Anonymous transfers are fully stateless, so always accepted.
             # This may lead to duplications and reordering but this is a design limitation.
             return True
 
-        # If a similar architecture is used on an embedded system, this normally would be a static array.
-        if len(self._remote_states) <= transfer.source_node_id:
-            self._remote_states += [None] * (transfer.source_node_id - len(self._remote_states) + 1)
-            assert len(self._remote_states) == transfer.source_node_id + 1
-
-        if self._remote_states[transfer.source_node_id] is None:
-            # First transfer from this node, create new state and accept unconditionally.
-            self._remote_states[transfer.source_node_id] = _RemoteState(iface_index=iface_index,
-                                                                        last_timestamp=transfer.timestamp)
-            return True
-
-        # We have seen transfers from this node before, so we need to perform actual deduplication.
-        state = self._remote_states[transfer.source_node_id]
-        assert state is not None
-
-        # If the current interface was seen working recently, reject traffic from other interfaces.
+        # If the current interface was seen working recently, reject traffic from other interfaces
+        # unless it is a new transfer, which means that the current interface has missed it (or is slower).
         # Note that the time delta may be negative due to timestamping variations and inner latency variations.
-        time_delta = transfer.timestamp.monotonic - state.last_timestamp.monotonic
-        iface_switch_allowed = time_delta > transfer_id_timeout
-        if not iface_switch_allowed and state.iface_index != iface_index:
-            return False
-
-        # TODO: The TID modulo setting is not currently used yet.
-        # TODO: It may be utilized later to implement faster iface fallback.
+        # The first transfer from a node is accepted unconditionally.
+        st = self._remote_states
+        iface_indexes = st.iface_index
+        timestamp_ns = transfer.timestamp.monotonic_ns
+        if node_id < len(iface_indexes):
+            last_iface_index = iface_indexes[node_id]
+            if last_iface_index != iface_index and last_iface_index != RemoteStateTable.UNKNOWN_IFACE_INDEX:
+                if timestamp_ns - st.last_monotonic_ns[node_id] <= transfer_id_timeout * 1e9:
+                    forward_distance = (transfer.transfer_id - st.last_transfer_id[node_id]) % self._tid_modulo
+                    if not (0 < forward_distance < (self._tid_modulo + 1) // 2):
+                        return False
+        else:
+            st.grow(node_id + 1)
+            iface_indexes = st.iface_index
 
         # Either we're on the same interface or (the interface is new and the current one seems to be down).
-        state.iface_index = iface_index
-        state.last_timestamp = transfer.timestamp
+        iface_indexes[node_id] = iface_index
+        st.last_transfer_id[node_id] = transfer.transfer_id
+        st.last_monotonic_ns[node_id] = timestamp_ns
         return True
 
 
-@dataclasses.dataclass
-class _RemoteState:
-    iface_index:    int
-    last_timestamp: pyuavcan.transport.Timestamp
+def _unittest_cyclic_deduplicator() -> None:
+    from pyuavcan.transport import Timestamp, Priority, TransferFrom
+
+    def mk(transfer_id: int, monotonic: float, source_node_id: typing.Optional[int] = 1) -> TransferFrom:
+        return TransferFrom(timestamp=Timestamp(system_ns=0, monotonic_ns=round(monotonic * 1e9)),
+                            priority=Priority.NOMINAL,
+                            transfer_id=transfer_id,
+                            fragmented_payload=[],
+                            source_node_id=source_node_id)
+
+    dd = CyclicDeduplicator(32)
+    assert dd.should_accept_transfer(0, 1.0, mk(30, 0.0))
+    assert dd.should_accept_transfer(1, 1.0, mk(30, 0.0, None))    # Anonymous.
+    assert not dd.should_accept_transfer(1, 1.0, mk(30, 0.1))       # Duplicate.
+    assert dd.should_accept_transfer(0, 1.0, mk(31, 0.2))
+    assert not dd.should_accept_transfer(1, 1.0, mk(31, 0.2))
+    assert dd.should_accept_transfer(1, 1.0, mk(0, 0.3))            # Failover with an overflow.
+    assert not dd.should_accept_transfer(0, 1.0, mk(0, 0.3))        # The old interface is slower.
+    assert not dd.should_accept_transfer(0, 1.0, mk(31, 0.3))       # Backward distance.
+    assert not dd.should_accept_transfer(0, 1.0, mk(16, 0.3))       # Too far ahead, considered backward.
+    assert dd.should_accept_transfer(0, 1.0, mk(15, 0.3))           # Lost transfers on the new interface.
+    assert dd.should_accept_transfer(1, 1.0, mk(3, 1.4))            # Transfer-ID timeout.
+    assert dd.should_accept_transfer(1, 1.0, mk(3, 1.5))            # Same interface is always accepted.
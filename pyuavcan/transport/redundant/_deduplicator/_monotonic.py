@@ -4,53 +4,38 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
-import typing
-import dataclasses
 import pyuavcan.transport
-from ._base import Deduplicator
+from ._base import Deduplicator, RemoteStateTable
 
 
 class MonotonicDeduplicator(Deduplicator):
     def __init__(self) -> None:
-        self._remote_states: typing.List[typing.Optional[_RemoteState]] = []
+        self._remote_states = RemoteStateTable()
 
     def should_accept_transfer(self,
                                iface_index:         int,
                                transfer_id_timeout: float,
                                transfer:            pyuavcan.transport.TransferFrom) -> bool:
-        del iface_index  # Not used in monotonic deduplicator.
-        if transfer.source_node_id is None:
+        node_id = transfer.source_node_id
+        if node_id is None:
             # Anonymous transfers are fully stateless, so always accepted.
             # This may lead to duplications and reordering but this is a design limitation.
             return True
 
-        # If a similar architecture is used on an embedded system, this normally would be a static array.
-        if len(self._remote_states) <= transfer.source_node_id:
-            self._remote_states += [None] * (transfer.source_node_id - len(self._remote_states) + 1)
-            assert len(self._remote_states) == transfer.source_node_id + 1
-
-        if self._remote_states[transfer.source_node_id] is None:
-            # First transfer from this node, create new state and accept unconditionally.
-            self._remote_states[transfer.source_node_id] = _RemoteState(last_transfer_id=transfer.transfer_id,
-                                                                        last_timestamp=transfer.timestamp)
-            return True
-
-        # We have seen transfers from this node before, so we need to perform actual deduplication.
-        state = self._remote_states[transfer.source_node_id]
-        assert state is not None
-
         # If we have seen transfers with higher TID values recently, reject this one as duplicate.
-        tid_timeout = (transfer.timestamp.monotonic - state.last_timestamp.monotonic) > transfer_id_timeout
-        if not tid_timeout and transfer.transfer_id <= state.last_transfer_id:
-            return False
+        st = self._remote_states
+        timestamp_ns = transfer.timestamp.monotonic_ns
+        if node_id < len(st.iface_index):
+            if st.iface_index[node_id] != RemoteStateTable.UNKNOWN_IFACE_INDEX:
+                tid_timeout = timestamp_ns - st.last_monotonic_ns[node_id] > transfer_id_timeout * 1e9
+                if not tid_timeout and transfer.transfer_id <= st.last_transfer_id[node_id]:
+                    return False
+        else:
+            st.grow(node_id + 1)
 
         # Otherwise, this is either a new transfer or a TID timeout condition has occurred.
-        state.last_transfer_id = transfer.transfer_id
-        state.last_timestamp = transfer.timestamp
+        # The interface index is not used by this deduplicator; it is stored only to mark the node as known.
+        st.iface_index[node_id] = iface_index
+        st.last_transfer_id[node_id] = transfer.transfer_id
+        st.last_monotonic_ns[node_id] = timestamp_ns
         return True
-
-
-@dataclasses.dataclass
-class _RemoteState:
-    last_transfer_id: int
-    last_timestamp:   pyuavcan.transport.Timestamp
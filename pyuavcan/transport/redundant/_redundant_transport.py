@@ -48,6 +48,7 @@ class RedundantTransport(pyuavcan.transport.Transport):
         self._cols: typing.List[pyuavcan.transport.Transport] = []
         self._rows: typing.Dict[pyuavcan.transport.SessionSpecifier, RedundantSession] = {}
         self._loop = loop if loop is not None else asyncio.get_event_loop()
+        self._frame_level_redundancy = False
         self._check_matrix_consistency()
 
     @property
@@ -106,14 +107,17 @@ class RedundantTransport(pyuavcan.transport.Transport):
     def get_input_session(self,
                           specifier:        pyuavcan.transport.InputSessionSpecifier,
                           payload_metadata: pyuavcan.transport.PayloadMetadata) -> RedundantInputSession:
-        out = self._get_session(
-            specifier,
-            lambda fin: RedundantInputSession(specifier,
-                                              payload_metadata,
-                                              self._get_tid_modulo,
-                                              self._loop,
-                                              fin)
-        )
+        def factory(fin: typing.Callable[[], None]) -> RedundantSession:
+            ses = RedundantInputSession(specifier,
+                                        payload_metadata,
+                                        self._get_tid_modulo,
+                                        self._loop,
+                                        fin)
+            # noinspection PyProtectedMember
+            ses._set_frame_level_redundancy(self._frame_level_redundancy)
+            return ses
+
+        out = self._get_session(specifier, factory)
         assert isinstance(out, RedundantInputSession)
         self._check_matrix_consistency()
         return out
@@ -170,6 +174,36 @@ class RedundantTransport(pyuavcan.transport.Transport):
         """
         return self._cols[:]  # Return copy to prevent mutation
 
+    @property
+    def frame_level_redundancy(self) -> bool:
+        """
+        Enables the frame-level redundancy mode for the inferiors of high-overhead transports (such as UDP and serial),
+        where the frames received over all interfaces are reassembled by one state machine per remote node
+        instead of each interface reassembling the transfers on its own; see the module documentation.
+        A multi-frame transfer that has lost different frames on different interfaces can be still received this way,
+        which improves the delivery probability on lossy links without any extra bandwidth,
+        and the transfers are reassembled once rather than once per interface.
+        The inferiors of other kinds operate at the transfer level regardless of this setting.
+
+        The frames of a transfer can be combined only if the remote node segments it identically on every
+        interface, which requires the MTU to be the same on all of them.
+        Hence, this mode requires all inferiors to have the same MTU; attempting to enable it or to attach
+        an inferior with a different MTU while it is enabled results in :class:`InconsistentInferiorConfigurationError`.
+
+        The mode is disabled by default. Changing it may cause the transfers being received at the moment to be lost.
+        """
+        return self._frame_level_redundancy
+
+    @frame_level_redundancy.setter
+    def frame_level_redundancy(self, value: bool) -> None:
+        value = bool(value)
+        if value:
+            self._check_mtu_uniformity(self._cols)
+        self._frame_level_redundancy = value
+        for ses in self.input_sessions:
+            # noinspection PyProtectedMember
+            ses._set_frame_level_redundancy(value)
+
     def attach_inferior(self, transport: pyuavcan.transport.Transport) -> None:
         """
         Adds a new transport to the redundant group. The new transport shall not be closed.
@@ -189,6 +223,8 @@ class RedundantTransport(pyuavcan.transport.Transport):
             - Identical for all inferiors.
             - Not less than :attr:`MONOTONIC_TRANSFER_ID_MODULO_THRESHOLD` for all inferiors.
 
+        - The MTU shall be the same for all inferiors if :attr:`frame_level_redundancy` is enabled.
+
         If an exception is raised while the setup of the new inferior is in progress,
         the operation will be rolled back to ensure state consistency.
         """
@@ -291,6 +327,9 @@ class RedundantTransport(pyuavcan.transport.Transport):
                         f'inferior is not compatible with the other inferiors ({tid_modulo})'
                     )
 
+            if self._frame_level_redundancy:
+                self._check_mtu_uniformity(self._cols + [transport])
+
     def _get_session(self,
                      specifier:       pyuavcan.transport.SessionSpecifier,
                      session_factory: typing.Callable[[typing.Callable[[], None]],
@@ -337,6 +376,14 @@ class RedundantTransport(pyuavcan.transport.Transport):
             owner._close_inferior(new_index)  # If the inferior has not been added, this method will have no effect.
             raise
 
+    @staticmethod
+    def _check_mtu_uniformity(transports: typing.Iterable[pyuavcan.transport.Transport]) -> None:
+        mtu_set = set(t.protocol_parameters.mtu for t in transports)
+        if len(mtu_set) > 1:
+            raise InconsistentInferiorConfigurationError(
+                f'Frame-level redundancy requires the inferiors to have the same MTU, found: {sorted(mtu_set)}'
+            )
+
     def _get_tid_modulo(self) -> typing.Optional[int]:
         if self.protocol_parameters.transfer_id_modulo < self.MONOTONIC_TRANSFER_ID_MODULO_THRESHOLD:
             return self.protocol_parameters.transfer_id_modulo
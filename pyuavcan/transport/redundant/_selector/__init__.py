@@ -0,0 +1,10 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from ._base import InferiorSelector as InferiorSelector
+
+from ._health import HealthScoringSelector as HealthScoringSelector
+from ._health import InferiorHealth as InferiorHealth
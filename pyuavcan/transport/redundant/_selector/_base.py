@@ -0,0 +1,56 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+import abc
+import typing
+import pyuavcan.transport
+
+
+class InferiorSelector(abc.ABC):
+    """
+    Decides which inferiors of a redundant output session are used to send the next transfer.
+    A selector is installed via :attr:`pyuavcan.transport.redundant.RedundantOutputSession.inferior_selector`;
+    the session informs it about the outcome of every send so that the decisions can be based on the observed
+    health of the inferiors.
+
+    The inferiors that are not selected are kept in reserve: if all of the selected ones fail or time out,
+    the transfer is sent via the rest while the deadline permits, so the delivery guarantees are not weakened.
+    """
+
+    @abc.abstractmethod
+    def select(self,
+               inferiors:      typing.Sequence[pyuavcan.transport.OutputSession],
+               monotonic_time: float) -> typing.Sequence[pyuavcan.transport.OutputSession]:
+        """
+        :param inferiors: All inferiors of the session, ordered as in the session; never empty.
+            The selector may discard its state of the inferiors that are not in this list anymore.
+        :param monotonic_time: The current time per the event loop.
+        :return: The inferiors the transfer shall be sent via. Must not be empty.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def report(self,
+               inferior: pyuavcan.transport.OutputSession,
+               result:   typing.Union[bool, Exception],
+               duration: float) -> None:
+        """
+        Invoked when a send via the inferior is completed, whether it was selected or used as a reserve.
+
+        :param inferior: The inferior session.
+        :param result: True on success, False on timeout, or the exception raised by the inferior.
+        :param duration: The time it took the inferior to complete the send call, in seconds.
+        """
+        raise NotImplementedError
+
+    def report_feedback(self,
+                        inferior: pyuavcan.transport.OutputSession,
+                        feedback: pyuavcan.transport.Feedback) -> None:
+        """
+        Invoked for every feedback entry emitted by the inferior if the feedback is enabled on the session.
+        The default implementation does nothing.
+        """
+        del inferior, feedback
@@ -0,0 +1,219 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import copy
+import typing
+import dataclasses
+import pyuavcan.transport
+from ._base import InferiorSelector
+
+
+@dataclasses.dataclass
+class InferiorHealth:
+    """
+    The health of an inferior as observed by :class:`HealthScoringSelector`.
+    """
+    #: Exponentially weighted moving average of the send outcome, where a success counts as one
+    #: and a timeout or an error counts as zero. Inferiors start out healthy, so that they are tried early.
+    success_rate: float = 1.0
+
+    #: Exponentially weighted moving average of the time it takes the inferior to send a transfer, in seconds.
+    #: Only successful sends are considered.
+    latency: float = 0.0
+
+    #: The number of sends via the inferior that succeeded.
+    successes: int = 0
+
+    #: The number of sends via the inferior that timed out.
+    timeouts: int = 0
+
+    #: The number of sends via the inferior that raised an exception.
+    errors: int = 0
+
+
+#: Maps the health of an inferior to its score; the inferiors with the highest score are preferred.
+ScoreFunction = typing.Callable[[InferiorHealth], float]
+
+
+def default_score(health: InferiorHealth) -> float:
+    """
+    The success rate penalized by the latency, so that a slow inferior is preferred only if it is more reliable.
+    For example, an inferior with the latency of 50 ms is ranked equally with an instant one
+    whose success rate is 5% lower.
+    """
+    return health.success_rate / (1.0 + health.latency)
+
+
+class HealthScoringSelector(InferiorSelector):
+    """
+    Sends the transfers via the best-scoring inferiors only, probing the others periodically to keep track of
+    their health, so that the load on the costly links (e.g., a shared radio channel next to a wired link)
+    is reduced while they are still ready to take over when the preferred inferior fails.
+    The score is computed from the send outcomes and their latency (see :class:`InferiorHealth`);
+    if the feedback is enabled on the session, the transmission timestamps refine the latency estimate.
+
+    >>> sel = HealthScoringSelector(active_count=1, probe_interval=1.0)
+    >>> sel.select(['a', 'b'], 0.0)             # Nothing is known yet, so all inferiors are probed.
+    ['a', 'b']
+    >>> sel.report('a', True, 0.050)
+    >>> sel.report('b', True, 0.001)
+    >>> sel.select(['a', 'b'], 0.5)             # The faster one is preferred.
+    ['b']
+    >>> sel.select(['a', 'b'], 1.0)             # The other one is probed once per probe interval.
+    ['a', 'b']
+    >>> sel.report('b', RuntimeError(), 0.0)
+    >>> sel.report('b', False, 1.0)
+    >>> sel.select(['a', 'b'], 1.5)             # The failing inferior is replaced.
+    ['a']
+    """
+
+    def __init__(self,
+                 active_count:   int = 1,
+                 probe_interval: float = 1.0,
+                 smoothing:      float = 0.2,
+                 score:          ScoreFunction = default_score):
+        """
+        :param active_count: The number of the best-scoring inferiors that every transfer is sent via.
+
+        :param probe_interval: An inferior that has not been used for this long is included into the selection
+            regardless of its score. Units are seconds.
+
+        :param smoothing: The weight of the newest sample in the moving averages, in (0, 1].
+            Greater values make the selector react faster but also make it more sensitive to sporadic failures.
+
+        :param score: The scoring function; see :func:`default_score`.
+        """
+        self._active_count = int(active_count)
+        self._probe_interval = float(probe_interval)
+        self._smoothing = float(smoothing)
+        self._score = score
+        if self._active_count < 1:
+            raise ValueError(f'Invalid active inferior count: {active_count}')
+        if not self._probe_interval > 0:
+            raise ValueError(f'Invalid value for probe interval [second]: {probe_interval}')
+        if not 0 < self._smoothing <= 1:
+            raise ValueError(f'Invalid smoothing factor: {smoothing}')
+        if not callable(self._score):
+            raise ValueError(f'Invalid score function: {score!r}')
+
+        self._health: typing.Dict[pyuavcan.transport.OutputSession, InferiorHealth] = {}
+        self._last_selected_at: typing.Dict[pyuavcan.transport.OutputSession, float] = {}
+
+    @property
+    def health(self) -> typing.Dict[pyuavcan.transport.OutputSession, InferiorHealth]:
+        """
+        A snapshot of the health of every inferior seen in the last selection.
+        """
+        return {k: copy.copy(v) for k, v in self._health.items()}
+
+    def select(self,
+               inferiors:      typing.Sequence[pyuavcan.transport.OutputSession],
+               monotonic_time: float) -> typing.Sequence[pyuavcan.transport.OutputSession]:
+        for inf in list(self._health):
+            if inf not in inferiors:
+                del self._health[inf]
+                self._last_selected_at.pop(inf, None)
+        for inf in inferiors:
+            self._health.setdefault(inf, InferiorHealth())
+
+        # The sorting is stable, so the inferiors with equal scores are ranked in the order of attachment.
+        ranked = sorted(inferiors, key=lambda x: -self._score(self._health[x]))
+        selected = set(ranked[:self._active_count])
+        for inf in ranked[self._active_count:]:
+            last = self._last_selected_at.get(inf)
+            if last is None or monotonic_time - last >= self._probe_interval:
+                selected.add(inf)
+        for inf in selected:
+            self._last_selected_at[inf] = monotonic_time
+        return [x for x in inferiors if x in selected]
+
+    def report(self,
+               inferior: pyuavcan.transport.OutputSession,
+               result:   typing.Union[bool, Exception],
+               duration: float) -> None:
+        try:
+            h = self._health[inferior]
+        except LookupError:
+            return  # The inferior has been removed while the send was in progress.
+        h.success_rate += self._smoothing * (float(result is True) - h.success_rate)
+        if result is True:
+            h.successes += 1
+            self._update_latency(h, duration)
+        elif isinstance(result, Exception):
+            h.errors += 1
+        else:
+            h.timeouts += 1
+
+    def report_feedback(self,
+                        inferior: pyuavcan.transport.OutputSession,
+                        feedback: pyuavcan.transport.Feedback) -> None:
+        try:
+            h = self._health[inferior]
+        except LookupError:
+            return
+        delay_ns = feedback.first_frame_transmission_timestamp.monotonic_ns - \
+            feedback.original_transfer_timestamp.monotonic_ns
+        self._update_latency(h, max(0.0, delay_ns * 1e-9))
+
+    def _update_latency(self, health: InferiorHealth, sample: float) -> None:
+        if health.successes <= 1 and health.latency == 0:
+            health.latency = sample     # Initialize the average with the first sample to speed up the convergence.
+        else:
+            health.latency += self._smoothing * (sample - health.latency)
+
+    def __repr__(self) -> str:
+        return pyuavcan.util.repr_attributes(self,
+                                             active_count=self._active_count,
+                                             probe_interval=self._probe_interval,
+                                             smoothing=self._smoothing)
+
+
+def _unittest_health_scoring_selector() -> None:
+    from pytest import raises, approx
+
+    with raises(ValueError):
+        HealthScoringSelector(active_count=0)
+    with raises(ValueError):
+        HealthScoringSelector(probe_interval=0)
+    with raises(ValueError):
+        HealthScoringSelector(smoothing=1.5)
+
+    a, b, c = object(), object(), object()      # The selector does not care about the type of the inferiors.
+    sel = HealthScoringSelector(active_count=2, probe_interval=10.0, smoothing=0.5)
+    assert sel.select([a, b, c], 0.0) == [a, b, c]  # type: ignore
+    for inf, latency in [(a, 0.1), (b, 0.2), (c, 0.0)]:
+        sel.report(inf, True, latency)  # type: ignore
+    assert sel.select([a, b, c], 1.0) == [a, c]  # type: ignore
+    assert sel.health[b].latency == approx(0.2)  # type: ignore
+
+    # The latency converges to the new value.
+    for _ in range(10):
+        sel.report(c, True, 0.3)  # type: ignore
+    assert sel.health[c].latency == approx(0.3, abs=1e-3)  # type: ignore
+    assert sel.health[c].successes == 11  # type: ignore
+    assert sel.select([a, b, c], 2.0) == [a, b]  # type: ignore
+
+    # Failures are counted and lower the score.
+    sel.report(a, False, 1.0)  # type: ignore
+    sel.report(a, ValueError(), 0.0)  # type: ignore
+    assert sel.health[a].success_rate == approx(0.25)  # type: ignore
+    assert (sel.health[a].timeouts, sel.health[a].errors) == (1, 1)  # type: ignore
+    assert sel.select([a, b, c], 3.0) == [b, c]  # type: ignore
+    assert sel.select([a, b, c], 12.0) == [a, b, c]  # type: ignore  # Probing.
+
+    # The state of the removed inferiors is discarded; the reports regarding them are ignored.
+    assert sel.select([c], 13.0) == [c]  # type: ignore
+    assert list(sel.health) == [c]
+    sel.report(a, True, 0.0)  # type: ignore
+    assert list(sel.health) == [c]
+
+    # Custom scoring.
+    sel = HealthScoringSelector(score=lambda h: h.errors)
+    sel.select([a, b], 0.0)  # type: ignore
+    sel.report(b, RuntimeError(), 0.0)  # type: ignore
+    assert sel.select([a, b], 0.5) == [b]  # type: ignore
+    print(sel)
@@ -20,6 +20,45 @@ class RedundantSessionStatistics(pyuavcan.transport.SessionStatistics):
     Aggregate statistics for all inferior sessions in a redundant group.
     This is an atomic immutable sample; it is not updated after construction.
     """
+    #: Deduplicated transfers discarded due to the overflow of the backlog. Input sessions only.
+    dropped_transfers: int = 0
+
+    #: The maximum number of transfers that have been observed in the backlog at once. Input sessions only.
+    backlog_high_water_mark: int = 0
+
+    #: Input sessions only. The number of frames rejected by the shared transfer reassembler as erroneous
+    #: in the frame-level redundancy mode (see :attr:`RedundantTransport.frame_level_redundancy`).
+    reassembly_errors: int = 0
+
+    #: Input sessions only. The number of unique transfers delivered by each inferior before the other inferiors.
+    #: A healthy interface that is consistently outpaced by another one rarely appears here,
+    #: so compare this with :attr:`duplicates` to see the whole picture.
+    #: The ordering is guaranteed to match that of :attr:`RedundantSession.inferiors`.
+    first_deliveries: typing.List[int] = dataclasses.field(default_factory=list)
+
+    #: Input sessions only. The number of transfers from each inferior that were discarded by the deduplicator
+    #: because the same transfer had already been delivered by another inferior (or by the same one earlier).
+    #: An interface whose first deliveries and duplicates together fall behind the others is losing transfers.
+    #: The ordering is guaranteed to match that of :attr:`RedundantSession.inferiors`.
+    duplicates: typing.List[int] = dataclasses.field(default_factory=list)
+
+    #: Input sessions only. For each inferior, the histogram of the time differences between the reception of a
+    #: duplicate and the reception of the first copy of the same transfer. The bins are delimited by
+    #: :attr:`RedundantInputSession.ARRIVAL_SKEW_HISTOGRAM_BOUNDS`; the last bin is unbounded.
+    #: The transfer-ID timeout should comfortably exceed the typical skew.
+    #: The ordering is guaranteed to match that of :attr:`RedundantSession.inferiors`.
+    arrival_skew_histograms: typing.List[typing.List[int]] = dataclasses.field(default_factory=list)
+
+    #: Output sessions only. The number of transfers that are being sent via each inferior at the moment of sampling;
+    #: see :attr:`RedundantOutputSession.completion_policy`.
+    #: The ordering is guaranteed to match that of :attr:`RedundantSession.inferiors`.
+    outstanding_sends: typing.List[int] = dataclasses.field(default_factory=list)
+
+    #: Output sessions only. The number of transfers that were not submitted to each inferior because it had too many
+    #: outstanding sends (see :attr:`RedundantOutputSession.max_outstanding_sends`). This is a measure of backpressure.
+    #: The ordering is guaranteed to match that of :attr:`RedundantSession.inferiors`.
+    backpressure_drops: typing.List[int] = dataclasses.field(default_factory=list)
+
     #: The ordering is guaranteed to match that of :attr:`RedundantSession.inferiors`.
     inferiors: typing.List[pyuavcan.transport.SessionStatistics] = dataclasses.field(default_factory=list)
 
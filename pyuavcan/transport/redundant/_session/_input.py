@@ -4,15 +4,33 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
+from __future__ import annotations
 import typing
+import bisect
 import asyncio
 import logging
+import functools
+import collections
 import dataclasses
 import pyuavcan.transport
+from pyuavcan.transport.commons.high_overhead_transport import TransferQueue, Frame
+from pyuavcan.transport.commons.high_overhead_transport import FrameDivertingInputSession
+from pyuavcan.transport.commons.high_overhead_transport import ReassemblerTable, PromiscuousInputSessionStatistics
 from ._base import RedundantSession, RedundantSessionStatistics
 from .._deduplicator import Deduplicator, MonotonicDeduplicator, CyclicDeduplicator
 
 
+# The reader tasks do not need to wake up periodically; the timeout only bounds the duration of one inferior read call.
+_READER_TIMEOUT = 1.0
+
+# If an inferior read fails, the next attempt is made after this delay to avoid spinning.
+_READER_ERROR_BACKOFF = 1.0
+
+# The reception time of the first copy is remembered for this many latest unique transfers to measure the arrival skew.
+# The copies from all interfaces arrive within a short window, so a small number suffices even on a busy network.
+_FIRST_ARRIVAL_TRACKING_CAPACITY = 1024
+
+
 _logger = logging.getLogger(__name__)
 
 
@@ -31,7 +49,32 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
     Applications where this is critical may prefer to avoid dynamic removal of inferiors.
 
     The transfer deduplication strategy is chosen between cyclic and monotonic automatically.
+
+    If there is more than one inferior, each of them is read by a dedicated long-lived task that passes
+    the received transfers through the deduplicator into the shared backlog, from which :meth:`receive_until`
+    takes them. The reader tasks are started and stopped when the set of inferiors is changed.
+    If there is only one inferior, it is read directly from :meth:`receive_until`, bypassing the tasks,
+    the backlog, and the locking; the session switches between the modes when the set of inferiors is changed,
+    and the calls that are in progress at that moment are switched as well (an interrupted inferior read is resumed
+    in the new mode, so a transfer arriving via a newly added inferior or via the remaining one is not delayed).
+    The backlog is bounded; see :attr:`backlog_capacity`.
+
+    In the frame-level redundancy mode (see :attr:`RedundantTransport.frame_level_redundancy`), the inferiors
+    that support it (see :class:`pyuavcan.transport.commons.high_overhead_transport.FrameDivertingInputSession`)
+    pass their frames into one transfer reassembler per remote node shared by all interfaces instead of
+    reassembling the transfers themselves, so a multi-frame transfer can be completed from the frames received over
+    different interfaces. The reassembled transfers are passed through the deduplicator as usual,
+    which keeps the output consistent with the inferiors that operate at the transfer level.
+    Like in the inferiors, the payload of a reassembled transfer is the list of the received frame payloads
+    rather than a contiguous copy.
     """
+
+    #: The default value of :attr:`backlog_capacity`. Can be overridden after instantiation if needed.
+    DEFAULT_BACKLOG_CAPACITY = 1000
+
+    #: The upper bounds of the bins of :attr:`RedundantSessionStatistics.arrival_skew_histograms` in seconds.
+    ARRIVAL_SKEW_HISTOGRAM_BOUNDS = (100e-6, 1e-3, 10e-3, 100e-3, 1.0)
+
     def __init__(self,
                  specifier:           pyuavcan.transport.InputSessionSpecifier,
                  payload_metadata:    pyuavcan.transport.PayloadMetadata,
@@ -55,11 +98,32 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
         self._inferiors: typing.List[pyuavcan.transport.InputSession] = []
         self._lock = asyncio.Lock(loop=self._loop)
         self._maybe_deduplicator: typing.Optional[Deduplicator] = None
-        self._backlog: typing.List[RedundantTransferFrom] = []
+        self._backlog: typing.Deque[RedundantTransferFrom] = collections.deque()
+        self._backlog_capacity: typing.Optional[int] = self.DEFAULT_BACKLOG_CAPACITY
+        self._backlog_overflow_policy = TransferQueue.OverflowPolicy.DROP_NEWEST
+        self._backlog_waiters: typing.List[asyncio.Future[None]] = []
+        # The only inferior if it is to be read directly, None otherwise. Updated together with the reader tasks.
+        self._direct_inferior: typing.Optional[pyuavcan.transport.InputSession] = None
+        # Completed and replaced when the direct inferior is changed to interrupt the direct reads in progress.
+        self._direct_inferior_changed: asyncio.Future[None] = self._loop.create_future()
+        self._readers: typing.Dict[pyuavcan.transport.InputSession, asyncio.Task[None]] = {}
+        self._reader_error: typing.Optional[Exception] = None
+        self._frame_level_redundancy = False
+        # Only the reassembly-related fields are used; the transfers are accounted for elsewhere.
+        self._shared_reassembly_statistics = PromiscuousInputSessionStatistics()
+        self._shared_reassemblers = ReassemblerTable(max_payload_size_bytes=self._payload_metadata.max_size_bytes,
+                                                     statistics=self._shared_reassembly_statistics)
 
         self._stat_transfers = 0
         self._stat_payload_bytes = 0
         self._stat_errors = 0
+        self._stat_dropped_transfers = 0
+        self._stat_backlog_high_water_mark = 0
+        self._stat_first_deliveries: typing.Dict[pyuavcan.transport.InputSession, int] = {}
+        self._stat_duplicates: typing.Dict[pyuavcan.transport.InputSession, int] = {}
+        self._stat_arrival_skew: typing.Dict[pyuavcan.transport.InputSession, typing.List[int]] = {}
+        # Keys are (source node-ID, transfer-ID); values are the reception timestamps [nanosecond] of the first copies.
+        self._first_arrivals: typing.Dict[typing.Tuple[int, int], int] = {}
 
     def _add_inferior(self, session: pyuavcan.transport.Session) -> None:
         assert isinstance(session, pyuavcan.transport.InputSession)
@@ -69,6 +133,8 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
             if self._inferiors:  # Synchronize the settings.
                 session.transfer_id_timeout = self.transfer_id_timeout
             self._inferiors.append(session)
+            self._configure_frame_handler(session)
+            self._reconfigure_readers()
 
     def _close_inferior(self, session_index: int) -> None:
         assert session_index >= 0, 'Negative indexes may lead to unexpected side effects'
@@ -79,6 +145,11 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
             pass
         else:
             self._maybe_deduplicator = None   # Removal of any inferior invalidates the state of the deduplicator.
+            self._first_arrivals.clear()
+            self._stat_first_deliveries.pop(session, None)
+            self._stat_duplicates.pop(session, None)
+            self._stat_arrival_skew.pop(session, None)
+            self._reconfigure_readers()
             session.close()  # May raise.
 
     @property
@@ -91,25 +162,37 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
         If there are no inferiors, waits until the deadline, checks again, and returns if there are still none;
         otherwise, does a non-blocking read once.
 
-        If any of the inferiors raises an exception, all reads are aborted and the exception is propagated immediately.
+        If any of the inferiors raises an exception, the exception is propagated from this method;
+        the failed inferior is read again after a short delay.
         """
         if self._finalizer is None:
             raise pyuavcan.transport.ResourceClosedError(f'{self} is closed suka')
 
+        inferior = self._direct_inferior
+        if inferior is not None and not self._backlog:
+            out = await self._receive_fast(inferior, monotonic_deadline)
+            if out is not None or self._direct_inferior is inferior:
+                return out
+            # The set of inferiors has changed while we were waiting; the transfer, if any, is in the backlog now.
+
         try:
             async with self._lock:    # Serialize access to the inferiors.
-                if not self._backlog:
+                while not self._backlog:
                     if not self._inferiors:
                         await asyncio.sleep(monotonic_deadline - self._loop.time())
                         if not self._inferiors:
                             return None
-                    # It is possible to optimize reads for the case of one inferior by invoking said inferior's
-                    # receive_until() directly instead of dealing with sophisticated multiplexed reads here.
-                    await self._receive_into_backlog(monotonic_deadline)
+                    # Either call returns early if the mode is switched, then the next iteration uses the new mode.
+                    if self._readers:
+                        await self._wait_for_backlog(monotonic_deadline)
+                    else:
+                        await self._receive_directly(monotonic_deadline)
                     _logger.debug('%r new backlog (%d transfers): %r', self, len(self._backlog), self._backlog)
+                    if self._loop.time() >= monotonic_deadline:
+                        break
 
                 if self._backlog:
-                    out = self._backlog.pop(0)
+                    out = self._backlog.popleft()
                     self._stat_transfers += 1
                     self._stat_payload_bytes += sum(map(len, out.fragmented_payload))
                     return out
@@ -119,6 +202,43 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
             self._stat_errors += 1
             raise
 
+    @property
+    def backlog_capacity(self) -> typing.Optional[int]:
+        """
+        The maximum number of deduplicated transfers awaiting consumption by :meth:`receive_until`.
+        If there is more than one inferior, the inferiors are read continuously regardless of whether the
+        application is receiving, so the backlog rather than the queues of the inferiors is where
+        the transfers accumulate if they are not consumed quickly enough.
+        When the backlog is full, a transfer is discarded according to :attr:`backlog_overflow_policy`.
+        If the new capacity is smaller than the number of transfers in the backlog, the excess is discarded likewise.
+        None means unlimited; otherwise, the value shall be a positive integer, else you get a :class:`ValueError`.
+        """
+        return self._backlog_capacity
+
+    @backlog_capacity.setter
+    def backlog_capacity(self, value: typing.Optional[int]) -> None:
+        if value is not None and not value > 0:
+            raise ValueError(f'Invalid value for backlog capacity: {value}')
+        self._backlog_capacity = int(value) if value is not None else None
+        while self._backlog_capacity is not None and len(self._backlog) > self._backlog_capacity:
+            if self._backlog_overflow_policy == TransferQueue.OverflowPolicy.DROP_OLDEST:
+                self._register_dropped_transfer(self._backlog.popleft())
+            else:
+                self._register_dropped_transfer(self._backlog.pop())
+
+    @property
+    def backlog_overflow_policy(self) -> TransferQueue.OverflowPolicy:
+        """
+        Which transfer to discard when the backlog is full: the newest one (default) or the oldest one.
+        """
+        return self._backlog_overflow_policy
+
+    @backlog_overflow_policy.setter
+    def backlog_overflow_policy(self, value: TransferQueue.OverflowPolicy) -> None:
+        if not isinstance(value, TransferQueue.OverflowPolicy):
+            raise ValueError(f'Invalid overflow policy: {value!r}')
+        self._backlog_overflow_policy = value
+
     @property
     def transfer_id_timeout(self) -> float:
         """
@@ -146,6 +266,20 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
         for s in self._inferiors:
             s.transfer_id_timeout = value
 
+    @property
+    def reassembler_idle_timeout(self) -> float:
+        """
+        Frame-level redundancy mode only: the state of the shared transfer reassembler of a remote node
+        that has not sent any frames over any interface for this long is discarded.
+        See :class:`pyuavcan.transport.commons.high_overhead_transport.ReassemblerTable` for details.
+        Units are seconds; the value shall be positive, otherwise you get a :class:`ValueError`.
+        """
+        return self._shared_reassemblers.idle_timeout
+
+    @reassembler_idle_timeout.setter
+    def reassembler_idle_timeout(self, value: float) -> None:
+        self._shared_reassemblers.idle_timeout = value
+
     @property
     def specifier(self) -> pyuavcan.transport.InputSessionSpecifier:
         return self._specifier
@@ -163,6 +297,11 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
           This value is invalidated when the set of inferiors is changed. The semantics may change later.
         - ``frames``        - the total number of frames summed from all inferiors (i.e., replicated frame count).
           This value is invalidated when the set of inferiors is changed. The semantics may change later.
+        - ``dropped_transfers`` - the number of deduplicated transfers discarded due to the backlog overflow.
+        - ``backlog_high_water_mark`` - the maximum number of transfers observed in the backlog.
+        - ``reassembly_errors`` - the number of errors reported by the shared reassemblers in the frame-level mode.
+        - ``first_deliveries``, ``duplicates``, ``arrival_skew_histograms`` - per inferior, see
+          :class:`RedundantSessionStatistics`. The values of an inferior are discarded when it is removed.
         """
         inferiors = [s.sample_statistics() for s in self._inferiors]
         return RedundantSessionStatistics(
@@ -171,20 +310,29 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
             payload_bytes=self._stat_payload_bytes,
             errors=self._stat_errors,
             drops=sum(s.drops for s in inferiors),
+            dropped_transfers=self._stat_dropped_transfers,
+            backlog_high_water_mark=self._stat_backlog_high_water_mark,
+            reassembly_errors=self._shared_reassembly_statistics.errors,
+            first_deliveries=[self._stat_first_deliveries.get(s, 0) for s in self._inferiors],
+            duplicates=[self._stat_duplicates.get(s, 0) for s in self._inferiors],
+            arrival_skew_histograms=[list(self._stat_arrival_skew.get(s) or [0] * self._num_skew_bins)
+                                     for s in self._inferiors],
             inferiors=inferiors,
         )
 
     def close(self) -> None:
-        for s in self._inferiors:
+        inferiors, self._inferiors = self._inferiors, []
+        self._reconfigure_readers()
+        for s in inferiors:
             try:
                 s.close()
             except Exception as ex:
                 _logger.exception('%s could not close inferior %s: %s', self, s, ex)
-        self._inferiors.clear()
 
         fin, self._finalizer = self._finalizer, None
         if fin is not None:
             fin()
+        self._wake_backlog_waiters()
 
     @property
     def _deduplicator(self) -> Deduplicator:
@@ -197,52 +345,215 @@ class RedundantInputSession(RedundantSession, pyuavcan.transport.InputSession):
                 self._maybe_deduplicator = CyclicDeduplicator(tid_modulo)
         return self._maybe_deduplicator
 
-    async def _receive_into_backlog(self, monotonic_deadline: float) -> None:
+    def _set_frame_level_redundancy(self, enabled: bool) -> None:
+        """
+        This is a part of the transport-internal API; see :attr:`RedundantTransport.frame_level_redundancy`.
+        The state of the shared reassemblers is discarded, so the transfers whose reassembly is in progress are lost.
+        """
+        self._frame_level_redundancy = bool(enabled)
+        self._shared_reassemblers.clear()
+        for inf in self._inferiors:
+            self._configure_frame_handler(inf)
+        self._reconfigure_readers()
+
+    def _configure_frame_handler(self, inferior: pyuavcan.transport.InputSession) -> None:
+        if isinstance(inferior, FrameDivertingInputSession):
+            # noinspection PyProtectedMember
+            inferior._set_frame_handler(functools.partial(self._process_inferior_frame, inferior)
+                                        if self._frame_level_redundancy else None)
+
+    def _reconfigure_readers(self) -> None:
+        """
+        Ensures that there is one reader task per inferior if there are several inferiors, and none otherwise.
+        In the frame-level redundancy mode, the transfers are delivered into the backlog by the frame handlers
+        rather than by the reader tasks, so the inferiors are never read directly from :meth:`receive_until`.
+        The calls of :meth:`receive_until` that are in progress are woken up to continue in the new mode.
+        """
+        wanted = set(self._inferiors) if len(self._inferiors) > 1 or self._frame_level_redundancy else set()
+        direct_inferior = self._inferiors[0] if len(self._inferiors) == 1 and not wanted else None
+        for inf in list(self._readers):
+            if inf not in wanted:
+                self._readers.pop(inf).cancel()
+        for inf in self._inferiors:
+            if inf in wanted and inf not in self._readers:
+                self._readers[inf] = self._loop.create_task(self._read_inferior(inf))
+        _logger.debug('%r has %d reader tasks', self, len(self._readers))
+        if direct_inferior is not self._direct_inferior:
+            self._direct_inferior = direct_inferior
+            fut, self._direct_inferior_changed = self._direct_inferior_changed, self._loop.create_future()
+            fut.set_result(None)
+        self._wake_backlog_waiters()
+
+    async def _read_inferior(self, inferior: pyuavcan.transport.InputSession) -> None:
+        while True:
+            try:
+                tr = await inferior.receive_until(self._loop.time() + _READER_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                if inferior not in self._readers:
+                    break   # The inferior has been removed while the read was in progress, the error is irrelevant.
+                _logger.exception('%r could not read from inferior %r: %s', self, inferior, ex)
+                self._reader_error = ex
+                self._wake_backlog_waiters()
+                await asyncio.sleep(_READER_ERROR_BACKOFF)
+            else:
+                if tr is not None:
+                    self._accept_transfer(inferior, tr)
+
+    async def _receive_fast(self, inferior: pyuavcan.transport.InputSession, monotonic_deadline: float) \
+            -> typing.Optional[RedundantTransferFrom]:
+        """
+        The fast path for the case of one inferior. The reads are not serialized because the backlog is not used;
+        the inferior is responsible for handling concurrent calls, like when it is used directly.
+        The deduplicator is still engaged to keep its state current for the case of a new inferior being added.
+        If the mode has been switched while the inferior was being read, None is returned early; if the transfer
+        has been received nevertheless, it is moved into the backlog.
+        """
+        while True:
+            try:
+                tr = await self._read_direct(inferior, monotonic_deadline)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._stat_errors += 1
+                raise
+            if tr is None:
+                return None
+            if self._direct_inferior is not inferior:
+                self._accept_transfer(inferior, tr)
+                return None
+            if self._deduplicator.should_accept_transfer(0, self.transfer_id_timeout, tr):
+                try:
+                    self._stat_first_deliveries[inferior] += 1
+                except LookupError:
+                    self._stat_first_deliveries[inferior] = 1
+                self._stat_transfers += 1
+                self._stat_payload_bytes += sum(map(len, tr.fragmented_payload))
+                return self._make_transfer(tr, inferior)
+            self._register_duplicate(inferior, tr)
+
+    async def _receive_directly(self, monotonic_deadline: float) -> None:
         assert self._lock.locked(), 'The mutex shall be locked to prevent concurrent reads'
         assert not self._backlog, 'This method need not be invoked if the backlog is not empty'
-        assert self._inferiors, 'Some inferiors are required'
-
-        inferiors = list(self._inferiors)  # Hold down a local copy to prevent concurrent mutation while waiting.
-
-        async def do_receive(iface_index: int, session: pyuavcan.transport.InputSession) -> \
-                typing.Tuple[int,
-                             pyuavcan.transport.InputSession,
-                             typing.Optional[pyuavcan.transport.TransferFrom]]:
-            return iface_index, session, await session.receive_until(monotonic_deadline)
+        inferior = self._direct_inferior
+        assert inferior is not None, 'This method shall not be invoked if there is no direct inferior'
+        while not self._backlog:
+            tr = await self._read_direct(inferior, monotonic_deadline)
+            if tr is None:
+                break
+            self._accept_transfer(inferior, tr)
+
+    async def _read_direct(self, inferior: pyuavcan.transport.InputSession, monotonic_deadline: float) \
+            -> typing.Optional[pyuavcan.transport.TransferFrom]:
+        """
+        Reads the inferior until the deadline or until it is no longer to be read directly, whichever is sooner.
+        In the latter case, the read in progress is cancelled and None is returned.
+        """
+        while True:
+            read = self._loop.create_task(inferior.receive_until(monotonic_deadline))
+            pending: typing.List[asyncio.Future[typing.Any]] = [read, self._direct_inferior_changed]
+            try:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                read.cancel()
+            await asyncio.wait([read])  # Let the cancellation take effect to avoid overlapping with the next read.
+            if not read.cancelled():
+                return read.result()    # Completed before it could be cancelled; may raise.
+            if self._direct_inferior is not inferior:
+                return None
+
+    async def _wait_for_backlog(self, monotonic_deadline: float) -> None:
+        while not self._backlog and self._readers:  # The readers are stopped when switching to the direct mode.
+            if self._reader_error is not None:
+                ex, self._reader_error = self._reader_error, None
+                raise ex
+            if self._finalizer is None:
+                raise pyuavcan.transport.ResourceClosedError(f'{self} has been closed while waiting')
+            timeout = monotonic_deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            fut = self._loop.create_future()
+            self._backlog_waiters.append(fut)
+            try:
+                await asyncio.wait([fut], timeout=timeout)
+            finally:
+                fut.cancel()
+                if fut in self._backlog_waiters:
+                    self._backlog_waiters.remove(fut)
+
+    def _process_inferior_frame(self, inferior: pyuavcan.transport.InputSession, source_node_id: int, frame: Frame) \
+            -> None:
+        transfer_id_timeout = self.transfer_id_timeout
+        reasm = self._shared_reassemblers.get(source_node_id, frame.timestamp.monotonic_ns, transfer_id_timeout)
+        if not reasm.is_duplicate(frame, transfer_id_timeout):     # Copies received over other interfaces are dropped.
+            tr = reasm.process_frame(frame, transfer_id_timeout)
+            if tr is not None:
+                self._accept_transfer(inferior, tr)
+
+    def _accept_transfer(self, inferior: pyuavcan.transport.InputSession, tr: pyuavcan.transport.TransferFrom) -> None:
+        try:
+            iface_index = self._inferiors.index(inferior)
+        except ValueError:
+            return  # The inferior has been removed while the read was in progress.
+        if self._deduplicator.should_accept_transfer(iface_index, self.transfer_id_timeout, tr):
+            self._register_first_arrival(inferior, tr)
+            self._push_backlog(self._make_transfer(tr, inferior))
+            self._wake_backlog_waiters()
+        else:
+            self._register_duplicate(inferior, tr)
 
-        pending = {self._loop.create_task(do_receive(if_idx, inf)) for if_idx, inf in enumerate(inferiors)}
+    def _register_first_arrival(self,
+                                inferior: pyuavcan.transport.InputSession,
+                                tr:       pyuavcan.transport.TransferFrom) -> None:
+        try:
+            self._stat_first_deliveries[inferior] += 1
+        except LookupError:
+            self._stat_first_deliveries[inferior] = 1
+        if tr.source_node_id is not None:   # Anonymous transfers are not deduplicated, so there is no skew.
+            key = tr.source_node_id, tr.transfer_id
+            self._first_arrivals.pop(key, None)     # Re-inserted below to move it to the end.
+            self._first_arrivals[key] = tr.timestamp.monotonic_ns
+            while len(self._first_arrivals) > _FIRST_ARRIVAL_TRACKING_CAPACITY:
+                del self._first_arrivals[next(iter(self._first_arrivals))]
+
+    def _register_duplicate(self,
+                            inferior: pyuavcan.transport.InputSession,
+                            tr:       pyuavcan.transport.TransferFrom) -> None:
         try:
-            while True:
-                assert len(pending) == len(inferiors)
-                done, pending = await asyncio.wait(pending,  # type: ignore
-                                                   loop=self._loop,
-                                                   return_when=asyncio.FIRST_COMPLETED)
-                _logger.debug('%r wait result: %d pending, %d done: %r', self, len(pending), len(done), done)
-
-                # Process those that are done and push received transfers into the backlog.
-                transfer_id_timeout = self.transfer_id_timeout  # May have been updated.
-                for f in done:
-                    if_idx, inf, tr = await f
-                    assert isinstance(if_idx, int) and isinstance(inf, pyuavcan.transport.InputSession)
-                    if tr is not None:  # Otherwise, the read has timed out.
-                        assert isinstance(tr, pyuavcan.transport.TransferFrom)
-                        if self._deduplicator.should_accept_transfer(if_idx, transfer_id_timeout, tr):
-                            self._backlog.append(self._make_transfer(tr, inf))
-
-                # Termination condition: success or timeout. We may have read more than one transfer.
-                if self._backlog or self._loop.time() >= monotonic_deadline:
-                    break
-
-                # Not done yet - restart those reads that have completed; the pending ones remain pending, unchanged.
-                for f in done:
-                    if_idx, inf, _ = f.result()
-                    assert isinstance(if_idx, int) and isinstance(inf, pyuavcan.transport.InputSession)
-                    pending.add(self._loop.create_task(do_receive(if_idx, inf)))
-        finally:
-            if pending:
-                _logger.debug('%r canceling %d pending reads', self, len(pending))
-            for f in pending:
-                f.cancel()
+            self._stat_duplicates[inferior] += 1
+        except LookupError:
+            self._stat_duplicates[inferior] = 1
+        assert tr.source_node_id is not None, 'Anonymous transfers are not expected to be deduplicated'
+        first_ns = self._first_arrivals.get((tr.source_node_id, tr.transfer_id))
+        if first_ns is not None:
+            skew = abs(tr.timestamp.monotonic_ns - first_ns) * 1e-9
+            if skew <= self.transfer_id_timeout:   # Otherwise, the first copy belongs to an older transfer.
+                hist = self._stat_arrival_skew.setdefault(inferior, [0] * self._num_skew_bins)
+                hist[bisect.bisect_left(self.ARRIVAL_SKEW_HISTOGRAM_BOUNDS, skew)] += 1
+
+    @property
+    def _num_skew_bins(self) -> int:
+        return len(self.ARRIVAL_SKEW_HISTOGRAM_BOUNDS) + 1
+
+    def _push_backlog(self, transfer: RedundantTransferFrom) -> None:
+        if self._backlog_capacity is not None and len(self._backlog) >= self._backlog_capacity:
+            if self._backlog_overflow_policy == TransferQueue.OverflowPolicy.DROP_NEWEST:
+                self._register_dropped_transfer(transfer)
+                return
+            self._register_dropped_transfer(self._backlog.popleft())
+        self._backlog.append(transfer)
+        self._stat_backlog_high_water_mark = max(self._stat_backlog_high_water_mark, len(self._backlog))
+
+    def _register_dropped_transfer(self, transfer: RedundantTransferFrom) -> None:
+        self._stat_dropped_transfers += 1
+        _logger.info('%s: Backlog overflow; transfer %s is dropped', self, transfer)
+
+    def _wake_backlog_waiters(self) -> None:
+        for fut in self._backlog_waiters:
+            if not fut.done():
+                fut.set_result(None)
+        self._backlog_waiters.clear()
 
     @staticmethod
     def _make_transfer(origin:   pyuavcan.transport.TransferFrom,
@@ -370,14 +681,25 @@ def _unittest_redundant_input_cyclic() -> None:
 
     assert None is await_(ses.receive_until(loop.time() + 1.0))  # Nothing left to read now.
 
-    # This one will be rejected because wrong iface and the switch timeout is not yet exceeded.
+    # This one will be rejected because wrong iface, the switch timeout is not yet exceeded, and it is not new.
     assert await_(tx_a.send_until(Transfer(timestamp=Timestamp.now(),
                                            priority=Priority.HIGH,
-                                           transfer_id=4,
+                                           transfer_id=3,
                                            fragmented_payload=[memoryview(b'rej')]),
                                   loop.time() + 1.0))
     assert None is await_(ses.receive_until(loop.time() + 0.1))
 
+    # This one will be accepted despite the wrong iface because its transfer-ID is new (fast failover).
+    assert await_(tx_a.send_until(Transfer(timestamp=Timestamp.now(),
+                                           priority=Priority.HIGH,
+                                           transfer_id=4,
+                                           fragmented_payload=[memoryview(b'new')]),
+                                  loop.time() + 1.0))
+    tr = await_(ses.receive_until(loop.time() + 0.1))
+    assert isinstance(tr, RedundantTransferFrom)
+    assert tr.transfer_id == 4
+    assert tr.inferior_session == inf_a
+
     # Transfer-ID timeout reconfiguration.
     ses.transfer_id_timeout = 3.0
     with pytest.raises(ValueError):
@@ -408,11 +730,15 @@ def _unittest_redundant_input_cyclic() -> None:
 
     # Stats check.
     assert ses.sample_statistics() == RedundantSessionStatistics(
-        transfers=4,
+        transfers=5,
         frames=inf_b.sample_statistics().frames,
-        payload_bytes=12,
+        payload_bytes=15,
         errors=0,
         drops=0,
+        backlog_high_water_mark=1,
+        first_deliveries=[3],
+        duplicates=[0],
+        arrival_skew_histograms=[[0] * 6],
         inferiors=[
             inf_b.sample_statistics(),
         ],
@@ -519,13 +845,20 @@ def _unittest_redundant_input_monotonic() -> None:
     assert tr.fragmented_payload == [memoryview(b'acc')]
     assert tr.inferior_session == inf_a
 
-    # Stats check.
+    # Stats check. The copies from the second interface have arrived later, the exact skew is not deterministic.
+    skew = ses.sample_statistics().arrival_skew_histograms
+    assert skew[0] == [0] * 6
+    assert sum(skew[1]) == 2
     assert ses.sample_statistics() == RedundantSessionStatistics(
         transfers=3,
         frames=inf_a.sample_statistics().frames + inf_b.sample_statistics().frames,
         payload_bytes=9,
         errors=0,
         drops=0,
+        backlog_high_water_mark=2,
+        first_deliveries=[3, 0],
+        duplicates=[0, 2],
+        arrival_skew_histograms=skew,
         inferiors=[
             inf_a.sample_statistics(),
             inf_b.sample_statistics(),
@@ -533,3 +866,339 @@ def _unittest_redundant_input_monotonic() -> None:
     )
 
     ses.close()
+
+
+def _unittest_redundant_input_backlog() -> None:
+    import pytest
+    from pyuavcan.transport import Transfer, Timestamp, Priority
+    from pyuavcan.transport.loopback import LoopbackTransport
+
+    loop = asyncio.get_event_loop()
+    await_ = loop.run_until_complete
+
+    spec = pyuavcan.transport.InputSessionSpecifier(pyuavcan.transport.MessageDataSpecifier(4321), None)
+    spec_tx = pyuavcan.transport.OutputSessionSpecifier(spec.data_specifier, None)
+    meta = pyuavcan.transport.PayloadMetadata(0x_deadbeef_deadbeef, 30)
+
+    tr_a = LoopbackTransport(111)
+    tr_b = LoopbackTransport(111)
+    tx_a = tr_a.get_output_session(spec_tx, meta)
+    ses = RedundantInputSession(spec, meta, tid_modulo_provider=lambda: None, loop=loop, finalizer=lambda: None)
+    # noinspection PyProtectedMember
+    ses._add_inferior(tr_a.get_input_session(spec, meta))
+    # noinspection PyProtectedMember
+    ses._add_inferior(tr_b.get_input_session(spec, meta))  # Two inferiors, so the inferiors are read continuously.
+
+    assert ses.backlog_capacity == RedundantInputSession.DEFAULT_BACKLOG_CAPACITY
+    assert ses.backlog_overflow_policy == TransferQueue.OverflowPolicy.DROP_NEWEST
+    with pytest.raises(ValueError):
+        ses.backlog_capacity = 0
+    with pytest.raises(ValueError):
+        ses.backlog_overflow_policy = None  # type: ignore
+    ses.backlog_capacity = 3
+
+    async def send(transfer_ids: typing.Iterable[int]) -> None:
+        for tid in transfer_ids:
+            assert await tx_a.send_until(Transfer(timestamp=Timestamp.now(),
+                                                  priority=Priority.HIGH,
+                                                  transfer_id=tid,
+                                                  fragmented_payload=[memoryview(b'abc')]),
+                                         loop.time() + 1.0)
+        await asyncio.sleep(0.1)    # Let the reader tasks catch up.
+
+    async def receive() -> typing.List[int]:
+        out: typing.List[int] = []
+        while True:
+            tr = await ses.receive_until(loop.time() + 0.1)
+            if tr is None:
+                return out
+            out.append(tr.transfer_id)
+
+    await_(send(range(5)))
+    assert await_(receive()) == [0, 1, 2]
+    assert ses.sample_statistics().dropped_transfers == 2
+    assert ses.sample_statistics().backlog_high_water_mark == 3
+
+    ses.backlog_overflow_policy = TransferQueue.OverflowPolicy.DROP_OLDEST
+    await_(send(range(5, 10)))
+    assert await_(receive()) == [7, 8, 9]
+    await_(send(range(10, 13)))
+    ses.backlog_capacity = 1
+    assert await_(receive()) == [12]
+    assert ses.sample_statistics().dropped_transfers == 6
+
+    ses.backlog_capacity = None
+    await_(send(range(13, 20)))
+    assert await_(receive()) == list(range(13, 20))
+    assert ses.sample_statistics().dropped_transfers == 6
+    assert ses.sample_statistics().backlog_high_water_mark == 7
+
+    ses.close()
+    await_(asyncio.sleep(0.1))  # Let the cancelled reader tasks terminate.
+
+
+def _unittest_redundant_input_deduplication_statistics() -> None:
+    from pyuavcan.transport import Timestamp, Priority, TransferFrom
+    from pyuavcan.transport.loopback import LoopbackTransport
+
+    loop = asyncio.get_event_loop()
+    await_ = loop.run_until_complete
+
+    spec = pyuavcan.transport.InputSessionSpecifier(pyuavcan.transport.MessageDataSpecifier(4321), None)
+    meta = pyuavcan.transport.PayloadMetadata(0x_deadbeef_deadbeef, 30)
+
+    inf_a = LoopbackTransport(111).get_input_session(spec, meta)
+    inf_b = LoopbackTransport(111).get_input_session(spec, meta)
+    ses = RedundantInputSession(spec, meta, tid_modulo_provider=lambda: None, loop=loop, finalizer=lambda: None)
+    ses._add_inferior(inf_a)
+    ses._add_inferior(inf_b)
+    assert ses.sample_statistics().arrival_skew_histograms == [[0] * 6, [0] * 6]
+
+    def accept(inferior:       pyuavcan.transport.InputSession,
+               at:             float,
+               transfer_id:    int,
+               source_node_id: typing.Optional[int] = 42) -> None:
+        ses._accept_transfer(inferior, TransferFrom(timestamp=Timestamp(system_ns=0, monotonic_ns=round(at * 1e9)),
+                                                    priority=Priority.NOMINAL,
+                                                    transfer_id=transfer_id,
+                                                    fragmented_payload=[],
+                                                    source_node_id=source_node_id))
+
+    accept(inf_a, 10.000, 0)
+    accept(inf_b, 10.000_05, 0)    # 50 us
+    accept(inf_a, 10.010, 1)
+    accept(inf_b, 10.015, 1)       # 5 ms
+    accept(inf_b, 10.020, 2)
+    accept(inf_a, 10.520, 2)       # 500 ms
+    accept(inf_a, 10.600, 2)       # The same interface delivers a copy again (e.g., temporal redundancy).
+    accept(inf_a, 11.000, 3, None)
+    accept(inf_b, 11.001, 3, None)  # Anonymous transfers are not deduplicated.
+    stats = ses.sample_statistics()
+    assert stats.first_deliveries == [3, 2]
+    assert stats.duplicates == [2, 2]
+    assert stats.arrival_skew_histograms == [[0, 0, 0, 0, 2, 0], [1, 0, 1, 0, 0, 0]]
+    assert len(ses._backlog) == 5
+
+    # The statistics of the removed inferior are discarded.
+    ses._close_inferior(0)
+    stats = ses.sample_statistics()
+    assert stats.first_deliveries == [2]
+    assert stats.duplicates == [2]
+    assert stats.arrival_skew_histograms == [[1, 0, 1, 0, 0, 0]]
+
+    ses.close()
+    await_(asyncio.sleep(0.1))  # Let the cancelled reader tasks terminate.
+
+
+def _unittest_redundant_input_frame_level() -> None:
+    from pyuavcan.transport import Timestamp, Priority
+    from pyuavcan.transport.loopback import LoopbackTransport
+    from pyuavcan.transport.commons.high_overhead_transport import serialize_transfer
+    from pyuavcan.transport.serial import SerialFrame
+    # noinspection PyProtectedMember
+    from pyuavcan.transport.serial._session import SerialInputSession
+
+    loop = asyncio.get_event_loop()
+    await_ = loop.run_until_complete
+
+    spec = pyuavcan.transport.InputSessionSpecifier(pyuavcan.transport.MessageDataSpecifier(4321), None)
+    meta = pyuavcan.transport.PayloadMetadata(0x_deadbeef_deadbeef, 100)
+
+    def mk_frames(transfer_id: int, payload: bytes) -> typing.List[SerialFrame]:
+        def construct_frame(index: int, end_of_transfer: bool, frame_payload: memoryview) -> SerialFrame:
+            return SerialFrame(timestamp=Timestamp.now(),
+                               priority=Priority.NOMINAL,
+                               source_node_id=42,
+                               destination_node_id=None,
+                               data_specifier=spec.data_specifier,
+                               data_type_hash=meta.data_type_hash,
+                               transfer_id=transfer_id,
+                               index=index,
+                               end_of_transfer=end_of_transfer,
+                               payload=frame_payload)
+        return list(serialize_transfer([memoryview(payload)], 10, construct_frame))
+
+    async def receive() -> typing.List[typing.Tuple[int, bytes]]:
+        out: typing.List[typing.Tuple[int, bytes]] = []
+        while True:
+            tr = await ses.receive_until(loop.time() + 0.1)
+            if tr is None:
+                return out
+            out.append((tr.transfer_id, b''.join(tr.fragmented_payload)))
+
+    inf_a = SerialInputSession(spec, meta, loop, lambda: None)
+    inf_b = SerialInputSession(spec, meta, loop, lambda: None)
+    ses = RedundantInputSession(spec, meta, tid_modulo_provider=lambda: None, loop=loop, finalizer=lambda: None)
+    ses._set_frame_level_redundancy(True)
+    ses._add_inferior(inf_a)
+    assert len(ses._readers) == 1     # The inferior is not read directly even though it is the only one.
+    ses._add_inferior(inf_b)
+    # A transfer from the loopback inferior is handled at the transfer level.
+    ses._add_inferior(LoopbackTransport(111).get_input_session(spec, meta))
+
+    # Each interface loses a different frame, but the transfer is still received.
+    frames = mk_frames(0, b'0123456789' * 3)
+    assert len(frames) == 4   # Three data frames plus the CRC, which did not fit into the last frame.
+    for fr in frames[0], frames[2]:
+        inf_a._process_frame(fr)
+    for fr in frames[1], frames[3], frames[2]:
+        inf_b._process_frame(fr)
+    for fr in frames:
+        inf_a._process_frame(fr)    # Late copies of the complete transfer are discarded.
+    tr = await_(ses.receive_until(loop.time() + 0.1))
+    assert tr is not None and tr.transfer_id == 0
+    assert len(tr.fragmented_payload) == 3  # The frame payloads are not copied into one buffer.
+    assert b''.join(tr.fragmented_payload) == b'0123456789' * 3
+    assert await_(receive()) == []
+
+    # The inferiors have not reassembled anything.
+    assert inf_a.sample_statistics().frames == 6
+    assert inf_b.sample_statistics().frames == 3
+    assert inf_a.sample_statistics().transfers == inf_b.sample_statistics().transfers == 0
+    assert ses.sample_statistics().transfers == 1
+    assert ses.sample_statistics().reassembly_errors == 0
+
+    # Anonymous transfers are not diverted because they do not require reassembly.
+    anonymous = SerialFrame(timestamp=Timestamp.now(),
+                            priority=Priority.NOMINAL,
+                            source_node_id=None,
+                            destination_node_id=None,
+                            data_specifier=spec.data_specifier,
+                            data_type_hash=meta.data_type_hash,
+                            transfer_id=5,
+                            index=0,
+                            end_of_transfer=True,
+                            payload=memoryview(b'anon'))
+    inf_a._process_frame(anonymous)
+    assert await_(receive()) == [(5, b'anon')]
+    assert inf_a.sample_statistics().transfers == 1
+
+    # Malformed transfers are reported by the shared reassembler.
+    frames = mk_frames(1, b'abcdefghijklmnop')
+    frames[0] = dataclasses.replace(frames[0], payload=memoryview(b'ABCDEFGHIJ'))
+    for fr in frames:
+        inf_b._process_frame(fr)
+    assert await_(receive()) == []
+    assert ses.sample_statistics().reassembly_errors == 1
+
+    # The shared reassembler of a remote node that has been silent for too long is evicted.
+    assert len(ses._shared_reassemblers) == 1
+    ses.reassembler_idle_timeout = 10.0
+    later = Timestamp(system_ns=0, monotonic_ns=Timestamp.now().monotonic_ns + 60 * 10 ** 9)
+    for fr in mk_frames(3, b'later'):
+        inf_a._process_frame(dataclasses.replace(fr, timestamp=later, source_node_id=43))
+    assert await_(receive()) == [(3, b'later')]
+    assert len(ses._shared_reassemblers) == 1   # Only the reassembler of the new node is left.
+
+    # When the mode is disabled, each inferior reassembles its transfers independently again.
+    ses._set_frame_level_redundancy(False)
+    frames = mk_frames(2, b'abcdefghijklmnop')
+    for fr in frames[1:]:
+        inf_a._process_frame(fr)
+    for fr in frames[:1]:
+        inf_b._process_frame(fr)
+    assert await_(receive()) == []
+    for fr in frames:
+        inf_b._process_frame(fr)
+    assert await_(receive()) == [(2, b'abcdefghijklmnop')]
+    assert inf_b.sample_statistics().transfers == 1
+    assert ses.sample_statistics().transfers == 4
+
+    ses.close()
+    await_(asyncio.sleep(0.1))  # Let the cancelled reader tasks terminate.
+
+
+def _unittest_redundant_input_direct_mode() -> None:
+    from pyuavcan.transport import Transfer, Timestamp, Priority
+    from pyuavcan.transport.loopback import LoopbackTransport
+
+    loop = asyncio.get_event_loop()
+    await_ = loop.run_until_complete
+
+    spec = pyuavcan.transport.InputSessionSpecifier(pyuavcan.transport.MessageDataSpecifier(4321), None)
+    spec_tx = pyuavcan.transport.OutputSessionSpecifier(spec.data_specifier, None)
+    meta = pyuavcan.transport.PayloadMetadata(0x_deadbeef_deadbeef, 30)
+
+    tr_a = LoopbackTransport(111)
+    tr_b = LoopbackTransport(111)
+    tx_a = tr_a.get_output_session(spec_tx, meta)
+    tx_b = tr_b.get_output_session(spec_tx, meta)
+    inf_a = tr_a.get_input_session(spec, meta)
+    inf_b = tr_b.get_input_session(spec, meta)
+    ses = RedundantInputSession(spec, meta, tid_modulo_provider=lambda: None, loop=loop, finalizer=lambda: None)
+
+    def send(transfer_id: int, tx: pyuavcan.transport.OutputSession = tx_a) -> None:
+        assert await_(tx.send_until(Transfer(timestamp=Timestamp.now(),
+                                             priority=Priority.HIGH,
+                                             transfer_id=transfer_id,
+                                             fragmented_payload=[memoryview(b'abc')]),
+                                    loop.time() + 1.0))
+
+    # One inferior is read directly; concurrent reads are not serialized.
+    # noinspection PyProtectedMember
+    ses._add_inferior(inf_a)
+    assert ses._direct_inferior is inf_a
+    assert not ses._readers
+    rx_1 = loop.create_task(ses.receive_until(loop.time() + 1.0))
+    rx_2 = loop.create_task(ses.receive_until(loop.time() + 1.0))
+    await_(asyncio.sleep(0.1))
+    assert not ses._lock.locked()
+    send(0)
+    send(1)
+    assert sorted(x.transfer_id for x in await_(asyncio.gather(rx_1, rx_2))) == [0, 1]  # type: ignore
+
+    # A new inferior is added while a read is in progress. The transfer is routed through the backlog.
+    rx_1 = loop.create_task(ses.receive_until(loop.time() + 1.0))
+    await_(asyncio.sleep(0.1))
+    # noinspection PyProtectedMember
+    ses._add_inferior(inf_b)
+    assert ses._direct_inferior is None
+    assert len(ses._readers) == 2
+    send(2)
+    tr = await_(rx_1)
+    assert tr is not None and tr.transfer_id == 2 and tr.inferior_session == inf_a
+
+    # The deduplicator state has been kept up to date in the direct mode, so the old transfers are rejected.
+    send(1)
+    assert await_(ses.receive_until(loop.time() + 0.1)) is None
+    send(3)
+    tr = await_(ses.receive_until(loop.time() + 0.1))
+    assert tr is not None and tr.transfer_id == 3
+
+    # Back to the direct mode while a read is in progress. The read continues from the remaining inferior.
+    rx_1 = loop.create_task(ses.receive_until(loop.time() + 3.0))
+    await_(asyncio.sleep(0.1))
+    # noinspection PyProtectedMember
+    ses._close_inferior(1)
+    assert ses._direct_inferior is inf_a
+    await_(asyncio.sleep(0.1))
+    assert not ses._readers
+    time_before = loop.time()
+    send(4)
+    tr = await_(rx_1)
+    assert loop.time() - time_before < 1.0, 'The pending call should have been switched to the direct mode'
+    assert tr is not None and tr.transfer_id == 4 and tr.inferior_session == inf_a
+    send(5)
+    tr = await_(ses.receive_until(loop.time() + 0.1))
+    assert tr is not None and tr.transfer_id == 5
+
+    # A new inferior is added while a direct read is in progress; the transfer arrives via the new inferior.
+    inf_b = tr_b.get_input_session(spec, meta)
+    rx_1 = loop.create_task(ses.receive_until(loop.time() + 3.0))
+    await_(asyncio.sleep(0.1))
+    # noinspection PyProtectedMember
+    ses._add_inferior(inf_b)
+    assert ses._direct_inferior is None
+    time_before = loop.time()
+    send(6, tx_b)
+    tr = await_(rx_1)
+    assert loop.time() - time_before < 1.0, 'The pending call should have been switched to the backlog mode'
+    assert tr is not None and tr.transfer_id == 6 and tr.inferior_session == inf_b
+
+    stats = ses.sample_statistics()
+    assert stats.transfers == 7
+    assert stats.first_deliveries == [6, 1]
+
+    ses.close()
+    assert ses._direct_inferior is None
+    await_(asyncio.sleep(0.1))
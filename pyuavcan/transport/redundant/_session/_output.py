@@ -4,11 +4,14 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
+from __future__ import annotations
+import enum
 import typing
 import logging
 import asyncio
 import pyuavcan.transport
 from ._base import RedundantSession, RedundantSessionStatistics
+from .._selector import InferiorSelector
 
 
 _logger = logging.getLogger(__name__)
@@ -58,9 +61,28 @@ class RedundantFeedback(pyuavcan.transport.Feedback):
 class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession):
     """
     This is a composite of a group of :class:`pyuavcan.transport.OutputSession`.
-    Every outgoing transfer is simply forked into each of the inferior sessions.
+    Every outgoing transfer is simply forked into each of the inferior sessions,
+    unless an :attr:`inferior_selector` is installed.
     The result aggregation policy is documented in :func:`send_until`.
+
+    If there is only one inferior, the transfers are forwarded to it directly, bypassing the redundancy logic,
+    unless there is an :attr:`inferior_selector` or some sends are still outstanding;
+    the session switches between the modes automatically when the set of inferiors is changed.
     """
+
+    class CompletionPolicy(enum.Enum):
+        #: :meth:`RedundantOutputSession.send_until` returns when all inferiors have completed. This is the default.
+        ALL = enum.auto()
+
+        #: :meth:`RedundantOutputSession.send_until` returns as soon as any inferior has succeeded;
+        #: the other inferiors continue sending in the background until their completion or the deadline.
+        #: This is useful if the inferiors are heterogeneous, e.g., a congested CAN bus next to an Ethernet link,
+        #: so that the slowest inferior does not delay the caller.
+        FIRST_SUCCESS = enum.auto()
+
+    #: The default value of :attr:`max_outstanding_sends`. Can be overridden after instantiation if needed.
+    DEFAULT_MAX_OUTSTANDING_SENDS = 64
+
     def __init__(self,
                  specifier:        pyuavcan.transport.OutputSessionSpecifier,
                  payload_metadata: pyuavcan.transport.PayloadMetadata,
@@ -79,14 +101,22 @@ class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession)
         assert callable(self._finalizer)
 
         self._inferiors: typing.List[pyuavcan.transport.OutputSession] = []
+        # The only inferior if there is exactly one, None otherwise. Updated together with the list of inferiors.
+        self._direct_inferior: typing.Optional[pyuavcan.transport.OutputSession] = None
         self._feedback_handler: typing.Optional[typing.Callable[[RedundantFeedback], None]] = None
         self._idle_send_future: typing.Optional[asyncio.Future[None]] = None
         self._lock = asyncio.Lock(loop=self._loop)
+        self._completion_policy = RedundantOutputSession.CompletionPolicy.ALL
+        self._max_outstanding_sends = self.DEFAULT_MAX_OUTSTANDING_SENDS
+        self._outstanding_sends: typing.Dict[pyuavcan.transport.OutputSession, int] = {}
+        self._background_sends: typing.Set[asyncio.Future[typing.Union[bool, Exception]]] = set()
+        self._inferior_selector: typing.Optional[InferiorSelector] = None
 
         self._stat_transfers = 0
         self._stat_payload_bytes = 0
         self._stat_errors = 0
         self._stat_drops = 0
+        self._stat_backpressure_drops: typing.Dict[pyuavcan.transport.OutputSession, int] = {}
 
     def _add_inferior(self, session: pyuavcan.transport.Session) -> None:
         assert isinstance(session, pyuavcan.transport.OutputSession)
@@ -100,6 +130,7 @@ class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession)
                 session.disable_feedback()
             # If and only if all went well, add the new inferior to the set.
             self._inferiors.append(session)
+            self._update_direct_inferior()
             # Unlock the pending transmission because now we have an inferior to work with.
             if self._idle_send_future is not None:
                 self._idle_send_future.set_result(None)
@@ -112,6 +143,8 @@ class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession)
         except LookupError:
             pass
         else:
+            self._update_direct_inferior()
+            self._stat_backpressure_drops.pop(session, None)
             session.close()  # May raise.
 
     @property
@@ -144,10 +177,64 @@ class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession)
             except Exception as ex:
                 _logger.exception('%s could not disable feedback on %r: %s', self, ses, ex)
 
+    @property
+    def completion_policy(self) -> RedundantOutputSession.CompletionPolicy:
+        """
+        Whether :meth:`send_until` waits for all inferiors or returns on the first success.
+        See :class:`CompletionPolicy`.
+        """
+        return self._completion_policy
+
+    @completion_policy.setter
+    def completion_policy(self, value: RedundantOutputSession.CompletionPolicy) -> None:
+        if not isinstance(value, RedundantOutputSession.CompletionPolicy):
+            raise ValueError(f'Invalid completion policy: {value!r}')
+        self._completion_policy = value
+
+    @property
+    def max_outstanding_sends(self) -> int:
+        """
+        The maximum number of transfers that may be in the process of being sent via one inferior at the same time.
+        This only matters for :attr:`CompletionPolicy.FIRST_SUCCESS`, where the sends via slow inferiors
+        may pile up in the background. If an inferior has reached the limit, new transfers are not submitted to it
+        until some of its outstanding sends are completed; such skipped transfers are counted per inferior
+        in :attr:`RedundantSessionStatistics.backpressure_drops`.
+        The value shall be a positive integer, otherwise you get a :class:`ValueError`.
+        """
+        return self._max_outstanding_sends
+
+    @max_outstanding_sends.setter
+    def max_outstanding_sends(self, value: int) -> None:
+        if not value > 0:
+            raise ValueError(f'Invalid value for max outstanding sends: {value}')
+        self._max_outstanding_sends = int(value)
+
+    @property
+    def inferior_selector(self) -> typing.Optional[InferiorSelector]:
+        """
+        The policy that decides which inferiors are used to send each transfer,
+        such as :class:`pyuavcan.transport.redundant.HealthScoringSelector`.
+        If the selected inferiors fail, the transfer is sent via the rest of them;
+        see :class:`pyuavcan.transport.redundant.InferiorSelector`.
+        None (default) means that every transfer is sent via all inferiors.
+        """
+        return self._inferior_selector
+
+    @inferior_selector.setter
+    def inferior_selector(self, value: typing.Optional[InferiorSelector]) -> None:
+        if value is not None and not isinstance(value, InferiorSelector):
+            raise ValueError(f'Invalid inferior selector: {value!r}')
+        self._inferior_selector = value
+
     async def send_until(self, transfer: pyuavcan.transport.Transfer, monotonic_deadline: float) -> bool:
         """
         Sends the transfer via all of the inferior sessions concurrently.
-        Returns when all of the inferior calls return and/or raise exceptions.
+        Returns when all of the inferior calls return and/or raise exceptions,
+        or as soon as one of them succeeds, depending on the :attr:`completion_policy`.
+        In the latter case, the outcome of the other inferior calls does not affect the result.
+        Inferiors that have reached :attr:`max_outstanding_sends` are skipped.
+        If there is an :attr:`inferior_selector`, the transfer is sent via the selected inferiors first;
+        the others are used only if none of the selected ones succeeded and the deadline is not yet reached.
         Edge cases:
 
         - If there are no inferiors, the method will await until either the deadline is expired
@@ -165,10 +252,17 @@ class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession)
 
         In other words, the error handling strategy is optimistic: if one inferior reported success,
         the call is assumed to have succeeded; best result is always returned.
+
+        If there is only one inferior, the call is forwarded to it directly without locking
+        (see the class documentation); the outcome is the same.
         """
         if self._finalizer is None:
             raise pyuavcan.transport.ResourceClosedError(f'{self} is closed')
 
+        inferior = self._direct_inferior
+        if inferior is not None and self._inferior_selector is None and not self._outstanding_sends:
+            return await self._send_directly(inferior, transfer, monotonic_deadline)
+
         async with self._lock:  # Serialize access to the inferiors and the idle future.
             # It is required to create a local copy to prevent disruption of the logic when
             # the set of inferiors is changed in the background. Oh, Rust, where art thou.
@@ -198,18 +292,28 @@ class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession)
                     self._idle_send_future = None
             assert not self._idle_send_future
 
-            if not inferiors:
+            results: typing.List[typing.Union[bool, Exception]] = []
+            used: typing.List[pyuavcan.transport.OutputSession] = []
+            for group in self._select(inferiors):
+                if any(x is True for x in results) or (used and self._loop.time() >= monotonic_deadline):
+                    break
+                group = [ses for ses in group if self._admit(ses)]
+                if not group:
+                    continue
+                if used:
+                    _logger.info('%s: The selected inferiors have failed, falling back to %r', self, group)
+                group_results = await self._send_via_group(group, transfer, monotonic_deadline)
+                if group_results is None:
+                    self._stat_transfers += 1
+                    self._stat_payload_bytes += sum(map(len, transfer.fragmented_payload))
+                    return True
+                results += group_results
+                used += group
+
+            if not used:
                 self._stat_drops += 1
                 return False    # Still nothing.
-
-            results = await asyncio.gather(
-                *[
-                    ses.send_until(transfer, monotonic_deadline) for ses in inferiors
-                ],
-                loop=self._loop,
-                return_exceptions=True
-            )
-            assert results and len(results) == len(inferiors)
+            assert results and len(results) == len(used)
             _logger.debug('%s send results: %s', self, results)
 
             exceptions = [ex for ex in results if isinstance(ex, Exception)]
@@ -249,6 +353,9 @@ class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession)
         - ``drops``         - the number of redundant transfers where ALL inferiors timed out (timeout count).
         - ``frames``        - the total number of frames summed from all inferiors (i.e., replicated frame count).
           This value is invalidated when the set of inferiors is changed. The semantics may change later.
+        - ``outstanding_sends``  - per inferior, the number of transfers being sent at the moment.
+        - ``backpressure_drops`` - per inferior, the number of transfers not submitted to it because of
+          :attr:`max_outstanding_sends`.
         """
         inferiors = [s.sample_statistics() for s in self._inferiors]
         return RedundantSessionStatistics(
@@ -257,21 +364,151 @@ class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession)
             payload_bytes=self._stat_payload_bytes,
             errors=self._stat_errors,
             drops=self._stat_drops,
+            outstanding_sends=[self._outstanding_sends.get(s, 0) for s in self._inferiors],
+            backpressure_drops=[self._stat_backpressure_drops.get(s, 0) for s in self._inferiors],
             inferiors=inferiors,
         )
 
     def close(self) -> None:
+        for t in self._background_sends:
+            t.cancel()
         for s in self._inferiors:
             try:
                 s.close()
             except Exception as ex:
                 _logger.exception('%s could not close inferior %s: %s', self, s, ex)
         self._inferiors.clear()
+        self._update_direct_inferior()
 
         fin, self._finalizer = self._finalizer, None
         if fin is not None:
             fin()
 
+    async def _send_directly(self,
+                             inferior:           pyuavcan.transport.OutputSession,
+                             transfer:           pyuavcan.transport.Transfer,
+                             monotonic_deadline: float) -> bool:
+        """
+        The fast path for the case of one inferior. The sends are not serialized because there is no shared state
+        to protect; the inferior is responsible for handling concurrent calls, like when it is used directly.
+        """
+        try:
+            result = await inferior.send_until(transfer, monotonic_deadline)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            _logger.error('%s: The only inferior has failed: %r', self, ex)
+            self._stat_errors += 1
+            raise
+        if result:
+            self._stat_transfers += 1
+            self._stat_payload_bytes += sum(map(len, transfer.fragmented_payload))
+        else:
+            self._stat_drops += 1
+        return result
+
+    def _update_direct_inferior(self) -> None:
+        self._direct_inferior = self._inferiors[0] if len(self._inferiors) == 1 else None
+
+    def _select(self, inferiors: typing.Sequence[pyuavcan.transport.OutputSession]) \
+            -> typing.Sequence[typing.Sequence[pyuavcan.transport.OutputSession]]:
+        """
+        :returns: The selected inferiors followed by the reserve ones (unless empty).
+        """
+        selector = self._inferior_selector
+        if selector is None or not inferiors:
+            return [inferiors]
+        selected = selector.select(inferiors, self._loop.time())
+        assert selected and all(x in inferiors for x in selected), 'Invalid selection'
+        reserve = [x for x in inferiors if x not in selected]
+        return [selected, reserve] if reserve else [selected]
+
+    async def _send_via_group(self,
+                              inferiors:          typing.Sequence[pyuavcan.transport.OutputSession],
+                              transfer:           pyuavcan.transport.Transfer,
+                              monotonic_deadline: float) -> typing.Optional[typing.List[typing.Union[bool, Exception]]]:
+        """
+        :returns: None if the completion policy is :attr:`CompletionPolicy.FIRST_SUCCESS` and an inferior has
+            succeeded. Otherwise, the results of all inferiors, ordered like the inferiors.
+        """
+        if self._completion_policy == RedundantOutputSession.CompletionPolicy.FIRST_SUCCESS:
+            return await self._send_until_first_success(inferiors, transfer, monotonic_deadline)
+        return list(await asyncio.gather(
+            *[
+                self._send_via(ses, transfer, monotonic_deadline) for ses in inferiors
+            ],
+            loop=self._loop
+        ))
+
+    def _admit(self, inferior: pyuavcan.transport.OutputSession) -> bool:
+        if self._outstanding_sends.get(inferior, 0) < self._max_outstanding_sends:
+            return True
+        try:
+            self._stat_backpressure_drops[inferior] += 1
+        except LookupError:
+            self._stat_backpressure_drops[inferior] = 1
+        _logger.debug('%s: Inferior %r has reached the limit of outstanding sends, transfer skipped', self, inferior)
+        return False
+
+    async def _send_via(self,
+                        inferior:           pyuavcan.transport.OutputSession,
+                        transfer:           pyuavcan.transport.Transfer,
+                        monotonic_deadline: float) -> typing.Union[bool, Exception]:
+        """
+        Never raises except for cancellation; the exception is returned instead.
+        """
+        try:
+            self._outstanding_sends[inferior] += 1
+        except LookupError:
+            self._outstanding_sends[inferior] = 1
+        started_at = self._loop.time()
+        try:
+            result: typing.Union[bool, Exception] = await inferior.send_until(transfer, monotonic_deadline)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            result = ex
+        finally:
+            self._outstanding_sends[inferior] -= 1
+            if self._outstanding_sends[inferior] <= 0:
+                del self._outstanding_sends[inferior]
+        if self._inferior_selector is not None:
+            self._inferior_selector.report(inferior, result, self._loop.time() - started_at)
+        return result
+
+    async def _send_until_first_success(self,
+                                        inferiors:          typing.Sequence[pyuavcan.transport.OutputSession],
+                                        transfer:           pyuavcan.transport.Transfer,
+                                        monotonic_deadline: float) \
+            -> typing.Optional[typing.List[typing.Union[bool, Exception]]]:
+        """
+        :returns: None if any of the inferiors has succeeded; the others are left running in the background.
+            Otherwise, the results of all inferiors, ordered like the inferiors.
+            If the caller is cancelled, the sends that are still in progress are cancelled as well.
+        """
+        tasks = [self._loop.create_task(self._send_via(ses, transfer, monotonic_deadline)) for ses in inferiors]
+        pending: typing.Set[asyncio.Future[typing.Union[bool, Exception]]] = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, loop=self._loop, return_when=asyncio.FIRST_COMPLETED)
+                if any(t.result() is True for t in done):
+                    background, pending = pending, set()
+                    for t in background:
+                        self._background_sends.add(t)
+                        t.add_done_callback(self._on_background_send_done)
+                    return None
+            return [t.result() for t in tasks]
+        finally:
+            for t in pending:   # Only if interrupted; otherwise, the tasks are either finished or handed over.
+                t.cancel()
+
+    def _on_background_send_done(self, task: asyncio.Future[typing.Union[bool, Exception]]) -> None:
+        self._background_sends.discard(task)
+        if not task.cancelled():
+            result = task.result()
+            if result is not True:
+                _logger.info('%s: Background send has failed: %s', self, self._describe_send_result(result))
+
     def _enable_feedback_on_inferior(self, inferior_session: pyuavcan.transport.OutputSession) -> None:
         def proxy(fb: pyuavcan.transport.Feedback) -> None:
             """
@@ -286,6 +523,9 @@ class RedundantOutputSession(RedundantSession, pyuavcan.transport.OutputSession)
                                 self, fb, inferior_session)
                 return
 
+            if self._inferior_selector is not None:
+                self._inferior_selector.report_feedback(inferior_session, fb)
+
             handler = self._feedback_handler
             if handler is not None:
                 new_fb = RedundantFeedback(fb, inferior_session)
@@ -387,6 +627,8 @@ def _unittest_redundant_output() -> None:
         frames=1,
         payload_bytes=3,
         drops=1,
+        outstanding_sends=[0],
+        backpressure_drops=[0],
         inferiors=[
             SessionStatistics(
                 transfers=1,
@@ -416,6 +658,8 @@ def _unittest_redundant_output() -> None:
         frames=2,
         payload_bytes=9,
         drops=1,
+        outstanding_sends=[0],
+        backpressure_drops=[0],
         inferiors=[
             SessionStatistics(
                 transfers=2,
@@ -464,6 +708,8 @@ def _unittest_redundant_output() -> None:
         frames=3 + 1,
         payload_bytes=15,
         drops=1,
+        outstanding_sends=[0, 0],
+        backpressure_drops=[0, 0],
         inferiors=[
             SessionStatistics(
                 transfers=3,
@@ -656,6 +902,8 @@ def _unittest_redundant_output_exceptions() -> None:
         payload_bytes=len('exception suka'),
         errors=0,
         drops=0,
+        outstanding_sends=[0, 0],
+        backpressure_drops=[0, 0],
         inferiors=[
             SessionStatistics(
                 transfers=0,
@@ -721,3 +969,271 @@ def _unittest_redundant_output_exceptions() -> None:
     is_retired = False
     ses.close()
     assert not is_retired
+
+
+def _unittest_redundant_output_first_success() -> None:
+    import pytest
+    from pyuavcan.transport import Transfer, Timestamp, Priority, TransferFrom
+    from pyuavcan.transport.loopback import LoopbackTransport
+
+    loop = asyncio.get_event_loop()
+    await_ = loop.run_until_complete
+
+    spec = pyuavcan.transport.OutputSessionSpecifier(pyuavcan.transport.MessageDataSpecifier(4321), None)
+    spec_rx = pyuavcan.transport.InputSessionSpecifier(spec.data_specifier, None)
+    meta = pyuavcan.transport.PayloadMetadata(0x_deadbeef_deadbeef, 1024)
+
+    ses = RedundantOutputSession(spec, meta, loop=loop, finalizer=lambda: None)
+    assert ses.completion_policy == RedundantOutputSession.CompletionPolicy.ALL
+    assert ses.max_outstanding_sends == RedundantOutputSession.DEFAULT_MAX_OUTSTANDING_SENDS
+    with pytest.raises(ValueError):
+        ses.completion_policy = 'FIRST_SUCCESS'  # type: ignore
+    with pytest.raises(ValueError):
+        ses.max_outstanding_sends = 0
+
+    tr_fast = LoopbackTransport(111)
+    tr_slow = LoopbackTransport(111)
+    inf_fast = tr_fast.get_output_session(spec, meta)
+    inf_slow = tr_slow.get_output_session(spec, meta)
+    rx_fast = tr_fast.get_input_session(spec_rx, meta)
+    rx_slow = tr_slow.get_input_session(spec_rx, meta)
+    inf_slow.delay = 0.5    # Emulate a congested medium.
+    # noinspection PyProtectedMember
+    ses._add_inferior(inf_fast)
+    # noinspection PyProtectedMember
+    ses._add_inferior(inf_slow)
+
+    def send(transfer_id: int, timeout: float = 2.0) -> bool:
+        return await_(ses.send_until(Transfer(timestamp=Timestamp.now(),
+                                              priority=Priority.NOMINAL,
+                                              transfer_id=transfer_id,
+                                              fragmented_payload=[memoryview(b'abc')]),
+                                     loop.time() + timeout))
+
+    # By default, the call takes as long as the slowest inferior.
+    started_at = loop.time()
+    assert send(1)
+    assert loop.time() - started_at >= 0.5
+    assert ses.sample_statistics().outstanding_sends == [0, 0]
+
+    # The call returns as soon as the fast inferior is done; the slow one completes in the background.
+    ses.completion_policy = RedundantOutputSession.CompletionPolicy.FIRST_SUCCESS
+    ses.max_outstanding_sends = 2
+    started_at = loop.time()
+    assert send(2)
+    assert send(3)
+    assert loop.time() - started_at < 0.4
+    assert ses.sample_statistics().outstanding_sends == [0, 2]
+
+    # The slow inferior is saturated, so the next transfer is not submitted to it.
+    assert send(4)
+    stats = ses.sample_statistics()
+    assert stats.outstanding_sends == [0, 2]
+    assert stats.backpressure_drops == [0, 1]
+    assert stats.transfers == 4
+
+    # If the fast inferior fails, the result of the slow one is awaited.
+    await_(asyncio.sleep(1.0))
+    assert ses.sample_statistics().outstanding_sends == [0, 0]
+    inf_fast.exception = RuntimeError('fast inferior failure')
+    started_at = loop.time()
+    assert send(5)
+    assert loop.time() - started_at >= 0.5
+    assert not send(6, timeout=0.1)     # Both fail --> the result is timeout.
+    assert ses.sample_statistics().drops == 1
+
+    rx_tids_fast: typing.List[int] = []
+    rx_tids_slow: typing.List[int] = []
+    for rx, out in [(rx_fast, rx_tids_fast), (rx_slow, rx_tids_slow)]:
+        while True:
+            tr = await_(rx.receive_until(loop.time() + 0.1))
+            if tr is None:
+                break
+            assert isinstance(tr, TransferFrom)
+            out.append(tr.transfer_id)
+    assert rx_tids_fast == [1, 2, 3, 4]
+    assert rx_tids_slow == [1, 2, 3, 5]
+
+    # If the caller is cancelled while waiting, the unfinished sends are cancelled rather than orphaned.
+    task = loop.create_task(ses.send_until(Transfer(timestamp=Timestamp.now(),
+                                                    priority=Priority.NOMINAL,
+                                                    transfer_id=8,
+                                                    fragmented_payload=[memoryview(b'abc')]),
+                                           loop.time() + 2.0))
+    await_(asyncio.sleep(0.1))
+    assert ses.sample_statistics().outstanding_sends == [0, 1]
+    task.cancel()
+    await_(asyncio.sleep(0.1))
+    assert task.cancelled()
+    assert ses.sample_statistics().outstanding_sends == [0, 0]
+    assert not await_(rx_slow.receive_until(loop.time() + 1.0))
+
+    # Background sends are cancelled when the session is closed.
+    inf_fast.exception = None
+    assert send(7)
+    assert ses.sample_statistics().outstanding_sends == [0, 1]
+    ses.close()
+    await_(asyncio.sleep(0.1))
+    # noinspection PyProtectedMember
+    assert not ses._background_sends
+
+
+def _unittest_redundant_output_selector() -> None:
+    import pytest
+    from pyuavcan.transport import Transfer, Timestamp, Priority
+    from pyuavcan.transport.loopback import LoopbackTransport
+    from .._selector import HealthScoringSelector
+
+    loop = asyncio.get_event_loop()
+    await_ = loop.run_until_complete
+
+    spec = pyuavcan.transport.OutputSessionSpecifier(pyuavcan.transport.MessageDataSpecifier(4321), None)
+    meta = pyuavcan.transport.PayloadMetadata(0x_deadbeef_deadbeef, 1024)
+
+    ses = RedundantOutputSession(spec, meta, loop=loop, finalizer=lambda: None)
+    assert ses.inferior_selector is None
+    with pytest.raises(ValueError):
+        ses.inferior_selector = 'best'  # type: ignore
+    selector = HealthScoringSelector(active_count=1, probe_interval=1.0)
+    ses.inferior_selector = selector
+    assert ses.inferior_selector is selector
+
+    inf_wired = LoopbackTransport(111).get_output_session(spec, meta)
+    inf_radio = LoopbackTransport(111).get_output_session(spec, meta)
+    inf_radio.delay = 0.05  # Slow and costly.
+    # noinspection PyProtectedMember
+    ses._add_inferior(inf_wired)
+    # noinspection PyProtectedMember
+    ses._add_inferior(inf_radio)
+
+    def send(transfer_id: int, timeout: float = 1.0) -> bool:
+        return await_(ses.send_until(Transfer(timestamp=Timestamp.now(),
+                                              priority=Priority.NOMINAL,
+                                              transfer_id=transfer_id,
+                                              fragmented_payload=[memoryview(b'abc')]),
+                                     loop.time() + timeout))
+
+    def counts() -> typing.Tuple[int, int]:
+        return inf_wired.sample_statistics().transfers, inf_radio.sample_statistics().transfers
+
+    # Initially, nothing is known about the inferiors, so both are used. Then the radio is only probed periodically.
+    assert send(0)
+    assert counts() == (1, 1)
+    for tid in range(1, 10):
+        assert send(tid)
+    assert counts() == (10, 1)
+    await_(asyncio.sleep(1.0))
+    assert send(10)
+    assert counts() == (11, 2)
+    assert selector.health[inf_wired].latency < selector.health[inf_radio].latency
+
+    # The wired link fails; the transfers are delivered via the radio while the wired link is tried first
+    # until its score drops below that of the radio.
+    inf_wired.exception = RuntimeError('wired link failure')
+    for tid in range(11, 15):
+        assert send(tid)
+    assert counts() == (11, 6)
+    assert selector.health[inf_wired].errors > 0
+    assert selector.health[inf_wired].success_rate < selector.health[inf_radio].success_rate
+    stats = ses.sample_statistics()
+    assert stats.transfers == 15
+    assert stats.errors == 0
+
+    # If everything fails, the error is reported as usual.
+    inf_radio.exception = RuntimeError('radio link failure')
+    with pytest.raises(RuntimeError):
+        send(15)
+    assert ses.sample_statistics().errors == 1
+
+    # The reserve inferiors are not used if the deadline has expired.
+    inf_wired.exception = None
+    inf_radio.exception = None
+    ses.inferior_selector = HealthScoringSelector(active_count=1, probe_interval=10.0)
+    assert send(16)     # Both are probed, the wired link is preferred.
+    inf_wired.should_timeout = True
+    inf_wired.delay = 0.2
+    assert not send(17, timeout=0.1)
+    assert counts() == (12, 7)
+    assert ses.sample_statistics().drops == 1
+
+    # The feedback is forwarded to the selector.
+    fb_log: typing.List[pyuavcan.transport.OutputSession] = []
+
+    class RecordingSelector(HealthScoringSelector):
+        def report_feedback(self,
+                            inferior: pyuavcan.transport.OutputSession,
+                            feedback: pyuavcan.transport.Feedback) -> None:
+            fb_log.append(inferior)
+            super(RecordingSelector, self).report_feedback(inferior, feedback)
+
+    ses.inferior_selector = RecordingSelector()
+    ses.enable_feedback(lambda _: None)
+    inf_wired.should_timeout = False
+    assert send(18)
+    assert fb_log == [inf_wired, inf_radio] or fb_log == [inf_radio, inf_wired]
+
+    ses.close()
+
+
+def _unittest_redundant_output_direct_mode() -> None:
+    import pytest
+    from pyuavcan.transport import Transfer, Timestamp, Priority
+    from pyuavcan.transport.loopback import LoopbackTransport
+
+    loop = asyncio.get_event_loop()
+    await_ = loop.run_until_complete
+
+    spec = pyuavcan.transport.OutputSessionSpecifier(pyuavcan.transport.MessageDataSpecifier(4321), None)
+    meta = pyuavcan.transport.PayloadMetadata(0x_deadbeef_deadbeef, 1024)
+
+    ses = RedundantOutputSession(spec, meta, loop=loop, finalizer=lambda: None)
+    inf_a = LoopbackTransport(111).get_output_session(spec, meta)
+    inf_b = LoopbackTransport(111).get_output_session(spec, meta)
+    inf_a.delay = 0.3
+
+    async def send_concurrently(count: int) -> typing.List[bool]:
+        return list(await asyncio.gather(*[
+            ses.send_until(Transfer(timestamp=Timestamp.now(),
+                                    priority=Priority.NOMINAL,
+                                    transfer_id=i,
+                                    fragmented_payload=[memoryview(b'abc')]),
+                           loop.time() + 2.0)
+            for i in range(count)
+        ]))
+
+    # One inferior: the sends are forwarded directly and not serialized.
+    # noinspection PyProtectedMember
+    ses._add_inferior(inf_a)
+    assert ses._direct_inferior is inf_a
+    started_at = loop.time()
+    assert await_(send_concurrently(2)) == [True, True]
+    assert loop.time() - started_at < 0.5
+    assert inf_a.sample_statistics().transfers == 2
+
+    inf_a.exception = RuntimeError('Intended')
+    with pytest.raises(RuntimeError):
+        await_(send_concurrently(1))
+    inf_a.exception = None
+
+    # Two inferiors: the sends are serialized by the redundancy logic.
+    # noinspection PyProtectedMember
+    ses._add_inferior(inf_b)
+    assert ses._direct_inferior is None
+    started_at = loop.time()
+    assert await_(send_concurrently(2)) == [True, True]
+    assert loop.time() - started_at >= 0.6
+    assert inf_a.sample_statistics().transfers == 4
+    assert inf_b.sample_statistics().transfers == 2
+
+    # Back to one inferior.
+    # noinspection PyProtectedMember
+    ses._close_inferior(1)
+    assert ses._direct_inferior is inf_a
+    inf_a.delay = 0.0
+    assert await_(send_concurrently(1)) == [True]
+
+    stats = ses.sample_statistics()
+    assert (stats.transfers, stats.errors, stats.drops) == (5, 1, 0)
+
+    ses.close()
+    assert ses._direct_inferior is None
@@ -202,3 +202,4 @@ from ._session import SerialInputSessionStatistics as SerialInputSessionStatisti
 
 from ._frame import SerialFrame as SerialFrame
 from ._stream_parser import StreamParser as StreamParser
+from ._out_of_band import OutOfBandStream as OutOfBandStream
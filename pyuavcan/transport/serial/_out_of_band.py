@@ -0,0 +1,159 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import typing
+import asyncio
+import pyuavcan
+
+
+class OutOfBandStream:
+    """
+    A bounded FIFO of the out-of-band bytes received from the serial port, that is, the data found between
+    UAVCAN frames, such as the output of a command-line interface or a debug console sharing the port.
+    The data is delivered to the reader as a contiguous byte stream rather than by fragment,
+    so the reader is woken up at most once per chunk read from the port regardless of the number of fragments in it.
+
+    When the buffer is full, the oldest bytes are discarded to make room for the new ones,
+    because a console is expected to be more interested in the latest output.
+
+    The stream is disabled by default (the capacity is zero), in which case the out-of-band data is not retained.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._capacity = 0
+        # CPython deletes from the front of a bytearray in constant time, so it behaves as a ring buffer here.
+        self._buffer = bytearray()
+        self._dropped = 0
+        self._waiters: typing.List[asyncio.Future[None]] = []
+
+    @property
+    def capacity(self) -> int:
+        """
+        The maximum number of bytes retained in the buffer awaiting the reader. Zero disables the stream.
+        If the new capacity is smaller than the amount of data currently in the buffer, the oldest data is dropped.
+        A negative value results in :class:`ValueError`.
+        """
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, value: int) -> None:
+        if not value >= 0:
+            raise ValueError(f'Invalid value for out-of-band buffer capacity [byte]: {value}')
+        self._capacity = int(value)
+        self._trim()
+
+    @property
+    def dropped_bytes(self) -> int:
+        """
+        The number of bytes discarded due to the buffer overflow since the stream was created.
+        """
+        return self._dropped
+
+    def push(self, data: typing.Union[bytes, bytearray, memoryview]) -> int:
+        """
+        Appends the data to the buffer and wakes up the pending readers. Does nothing if the stream is disabled.
+        :returns: The number of bytes discarded due to the buffer overflow.
+        """
+        if self._capacity <= 0:
+            return 0
+        self._buffer += data
+        dropped = self._trim()
+        for fut in self._waiters:
+            if not fut.done():
+                fut.set_result(None)
+        self._waiters.clear()
+        return dropped
+
+    def read_nowait(self, max_size: typing.Optional[int] = None) -> bytes:
+        """
+        Returns up to max_size bytes from the buffer (all available data if None) without blocking.
+        The result is empty if there is no data available.
+        """
+        size = len(self._buffer) if max_size is None else min(len(self._buffer), max(0, int(max_size)))
+        out = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return out
+
+    async def read_until(self, monotonic_deadline: float, max_size: typing.Optional[int] = None) -> bytes:
+        """
+        Waits until at least one byte is available or the deadline is reached,
+        then returns up to max_size bytes (all available data if None).
+        The result is empty if no data became available before the deadline.
+        """
+        while not self._buffer:
+            timeout = monotonic_deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            fut = self._loop.create_future()
+            self._waiters.append(fut)
+            try:
+                await asyncio.wait([fut], timeout=timeout)
+            finally:
+                fut.cancel()
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+        return self.read_nowait(max_size)
+
+    def _trim(self) -> int:
+        excess = len(self._buffer) - self._capacity
+        if excess <= 0:
+            return 0
+        del self._buffer[:excess]
+        self._dropped += excess
+        return excess
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __repr__(self) -> str:
+        return pyuavcan.util.repr_attributes_noexcept(self,
+                                                      size=len(self),
+                                                      capacity=self._capacity,
+                                                      dropped_bytes=self._dropped)
+
+
+def _unittest_out_of_band_stream() -> None:
+    from pytest import raises
+
+    loop = asyncio.get_event_loop()
+    st = OutOfBandStream(loop)
+    assert st.capacity == 0
+    with raises(ValueError):
+        st.capacity = -1
+
+    assert st.push(b'ignored') == 0     # Disabled.
+    assert len(st) == 0
+    assert loop.run_until_complete(st.read_until(loop.time() + 0.1)) == b''
+
+    st.capacity = 8
+    assert st.push(b'hello') == 0
+    assert st.push(memoryview(b' world')) == 3
+    assert st.dropped_bytes == 3
+    assert len(st) == 8
+    assert st.read_nowait(3) == b'lo '
+    assert st.read_nowait() == b'world'
+    assert st.read_nowait() == b''
+    print(st)
+
+    async def run() -> None:
+        loop.call_later(0.1, st.push, b'abc')
+        loop.call_later(0.1, st.push, b'def')   # Both pushes are delivered in one read.
+        assert await st.read_until(loop.time() + 1.0) == b'abcdef'
+        loop.call_later(0.1, st.push, b'0123456789')
+        assert await st.read_until(loop.time() + 1.0, 5) == b'23456'
+        assert await st.read_until(loop.time() + 1.0) == b'789'
+        assert await st.read_until(loop.time() + 0.1) == b''
+        assert not st._waiters
+
+    loop.run_until_complete(run())
+    assert st.dropped_bytes == 5
+
+    st.push(b'abcdefgh')
+    st.capacity = 2
+    assert st.read_nowait() == b'gh'
+    assert st.dropped_bytes == 11
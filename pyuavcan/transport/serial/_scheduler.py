@@ -0,0 +1,136 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import heapq
+import typing
+import asyncio
+import itertools
+import pyuavcan
+
+
+class TransmitScheduler:
+    """
+    Arbitrates access to the serial port between concurrent writers at frame granularity.
+    This is a replacement for a plain lock where the waiters are served in the order of frame priority
+    (as defined by :class:`pyuavcan.transport.Priority`) rather than in the order of arrival;
+    waiters of the same priority are served in the FIFO order.
+    This emulates the bus arbitration behavior of CAN: a long low-priority transfer does not delay a high-priority
+    transfer by more than one frame, because the holder is expected to check :meth:`has_waiters_above`
+    after every frame and to yield the port if there is a more urgent frame waiting.
+
+    Hence, the worst-case queueing delay of the top priority class is bounded by the time it takes to emit
+    one frame of the maximum size (the one that may be in flight when the waiter arrives)
+    plus the frames of the same priority that are queued ahead of it.
+    Lower priority classes are not protected from starvation, same as on CAN.
+
+    A waiter gives up when its deadline is reached, so frames that can no longer be sent in time
+    do not occupy the queue.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._busy = False
+        self._waiters: typing.List[typing.Tuple[int, int, asyncio.Future[None]]] = []
+        self._seq_counter = itertools.count()
+
+    async def acquire(self, priority: pyuavcan.transport.Priority, monotonic_deadline: float) -> bool:
+        """
+        Waits until the port is available for this waiter.
+        :returns: True if access is granted (:meth:`release` must be invoked afterwards), False on timeout.
+        """
+        if not self._busy:
+            assert not self._waiters
+            self._busy = True
+            return True
+
+        fut = self._loop.create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq_counter), fut))
+        try:
+            # Do not use wait_for() because it would cancel the future, racing with a concurrent release().
+            await asyncio.wait([fut], timeout=max(0.0, monotonic_deadline - self._loop.time()))
+        except BaseException:
+            if fut.done() and not fut.cancelled():
+                self.release()   # The access has been granted but the caller will never know; pass it on.
+            fut.cancel()
+            raise
+
+        if fut.done():
+            return True
+        fut.cancel()  # Stays in the queue until popped by release(), which will skip it.
+        return False
+
+    def release(self) -> None:
+        """
+        Passes the access to the next waiter in the order of priority.
+        Shall be invoked exactly once per successful :meth:`acquire`.
+        """
+        assert self._busy
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)    # The port remains busy; the ownership is transferred to the waiter.
+                return
+        self._busy = False
+
+    def has_waiters_above(self, priority: pyuavcan.transport.Priority) -> bool:
+        """
+        True if there is a waiter of a strictly higher priority than the specified one
+        (may be a false positive if the waiter has given up already, which is harmless).
+        """
+        return bool(self._waiters) and self._waiters[0][0] < int(priority)
+
+    @property
+    def busy(self) -> bool:
+        return self._busy
+
+    def __repr__(self) -> str:
+        return pyuavcan.util.repr_attributes_noexcept(self, busy=self._busy, waiters=len(self._waiters))
+
+
+def _unittest_transmit_scheduler() -> None:
+    from pyuavcan.transport import Priority
+
+    loop = asyncio.get_event_loop()
+    sch = TransmitScheduler(loop)
+    order: typing.List[str] = []
+
+    async def worker(name: str, priority: Priority, timeout: float) -> None:
+        if await sch.acquire(priority, loop.time() + timeout):
+            order.append(name)
+            await asyncio.sleep(0.01)
+            sch.release()
+        else:
+            order.append(name + ' timeout')
+
+    async def run() -> None:
+        assert not sch.busy
+        assert await sch.acquire(Priority.OPTIONAL, loop.time())  # Uncontended access is granted immediately.
+        assert sch.busy
+        tasks = [
+            loop.create_task(worker('low-1', Priority.LOW, 10.0)),
+            loop.create_task(worker('exceptional', Priority.EXCEPTIONAL, 10.0)),
+            loop.create_task(worker('low-2', Priority.LOW, 10.0)),
+            loop.create_task(worker('nominal', Priority.NOMINAL, 10.0)),
+            loop.create_task(worker('immediate', Priority.IMMEDIATE, 0.05)),  # Times out before getting access.
+        ]
+        await asyncio.sleep(0.1)
+        assert order == ['immediate timeout']
+        assert sch.has_waiters_above(Priority.SLOW)
+        assert sch.has_waiters_above(Priority.IMMEDIATE)
+        assert not sch.has_waiters_above(Priority.EXCEPTIONAL)
+        cancelled = loop.create_task(worker('cancelled', Priority.HIGH, 10.0))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.sleep(0.01)
+        sch.release()
+        await asyncio.gather(*tasks)
+        assert cancelled.cancelled()
+        assert not sch.busy
+
+    loop.run_until_complete(run())
+    assert order == ['immediate timeout', 'exceptional', 'nominal', 'low-1', 'low-2']
+    print(sch)
@@ -4,6 +4,7 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
+import os
 import copy
 import typing
 import asyncio
@@ -17,11 +18,23 @@ import serial
 import pyuavcan.transport
 from ._frame import SerialFrame
 from ._stream_parser import StreamParser
+from ._scheduler import TransmitScheduler
+from ._out_of_band import OutOfBandStream
 from ._session import SerialOutputSession, SerialInputSession
 
 
 _SERIAL_PORT_READ_TIMEOUT = 1.0
 
+# The maximum number of bytes read from the file descriptor at once in the non-blocking mode.
+_NON_BLOCKING_READ_SIZE = 64 * 1024
+
+# Consecutive frames of a transfer are coalesced into one write call as long as the resulting write
+# does not take longer than this (in seconds) at the configured baud rate. See the transport docs.
+_MAX_WRITE_BATCH_DURATION = 0.01
+
+# Assuming one start bit, eight data bits, one stop bit.
+_BITS_PER_BYTE = 10
+
 
 _logger = logging.getLogger(__name__)
 
@@ -32,16 +45,46 @@ class SerialTransportStatistics(pyuavcan.transport.TransportStatistics):
     in_frames:            int = 0
     in_out_of_band_bytes: int = 0
 
+    #: The number of out-of-band bytes discarded because the out-of-band stream buffer has overflowed.
+    in_out_of_band_bytes_dropped: int = 0
+
     out_bytes:      int = 0
     out_frames:     int = 0
     out_transfers:  int = 0
     out_incomplete: int = 0
 
+    #: The number of write calls issued to the serial port.
+    #: This is less than the number of frames if consecutive frames of a transfer are coalesced into one write.
+    out_writes: int = 0
+
+    #: The number of frames emitted per priority level.
+    out_frames_per_priority: typing.Dict[pyuavcan.transport.Priority, int] = dataclasses.field(default_factory=dict)
+
+    #: The worst observed time, in seconds, a frame has spent waiting for access to the serial port, per priority level.
+    #: For the top priority class this is bounded by the time it takes to emit one frame of the maximum size
+    #: plus the frames of the same priority queued ahead of it; see :class:`SerialTransport`.
+    out_max_queueing_delay_per_priority: typing.Dict[pyuavcan.transport.Priority, float] = \
+        dataclasses.field(default_factory=dict)
+
 
 class SerialTransport(pyuavcan.transport.Transport):
     """
     The serial transport is designed for OSI L1 byte-level serial links, such as RS-485, UART, USB CDC ACM, etc.
     Please read the module documentation for details.
+
+    Concurrent output sessions share the serial port at frame granularity:
+    waiting transfers are granted access to the port in the order of their priority,
+    and a transfer yields the port after the current frame if a transfer of a higher priority is waiting,
+    so that a large low-priority transfer cannot block a high-priority one for longer than one frame.
+    The order of frames within a transfer is always preserved.
+    Frames that cannot obtain access to the port before the deadline of their transfer are not emitted.
+
+    Consecutive frames of a transfer are coalesced into one write call to reduce the per-frame overhead
+    (a write involves a round trip to a background thread), which is necessary to saturate fast links.
+    The size of a coalesced write is limited by the amount of data the link can carry in 10 milliseconds
+    at the configured baud rate, so the above latency bound is extended by at most that much.
+    Virtual links such as ``socket://`` have no meaningful baud rate,
+    so specify a high one explicitly (e.g., ``baudrate=100_000_000``) to enable coalescing with them.
     """
 
     DEFAULT_MTU = 1024
@@ -56,6 +99,7 @@ class SerialTransport(pyuavcan.transport.Transport):
                  mtu:                         int = DEFAULT_MTU,
                  service_transfer_multiplier: int = DEFAULT_SERVICE_TRANSFER_MULTIPLIER,
                  baudrate:                    typing.Optional[int] = None,
+                 non_blocking_io:             bool = False,
                  loop:                        typing.Optional[asyncio.AbstractEventLoop] = None):
         """
         :param serial_port: The serial port instance to communicate over, or its name.
@@ -88,6 +132,15 @@ class SerialTransport(pyuavcan.transport.Transport):
         :param baudrate: If not None, the specified baud rate will be configured on the serial port.
             Otherwise, the baudrate will be left unchanged.
 
+        :param non_blocking_io: If True, the file descriptor of the port will be serviced directly by the event loop
+            (see :meth:`asyncio.AbstractEventLoop.add_reader`) instead of a background reader thread,
+            and writes will be performed without a thread pool.
+            This eliminates the thread hand-offs per read chunk and per write, which lowers the latency and the CPU
+            load, but the parsing of the received data is performed in the event loop thread.
+            This mode is available on POSIX systems only with the ports that provide a non-blocking
+            file descriptor, which are the regular serial ports and the ``socket://`` URLs;
+            otherwise, :class:`pyuavcan.transport.InvalidMediaConfigurationError` is raised.
+
         :param loop: The event loop to use. Defaults to :func:`asyncio.get_event_loop`.
         """
         self._service_transfer_multiplier = int(service_transfer_multiplier)
@@ -112,11 +165,11 @@ class SerialTransport(pyuavcan.transport.Transport):
         self._closed = False
 
         # For serial port write serialization. Read operations are performed concurrently (no sync) in separate thread.
-        self._port_lock = asyncio.Lock(loop=loop)
+        self._tx_scheduler = TransmitScheduler(self._loop)
 
         # The serialization buffer is pre-allocated for performance reasons;
         # it is needed to store frame contents before they are emitted into the serial port.
-        # Access must be protected with the port lock!
+        # Access must be protected with the transmit scheduler!
         self._serialization_buffer = bytearray(0 for _ in range(self._mtu * 3))
 
         self._input_registry: typing.Dict[pyuavcan.transport.InputSessionSpecifier, SerialInputSession] = {}
@@ -124,6 +177,8 @@ class SerialTransport(pyuavcan.transport.Transport):
 
         self._statistics = SerialTransportStatistics()
 
+        self._out_of_band_stream = OutOfBandStream(self._loop)
+
         if not isinstance(serial_port, serial.SerialBase):
             serial_port = serial.serial_for_url(serial_port)
         assert isinstance(serial_port, serial.SerialBase)
@@ -134,10 +189,20 @@ class SerialTransport(pyuavcan.transport.Transport):
         if baudrate is not None:
             self._serial_port.baudrate = int(baudrate)
 
-        self._background_executor = concurrent.futures.ThreadPoolExecutor()
-
-        self._reader_thread = threading.Thread(target=self._reader_thread_func, daemon=True)
-        self._reader_thread.start()
+        # In the non-blocking mode, the file descriptor is serviced by the event loop; otherwise, by the threads.
+        self._fd: typing.Optional[int] = None
+        self._background_executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        if non_blocking_io:
+            self._fd = self._get_non_blocking_file_descriptor(self._serial_port)
+            self._fd_is_tty = os.isatty(self._fd)
+            self._in_bytes_count = 0
+            self._received_items: typing.List[typing.Union[SerialFrame, memoryview]] = []
+            self._parser = StreamParser(self._received_items.append, max(self.VALID_MTU_RANGE))
+            self._loop.add_reader(self._fd, self._on_file_descriptor_readable)
+        else:
+            self._background_executor = concurrent.futures.ThreadPoolExecutor()
+            self._reader_thread = threading.Thread(target=self._reader_thread_func, daemon=True)
+            self._reader_thread.start()
 
     @property
     def loop(self) -> asyncio.AbstractEventLoop:
@@ -163,6 +228,9 @@ class SerialTransport(pyuavcan.transport.Transport):
             except Exception as ex:  # pragma: no cover
                 _logger.exception('%s: Failed to close session %r: %s', self, s, ex)
 
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)   # Must be done before the port is closed and the fd is reused.
+
         if self._serial_port.is_open:  # Double-close is not an error.
             self._serial_port.close()
 
@@ -241,6 +309,15 @@ class SerialTransport(pyuavcan.transport.Transport):
         assert isinstance(self._serial_port, serial.SerialBase)
         return self._serial_port
 
+    @property
+    def out_of_band_stream(self) -> OutOfBandStream:
+        """
+        The out-of-band data received from the serial port (e.g., the output of a debug console sharing the port)
+        can be read from this stream. The stream is disabled by default; enable it by assigning a non-zero capacity.
+        While the stream is disabled, the out-of-band data is logged instead.
+        """
+        return self._out_of_band_stream
+
     def sample_statistics(self) -> SerialTransportStatistics:
         return copy.copy(self._statistics)
 
@@ -257,9 +334,12 @@ class SerialTransport(pyuavcan.transport.Transport):
                     # noinspection PyProtectedMember
                     session._process_frame(frame)
 
-    def _handle_received_out_of_band_data(self, data: memoryview) -> None:
+    def _handle_received_out_of_band_data(self, data: bytes) -> None:
         self._statistics.in_out_of_band_bytes += len(data)
-        printable: typing.Union[str, bytes] = bytes(data)
+        if self._out_of_band_stream.capacity > 0:
+            self._statistics.in_out_of_band_bytes_dropped += self._out_of_band_stream.push(data)
+            return
+        printable: typing.Union[str, bytes] = data
         try:
             assert isinstance(printable, bytes)
             printable = printable.decode('utf8')
@@ -267,15 +347,23 @@ class SerialTransport(pyuavcan.transport.Transport):
             pass
         _logger.warning('%s: Out-of-band: %s', self._serial_port.name, printable)
 
-    def _handle_received_item_and_update_stats(self,
-                                               item:           typing.Union[SerialFrame, memoryview],
-                                               in_bytes_count: int) -> None:
-        if isinstance(item, SerialFrame):
-            self._handle_received_frame(item)
-        elif isinstance(item, memoryview):
-            self._handle_received_out_of_band_data(item)
-        else:
-            assert False
+    def _handle_received_items_and_update_stats(self,
+                                                items:          typing.Sequence[typing.Union[SerialFrame, memoryview]],
+                                                in_bytes_count: int) -> None:
+        """
+        The items are delivered in batches, one per chunk read from the port, to avoid the per-item overhead.
+        The out-of-band fragments of the batch are concatenated and processed at once.
+        """
+        out_of_band: typing.List[memoryview] = []
+        for item in items:
+            if isinstance(item, SerialFrame):
+                self._handle_received_frame(item)
+            elif isinstance(item, memoryview):
+                out_of_band.append(item)
+            else:
+                assert False
+        if out_of_band:
+            self._handle_received_out_of_band_data(b''.join(out_of_band))
 
         assert self._statistics.in_bytes <= in_bytes_count
         self._statistics.in_bytes = int(in_bytes_count)
@@ -291,32 +379,58 @@ class SerialTransport(pyuavcan.transport.Transport):
         """
         tx_ts: typing.Optional[pyuavcan.transport.Timestamp] = None
         self._ensure_not_closed()
+        frames = list(frames)
+        max_batch_size = self._serial_port.baudrate / _BITS_PER_BYTE * _MAX_WRITE_BATCH_DURATION
+        holding_port = False
         try:  # Jeez this is getting complex
-            for fr in frames:
-                async with self._port_lock:       # TODO: the lock acquisition should be prioritized by frame priority!
-                    compiled = fr.compile_into(self._serialization_buffer)
-                    timeout = monotonic_deadline - self._loop.time()
-                    if timeout > 0:
-                        self._serial_port.write_timeout = timeout
-                        try:
-                            num_written = await self._loop.run_in_executor(self._background_executor,
-                                                                           self._serial_port.write,
-                                                                           compiled)
-                            tx_ts = tx_ts or pyuavcan.transport.Timestamp.now()
-                        except serial.SerialTimeoutException:
-                            num_written = 0
-                            _logger.info('%s: Port write timed out in %.3fs on frame %r', self, timeout, fr)
-                        self._statistics.out_bytes += num_written or 0
-                    else:
-                        tx_ts = None  # Timed out
+            index = 0
+            while index < len(frames):
+                fr = frames[index]
+                # The port is held across the frames of the transfer unless a more urgent frame is waiting.
+                if holding_port and self._tx_scheduler.has_waiters_above(fr.priority):
+                    self._tx_scheduler.release()
+                    holding_port = False
+                if not holding_port:
+                    queued_at = self._loop.time()
+                    if not await self._tx_scheduler.acquire(fr.priority, monotonic_deadline):
+                        tx_ts = None  # Timed out while waiting for the port
                         break
+                    holding_port = True
+                    self._register_queueing_delay(fr.priority, self._loop.time() - queued_at)
+
+                # Coalesce the following frames into the same write while the batch is small enough.
+                # At least one frame is always written. The batch is not extended if a more urgent frame is waiting.
+                batch = bytearray(fr.compile_into(self._serialization_buffer))
+                batch_frames = frames[index:index + 1]
+                while index + len(batch_frames) < len(frames) and len(batch) < max_batch_size \
+                        and not self._tx_scheduler.has_waiters_above(fr.priority):
+                    nf = frames[index + len(batch_frames)]
+                    batch += nf.compile_into(self._serialization_buffer)
+                    batch_frames.append(nf)
+
+                timeout = monotonic_deadline - self._loop.time()
+                if timeout > 0:
+                    num_written = await self._write(batch, monotonic_deadline)
+                    if num_written < len(batch):
+                        _logger.info('%s: Port write timed out in %.3fs on frames %r', self, timeout, batch_frames)
+                    else:
+                        tx_ts = tx_ts or pyuavcan.transport.Timestamp.now()
+                    self._statistics.out_writes += 1
+                    self._statistics.out_bytes += num_written
+                else:
+                    tx_ts = None  # Timed out
+                    break
 
-                num_written = len(compiled) if num_written is None else num_written
-                if num_written < len(compiled):
+                if num_written < len(batch):
                     tx_ts = None  # Write failed
                     break
 
-                self._statistics.out_frames += 1
+                index += len(batch_frames)
+                self._statistics.out_frames += len(batch_frames)
+                try:
+                    self._statistics.out_frames_per_priority[fr.priority] += len(batch_frames)
+                except LookupError:
+                    self._statistics.out_frames_per_priority[fr.priority] = len(batch_frames)
         except Exception as ex:
             if self._closed:
                 raise pyuavcan.transport.ResourceClosedError(f'{self} is closed, transmission aborted.') from ex
@@ -328,12 +442,102 @@ class SerialTransport(pyuavcan.transport.Transport):
             else:
                 self._statistics.out_incomplete += 1
             return tx_ts
+        finally:
+            if holding_port:
+                self._tx_scheduler.release()
+
+    async def _write(self, data: bytearray, monotonic_deadline: float) -> int:
+        """
+        :returns: The number of bytes written, which is less than the size of the data if the deadline is reached.
+        """
+        if self._fd is None:
+            assert self._background_executor is not None
+            self._serial_port.write_timeout = max(0.0, monotonic_deadline - self._loop.time())
+            try:
+                out = await self._loop.run_in_executor(self._background_executor, self._serial_port.write, data)
+            except serial.SerialTimeoutException:
+                return 0
+            return len(data) if out is None else int(out)
+
+        # Write as much as the OS accepts right away; wait for the descriptor to become writable if necessary.
+        view = memoryview(data)
+        num_written = 0
+        while True:
+            try:
+                num_written += int(os.write(self._fd, view[num_written:]))
+            except BlockingIOError:
+                pass
+            if num_written >= len(view):
+                return num_written
+            writable = self._loop.create_future()
+
+            def on_writable() -> None:
+                if not writable.done():
+                    writable.set_result(None)
+
+            self._loop.add_writer(self._fd, on_writable)
+            try:
+                await asyncio.wait([writable], timeout=max(0.0, monotonic_deadline - self._loop.time()))
+            finally:
+                self._loop.remove_writer(self._fd)
+            if not writable.done():
+                return num_written
+
+    def _on_file_descriptor_readable(self) -> None:
+        assert self._fd is not None
+        try:
+            chunk = os.read(self._fd, _NON_BLOCKING_READ_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as ex:
+            self._fail(ex)
+            return
+        if not chunk:
+            # For sockets, an empty read indicates that the connection is closed. A tty is configured by PySerial
+            # to return immediately (VMIN=0), so an empty read is possible if the input has been flushed
+            # after the readiness was reported; a hang-up is reported as an error instead.
+            if not self._fd_is_tty:
+                self._fail(ConnectionError('End of stream'))
+            return
+
+        timestamp = pyuavcan.transport.Timestamp.now()
+        self._in_bytes_count += len(chunk)
+        self._parser.process_next_chunk(chunk, timestamp)
+        self._handle_received_items_and_update_stats(self._received_items, self._in_bytes_count)
+        self._received_items.clear()
+
+    def _fail(self, ex: Exception) -> None:
+        _logger.error('%s: I/O has failed, the instance with port %s will be terminated: %r',
+                      self, self._serial_port, ex)
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+        self._closed = True
+        self._serial_port.close()
+
+    @staticmethod
+    def _get_non_blocking_file_descriptor(port: serial.SerialBase) -> int:
+        if os.name != 'posix':  # pragma: no cover
+            raise pyuavcan.transport.InvalidMediaConfigurationError('Non-blocking I/O is supported on POSIX only')
+        try:
+            fd = port.fileno()
+        except (AttributeError, OSError, ValueError) as ex:
+            raise pyuavcan.transport.InvalidMediaConfigurationError(
+                f'Non-blocking I/O is not supported by {port!r}: {ex}') from ex
+        if not isinstance(fd, int) or os.get_blocking(fd):
+            raise pyuavcan.transport.InvalidMediaConfigurationError(
+                f'Non-blocking I/O is not supported by {port!r}: the file descriptor {fd!r} is blocking')
+        return fd
+
+    def _register_queueing_delay(self, priority: pyuavcan.transport.Priority, delay: float) -> None:
+        d = self._statistics.out_max_queueing_delay_per_priority
+        d[priority] = max(d.get(priority, 0.0), delay)
 
     def _reader_thread_func(self) -> None:
         in_bytes_count = 0
+        items: typing.List[typing.Union[SerialFrame, memoryview]] = []
 
         def callback(item: typing.Union[SerialFrame, memoryview]) -> None:
-            self._loop.call_soon_threadsafe(self._handle_received_item_and_update_stats, item, in_bytes_count)
+            items.append(item)  # The list is replaced after every hand-off, so it cannot be bound to the parser.
 
         try:
             parser = StreamParser(callback, max(self.VALID_MTU_RANGE))
@@ -344,6 +548,10 @@ class SerialTransport(pyuavcan.transport.Transport):
                 timestamp = pyuavcan.transport.Timestamp.now()
                 in_bytes_count += len(chunk)
                 parser.process_next_chunk(chunk, timestamp)
+                if items:   # One hand-off per chunk rather than per item.
+                    self._loop.call_soon_threadsafe(self._handle_received_items_and_update_stats,
+                                                    items, in_bytes_count)
+                    items = []
 
         except Exception as ex:  # pragma: no cover
             if self._closed or not self._serial_port.is_open:
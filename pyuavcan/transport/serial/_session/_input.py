@@ -11,7 +11,10 @@ import asyncio
 import logging
 import dataclasses
 import pyuavcan
-from pyuavcan.transport.commons.high_overhead_transport import TransferReassembler
+from pyuavcan.transport.commons.high_overhead_transport import TransferReassembler, TransferQueue
+from pyuavcan.transport.commons.high_overhead_transport import FrameDivertingInputSession, FrameHandler
+from pyuavcan.transport.commons.high_overhead_transport import QueuedInputSession, PromiscuousInputSessionStatistics
+from pyuavcan.transport.commons.high_overhead_transport import ReassemblerTable
 from .._frame import SerialFrame
 from ._base import SerialSession
 
@@ -20,20 +23,20 @@ _logger = logging.getLogger(__name__)
 
 
 @dataclasses.dataclass
-class SerialInputSessionStatistics(pyuavcan.transport.SessionStatistics):
-    #: Keys are data type hash values collected from received frames that did not match the local type configuration.
-    #: Values are the number of times each hash value has been encountered.
-    mismatched_data_type_hashes: typing.Dict[int, int] = dataclasses.field(default_factory=dict)
+class SerialInputSessionStatistics(PromiscuousInputSessionStatistics):
+    pass
 
-    #: Keys are source node-IDs; values are dicts where keys are error enum members and values are counts.
-    reassembly_errors_per_source_node_id: typing.Dict[int, typing.Dict[TransferReassembler.Error, int]] = \
-        dataclasses.field(default_factory=dict)
 
-
-class SerialInputSession(SerialSession, pyuavcan.transport.InputSession):
+class SerialInputSession(SerialSession,
+                         pyuavcan.transport.InputSession,
+                         FrameDivertingInputSession,
+                         QueuedInputSession):
     #: Units are seconds. Can be overridden after instantiation if needed.
     DEFAULT_TRANSFER_ID_TIMEOUT = 2.0
 
+    #: Units are seconds. Can be overridden after instantiation if needed.
+    DEFAULT_REASSEMBLER_IDLE_TIMEOUT = ReassemblerTable.DEFAULT_IDLE_TIMEOUT
+
     def __init__(self,
                  specifier:        pyuavcan.transport.InputSessionSpecifier,
                  payload_metadata: pyuavcan.transport.PayloadMetadata,
@@ -52,10 +55,13 @@ class SerialInputSession(SerialSession, pyuavcan.transport.InputSession):
                 not isinstance(self._payload_metadata, pyuavcan.transport.PayloadMetadata):  # pragma: no cover
             raise TypeError('Invalid parameters')
 
-        self._statistics = SerialInputSessionStatistics()
+        self._statistics_impl = SerialInputSessionStatistics()
         self._transfer_id_timeout = self.DEFAULT_TRANSFER_ID_TIMEOUT
-        self._queue: asyncio.Queue[pyuavcan.transport.TransferFrom] = asyncio.Queue()
-        self._reassemblers: typing.Dict[int, TransferReassembler] = {}
+        self._queue = TransferQueue()
+        self._reassemblers = ReassemblerTable(max_payload_size_bytes=self._payload_metadata.max_size_bytes,
+                                              statistics=self._statistics_impl)
+        self._reassemblers.idle_timeout = self.DEFAULT_REASSEMBLER_IDLE_TIMEOUT
+        self._frame_handler: typing.Optional[FrameHandler] = None
 
         super(SerialInputSession, self).__init__(finalizer)
 
@@ -82,18 +88,23 @@ class SerialInputSession(SerialSession, pyuavcan.transport.InputSession):
             if transfer is None:
                 self._statistics.errors += 1
                 _logger.debug('%s: Invalid anonymous frame: %s', self, frame)
+        elif self._frame_handler is not None:
+            self._frame_handler(frame.source_node_id, frame)
+            return
         else:
-            transfer = self._get_reassembler(frame.source_node_id).process_frame(frame, self._transfer_id_timeout)
+            reasm = self._reassemblers.get(frame.source_node_id,
+                                           frame.timestamp.monotonic_ns,
+                                           self._transfer_id_timeout)
+            if reasm.is_duplicate(frame, self._transfer_id_timeout):
+                self._statistics.duplicate_frames += 1
+                return
+            transfer = reasm.process_frame(frame, self._transfer_id_timeout)
 
         if transfer is not None:
             self._statistics.transfers += 1
             self._statistics.payload_bytes += sum(map(len, transfer.fragmented_payload))
             _logger.debug('%s: Received transfer: %s; current stats: %s', self, transfer, self._statistics)
-            try:
-                self._queue.put_nowait(transfer)
-            except asyncio.QueueFull:  # pragma: no cover
-                # TODO: make the queue capacity configurable
-                self._statistics.drops += len(transfer.fragmented_payload)
+            self._enqueue_transfer(transfer)
 
     async def receive_until(self, monotonic_deadline: float) -> typing.Optional[pyuavcan.transport.TransferFrom]:
         try:
@@ -111,6 +122,19 @@ class SerialInputSession(SerialSession, pyuavcan.transport.InputSession):
             assert transfer.source_node_id == self._specifier.remote_node_id or self._specifier.remote_node_id is None
             return transfer
 
+    @property
+    def reassembler_idle_timeout(self) -> float:
+        """
+        The transfer reassembly state of a remote node that has not sent any frames for this long is discarded.
+        See :class:`pyuavcan.transport.commons.high_overhead_transport.ReassemblerTable` for details.
+        Units are seconds; the value shall be positive, otherwise you get a :class:`ValueError`.
+        """
+        return self._reassemblers.idle_timeout
+
+    @reassembler_idle_timeout.setter
+    def reassembler_idle_timeout(self, value: float) -> None:
+        self._reassemblers.idle_timeout = value
+
     @property
     def transfer_id_timeout(self) -> float:
         return self._transfer_id_timeout
@@ -133,25 +157,12 @@ class SerialInputSession(SerialSession, pyuavcan.transport.InputSession):
     def sample_statistics(self) -> SerialInputSessionStatistics:
         return copy.copy(self._statistics)
 
-    def _get_reassembler(self, source_node_id: int) -> TransferReassembler:
-        try:
-            return self._reassemblers[source_node_id]
-        except LookupError:
-            def on_reassembly_error(error: TransferReassembler.Error) -> None:
-                self._statistics.errors += 1
-                d = self._statistics.reassembly_errors_per_source_node_id[source_node_id]
-                try:
-                    d[error] += 1
-                except LookupError:
-                    d[error] = 1
+    def _set_frame_handler(self, handler: typing.Optional[FrameHandler]) -> None:
+        self._frame_handler = handler
 
-            self._statistics.reassembly_errors_per_source_node_id.setdefault(source_node_id, {})
-            reasm = TransferReassembler(source_node_id=source_node_id,
-                                        max_payload_size_bytes=self._payload_metadata.max_size_bytes,
-                                        on_error_callback=on_reassembly_error)
-            self._reassemblers[source_node_id] = reasm
-            _logger.debug('%s: New %s (%d total)', self, reasm, len(self._reassemblers))
-            return reasm
+    @property
+    def _statistics(self) -> SerialInputSessionStatistics:
+        return self._statistics_impl
 
 
 # noinspection PyProtectedMember
@@ -294,6 +305,7 @@ def _unittest_input_session() -> None:
         payload_bytes=len(nihil_supernum) * 2,
         errors=3,
         mismatched_data_type_hashes={0xbad_bad_bad_bad_bad: 1},
+        live_reassemblers=2,
         reassembly_errors_per_source_node_id={
             1111: {},
             2222: {},
@@ -324,6 +336,7 @@ def _unittest_input_session() -> None:
         payload_bytes=len(nihil_supernum) * 5,
         errors=3,
         mismatched_data_type_hashes={0xbad_bad_bad_bad_bad: 1},
+        live_reassemblers=2,
         reassembly_errors_per_source_node_id={
             1111: {},
             2222: {},
@@ -364,6 +377,7 @@ def _unittest_input_session() -> None:
         payload_bytes=len(nihil_supernum) * 5,
         errors=5,
         mismatched_data_type_hashes={0xbad_bad_bad_bad_bad: 1},
+        live_reassemblers=2,
         reassembly_errors_per_source_node_id={
             1111: {
                 TransferReassembler.Error.MULTIFRAME_EMPTY_FRAME: 2,
@@ -376,3 +390,124 @@ def _unittest_input_session() -> None:
     sis.close()
     assert finalized
     sis.close()     # Idempotency check
+
+
+def _unittest_input_session_queue_capacity() -> None:
+    from pytest import raises
+    from pyuavcan.transport import InputSessionSpecifier, MessageDataSpecifier, Priority, PayloadMetadata, Timestamp
+
+    run_until_complete = asyncio.get_event_loop().run_until_complete
+
+    session_spec = InputSessionSpecifier(MessageDataSpecifier(12345), None)
+    payload_meta = PayloadMetadata(0xdead_beef_bad_c0ffe, 100)
+    sis = SerialInputSession(specifier=session_spec,
+                             payload_metadata=payload_meta,
+                             loop=asyncio.get_event_loop(),
+                             finalizer=lambda: None)
+    assert sis.transfer_queue_capacity is None
+    assert sis.transfer_queue_overflow_policy == TransferQueue.OverflowPolicy.DROP_NEWEST
+    with raises(ValueError):
+        sis.transfer_queue_capacity = -1
+
+    def push(transfer_id: int) -> None:
+        sis._process_frame(SerialFrame(timestamp=Timestamp.now(),
+                                       priority=Priority.NOMINAL,
+                                       transfer_id=transfer_id,
+                                       index=0,
+                                       end_of_transfer=True,
+                                       payload=memoryview(b'abc'),
+                                       source_node_id=None,
+                                       destination_node_id=None,
+                                       data_specifier=session_spec.data_specifier,
+                                       data_type_hash=payload_meta.data_type_hash))
+
+    def receive() -> typing.List[int]:
+        out: typing.List[int] = []
+        while True:
+            tr = run_until_complete(sis.receive_until(0))
+            if tr is None:
+                return out
+            out.append(tr.transfer_id)
+
+    for i in range(5):
+        push(i)
+    sis.transfer_queue_capacity = 3     # The newest are dropped.
+    assert sis.sample_statistics() == SerialInputSessionStatistics(transfers=5, frames=5, payload_bytes=15, drops=2,
+                                                                   dropped_transfers=2)
+    push(5)
+    assert sis.sample_statistics().dropped_transfers == 3
+    assert receive() == [0, 1, 2]
+
+    sis.transfer_queue_overflow_policy = TransferQueue.OverflowPolicy.DROP_OLDEST
+    for i in range(5):
+        push(i)
+    assert sis.sample_statistics().dropped_transfers == 5
+    assert receive() == [2, 3, 4]
+
+    sis.transfer_queue_capacity = None
+    for i in range(5):
+        push(i)
+    assert receive() == [0, 1, 2, 3, 4]
+    assert sis.sample_statistics().dropped_transfers == 5
+    sis.close()
+
+
+def _unittest_input_session_reassembler_eviction() -> None:
+    from pytest import raises, approx
+    from pyuavcan.transport import InputSessionSpecifier, MessageDataSpecifier, Priority, PayloadMetadata, Timestamp
+
+    session_spec = InputSessionSpecifier(MessageDataSpecifier(12345), None)
+    payload_meta = PayloadMetadata(0xdead_beef_bad_c0ffe, 100)
+    sis = SerialInputSession(specifier=session_spec,
+                             payload_metadata=payload_meta,
+                             loop=asyncio.get_event_loop(),
+                             finalizer=lambda: None)
+    assert sis.reassembler_idle_timeout == approx(SerialInputSession.DEFAULT_REASSEMBLER_IDLE_TIMEOUT)
+    with raises(ValueError):
+        sis.reassembler_idle_timeout = 0
+    sis.reassembler_idle_timeout = 10.0
+    sis.transfer_id_timeout = 1.0
+
+    def push(monotonic: float, source_node_id: int, end_of_transfer: bool = True) -> None:
+        sis._process_frame(SerialFrame(timestamp=Timestamp.from_seconds(0, monotonic),
+                                       priority=Priority.NOMINAL,
+                                       transfer_id=0,
+                                       index=0,
+                                       end_of_transfer=end_of_transfer,
+                                       payload=memoryview(b'' if not end_of_transfer else b'abc'),
+                                       source_node_id=source_node_id,
+                                       destination_node_id=None,
+                                       data_specifier=session_spec.data_specifier,
+                                       data_type_hash=payload_meta.data_type_hash))
+
+    push(100.0, 1)
+    push(101.0, 2, end_of_transfer=False)    # Reassembly error: empty frame in a multi-frame transfer.
+    push(105.0, 3)
+    push(109.0, 1)      # Node 1 is refreshed and becomes the most recently active one.
+    st = sis.sample_statistics()
+    assert st.live_reassemblers == 3
+    assert st.evicted_reassemblers == 0
+    assert st.reassembly_errors_per_source_node_id.keys() == {1, 2, 3}
+
+    push(111.5, 4)      # Node 2 has been idle for longer than 10 seconds.
+    st = sis.sample_statistics()
+    assert st.live_reassemblers == 3
+    assert st.evicted_reassemblers == 1
+    assert st.reassembly_errors_per_source_node_id.keys() == {1, 2, 3, 4}  # The entry with errors is kept.
+
+    push(118.5, 4)      # Node 3 is evicted; node 1 is still within the horizon.
+    st = sis.sample_statistics()
+    assert st.live_reassemblers == 2
+    assert st.evicted_reassemblers == 2
+    assert st.reassembly_errors_per_source_node_id.keys() == {1, 2, 4}
+
+    # The horizon is never shorter than the transfer-ID timeout.
+    sis.transfer_id_timeout = 100.0
+    push(200.0, 5)
+    assert sis.sample_statistics().live_reassemblers == 3
+    sis.transfer_id_timeout = 1.0
+    push(200.0, 5)
+    assert sis.sample_statistics().live_reassemblers == 1
+    assert sis.sample_statistics().evicted_reassemblers == 4
+    assert sis.sample_statistics().transfers == 6    # The state of the evicted nodes was no longer needed.
+    sis.close()
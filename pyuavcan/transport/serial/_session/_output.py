@@ -9,7 +9,7 @@ import copy
 import typing
 import logging
 import pyuavcan
-from .._frame import SerialFrame
+from .._frame import SerialFrame, HeaderTemplate
 from ._base import SerialSession
 
 
@@ -66,6 +66,12 @@ class SerialOutputSession(SerialSession, pyuavcan.transport.OutputSession):
             if isinstance(specifier.data_specifier, pyuavcan.transport.ServiceDataSpecifier) else True, \
             'Internal protocol violation: cannot broadcast a service transfer'
 
+        # The header fields that are constant within the session are compiled only once per priority level.
+        self._header_template = HeaderTemplate(source_node_id=self._local_node_id,
+                                               destination_node_id=self._specifier.remote_node_id,
+                                               data_specifier=self._specifier.data_specifier,
+                                               data_type_hash=self._payload_metadata.data_type_hash)
+
         super(SerialOutputSession, self).__init__(finalizer)
 
     async def send_until(self, transfer: pyuavcan.transport.Transfer, monotonic_deadline: float) -> bool:
@@ -90,7 +96,8 @@ class SerialOutputSession(SerialSession, pyuavcan.transport.OutputSession):
                                source_node_id=self._local_node_id,
                                destination_node_id=self._specifier.remote_node_id,
                                data_specifier=self._specifier.data_specifier,
-                               data_type_hash=self._payload_metadata.data_type_hash)
+                               data_type_hash=self._payload_metadata.data_type_hash,
+                               header_template=self._header_template)
 
         frames = list(pyuavcan.transport.commons.high_overhead_transport.serialize_transfer(
             transfer.fragmented_payload,
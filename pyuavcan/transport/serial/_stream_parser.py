@@ -9,6 +9,10 @@ import pyuavcan
 from ._frame import SerialFrame
 
 
+_DELIMITER = bytes([SerialFrame.FRAME_DELIMITER_BYTE])
+_ESCAPE = bytes([SerialFrame.ESCAPE_PREFIX_BYTE])
+
+
 class StreamParser:
     """
     A stream parser is fed with bytes received from the channel.
@@ -22,6 +26,11 @@ class StreamParser:
     guarantee that OOB data (not belonging to the protocol set) is retained in its original form.
     An empty sequence of OOB bytes is never reported.
     The OOB data reporting can be useful if the same serial port is used both for UAVCAN and as a text console.
+
+    The chunk is processed as a whole rather than byte-by-byte: it is split on the frame delimiters,
+    and each segment is unescaped by splitting it on the escape prefix bytes.
+    This keeps the per-byte work inside the native ``bytes`` methods, which is necessary to keep up with
+    high-speed links (several megabaud) without saturating the CPU.
     """
     def __init__(self,
                  callback: typing.Callable[[typing.Union[SerialFrame, memoryview]], None],
@@ -50,31 +59,40 @@ class StreamParser:
     def process_next_chunk(self,
                            chunk:     typing.Union[bytes, bytearray, memoryview],
                            timestamp: pyuavcan.transport.Timestamp) -> None:
-        for b in chunk:
-            self._process_byte(b, timestamp)
-
-        if (not self._is_inside_frame()) or (len(self._frame_buffer) > self._max_frame_size_bytes):
-            self._finalize(known_invalid=True)
-
-    def _process_byte(self, b: int, timestamp: pyuavcan.transport.Timestamp) -> None:
-        # Reception of a frame delimiter terminates the current frame unconditionally.
-        if b == SerialFrame.FRAME_DELIMITER_BYTE:
+        segments = bytes(chunk).split(_DELIMITER)
+        self._process_segment(segments[0])
+        for seg in segments[1:]:
+            # Reception of a frame delimiter terminates the current frame unconditionally.
             self._finalize(known_invalid=not self._is_inside_frame())
             self._current_frame_timestamp = timestamp
-            return
+            self._process_segment(seg)
 
-        # Unescaping is done only if we're inside a frame currently.
-        if self._is_inside_frame():
-            if b == SerialFrame.ESCAPE_PREFIX_BYTE:
-                self._unescape_next = True
-                return
-            if self._unescape_next:
-                self._unescape_next = False
-                b ^= 0xFF
+        if (not self._is_inside_frame()) or (len(self._frame_buffer) > self._max_frame_size_bytes):
+            self._finalize(known_invalid=True)
 
+    def _process_segment(self, segment: bytes) -> None:
+        """The segment shall not contain frame delimiters."""
         # Appending to the buffer always, regardless of whether we're in a frame or not.
         # We may find out that the data does not belong to the protocol only much later; can't look ahead.
-        self._frame_buffer.append(b)
+        # Unescaping is done only if we're inside a frame currently.
+        if not self._is_inside_frame():
+            self._frame_buffer += segment
+            return
+
+        # Every part except the first one is preceded by an escape prefix, so its first byte is to be unescaped.
+        # Empty parts arise from repeated prefixes (the last one takes effect) or from a prefix at the end of the
+        # segment, in which case the next segment (possibly from the next chunk) begins with an escaped byte.
+        unescape_next = self._unescape_next
+        for index, part in enumerate(segment.split(_ESCAPE)):
+            unescape_next = unescape_next or index > 0
+            if part:
+                if unescape_next:
+                    self._frame_buffer.append(part[0] ^ 0xFF)
+                    self._frame_buffer += part[1:]
+                    unescape_next = False
+                else:
+                    self._frame_buffer += part
+        self._unescape_next = unescape_next
 
     def _is_inside_frame(self) -> bool:
         return self._current_frame_timestamp is not None
@@ -166,3 +184,24 @@ def _unittest_stream_parser() -> None:
     assert isinstance(result[0], memoryview)
     assert isinstance(result[1], SerialFrame)
     assert SerialFrame.__eq__(f2, result)
+
+    # Escape sequences split across chunks and repeated escape prefixes.
+    assert [] == proc(b'\x9E\x8E')
+    assert [] == proc(b'\x61\x8E\x8E')
+    assert [memoryview(b'\x9E\x8E')] == proc(b'\x71\x9E')
+
+    # Escape prefixes outside of frames are retained as-is; an escape prefix pending at a delimiter is discarded.
+    sp = StreamParser(outputs.append, 10**6)
+    assert [memoryview(b'a\x8Eb')] == proc(b'a\x8Eb')
+    assert [memoryview(b'\x8E\x61')] == proc(b'\x8E\x61\x9E\x8E')
+    assert [memoryview(b'c')] == proc(b'\x9Ec\x9E')
+
+    # Byte-by-byte feeding yields the same result as feeding the whole image at once.
+    image = bytes(f1.compile_into(bytearray(100))) * 3 + b'garbage' + bytes(f2.compile_into(bytearray(1000)))
+    by_byte: typing.List[typing.Union[SerialFrame, memoryview]] = []
+    for b in image:
+        by_byte += proc(bytes([b]))
+    at_once = proc(image)
+    assert [type(x) for x in at_once] == [SerialFrame, SerialFrame, SerialFrame, memoryview, SerialFrame]
+    assert at_once[3] == memoryview(b'garbage')
+    assert by_byte == at_once
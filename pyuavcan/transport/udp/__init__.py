@@ -71,6 +71,11 @@ All new versions of MS Windows starting with Vista and Server 2008 are compatibl
 Many versions of GNU/Linux, however, are not, but it can be fixed by manual reconfiguration:
 https://stackoverflow.com/questions/28573390/how-to-view-and-edit-the-ephemeral-port-range-on-linux.
 
+By default, IPv4 broadcast transfers are sent to the subnet broadcast address.
+Optionally, they can be sent to per-subject multicast groups instead,
+so that the hosts and the network equipment can discard traffic for the subjects nobody is subscribed to;
+the mapping function is implemented in :func:`ipv4_multicast_group_from_data_specifier`.
+
 
 IP address mapping
 ~~~~~~~~~~~~~~~~~~
@@ -110,6 +115,9 @@ Both IPv4 and IPv6 are supported with minimal differences, although IPv6 is not
 a vehicular network because virtually none of its advantages are relevant there,
 and the increased overhead is detrimental to the network's latency and throughput.
 If IPv6 is used, the flow-ID of UAVCAN packets is set to zero.
+IPv6 has no broadcast, so broadcast transfers are emitted into multicast groups instead, one per UDP port;
+the group address is a unicast-prefix-based multicast address (RFC 3306) where the group-ID is the port number.
+Thus, the network stack discards traffic for subjects that the local node is not subscribed to.
 
 
 Datagram header format
@@ -284,5 +292,7 @@ from ._session import UDPFeedback as UDPFeedback
 from ._frame import UDPFrame as UDPFrame
 
 from ._port_mapping import udp_port_from_data_specifier as udp_port_from_data_specifier
+from ._port_mapping import ipv4_multicast_group_from_data_specifier as ipv4_multicast_group_from_data_specifier
+from ._port_mapping import ipv4_multicast_group_from_udp_port as ipv4_multicast_group_from_udp_port
 
 from ._demultiplexer import UDPDemultiplexerStatistics as UDPDemultiplexerStatistics
@@ -0,0 +1,211 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+from __future__ import annotations
+import typing
+import socket
+import logging
+import collections
+
+
+_logger = logging.getLogger(__name__)
+
+
+class ReceiveBufferPool:
+    """
+    A slab allocator for incoming datagrams.
+
+    The rest of the stack is zero-copy: the memory the datagram is read into at the very bottom of the protocol stack
+    is likely to be carried all the way up to the application layer without being copied.
+    Hence, the memory cannot be reused for the next datagram until every view into it is released by its consumers.
+    The naive solution is to allocate a new MTU-sized buffer per datagram, which is costly because the MTU is
+    typically much larger than the average datagram (e.g., 9 KiB buffers for datagrams under 1 KiB).
+
+    Instead, datagrams are read directly into a large slab one after another without gaps,
+    each one being returned as a memoryview slice of the slab which is never written again while it is referenced.
+    When the remaining space in the slab is insufficient to accommodate a maximum-size datagram,
+    the slab is retired and a new one is taken. A retired slab is recycled once all views into it are released,
+    which is detected using the export counter of the underlying bytearray (a bytearray cannot be resized while
+    there are buffer exports, so this is a reliable reference counter maintained by the interpreter).
+    If the consumers hold on to the data for too long, the retired slab is forgotten about and the memory
+    is reclaimed by the interpreter once the last view is released.
+
+    A slab is kept alive as long as any datagram in it is referenced, so a single small datagram held by the
+    application pins the entire slab; the data cannot be copied out on retirement because the views into the slab
+    are already owned by the consumers. Therefore, the slab should be only a few times larger than the max datagram
+    size. Let H be the number of datagrams held by the consumers and R be ``max_retired_slabs``;
+    every slab is either the current one, or pinned by at least one held datagram,
+    or tracked as retired and unreferenced. Hence, the worst-case memory footprint is::
+
+        (1 + H + R) * slab_size
+
+    Compared to allocating a dedicated max-size buffer per datagram, the held datagrams cost at most
+    ``slab_size / max_datagram_size`` times more memory; the untracked slabs are covered by H.
+
+    The instance is not thread-safe; it is supposed to be used from the socket reader thread only.
+    """
+
+    def __init__(self, max_datagram_size: int, slab_size: int, max_retired_slabs: int = 16):
+        """
+        :param max_datagram_size: The size of the receive window; a datagram of this size or larger may be truncated.
+        :param slab_size: The size of each slab, in bytes. Shall not be less than the max datagram size.
+            A few max datagram sizes is a reasonable choice; see the memory footprint considerations above.
+        :param max_retired_slabs: Retired slabs that are still referenced beyond this limit are no longer tracked.
+        """
+        self._max_datagram_size = int(max_datagram_size)
+        self._slab_size = int(slab_size)
+        self._max_retired_slabs = int(max_retired_slabs)
+        if not (0 < self._max_datagram_size <= self._slab_size) or self._max_retired_slabs < 0:
+            raise ValueError(f'Invalid buffer pool configuration: '
+                             f'max_datagram_size={max_datagram_size}, slab_size={slab_size}, '
+                             f'max_retired_slabs={max_retired_slabs}')
+
+        self._retired: typing.Deque[bytearray] = collections.deque()
+        self._slab = bytearray(self._slab_size)
+        self._offset = 0
+
+        self._stat_allocated_slabs = 1
+        self._stat_recycled_slabs = 0
+
+    @property
+    def max_datagram_size(self) -> int:
+        return self._max_datagram_size
+
+    @property
+    def allocated_slabs(self) -> int:
+        """The number of slabs allocated since the instance was created, including the current one."""
+        return self._stat_allocated_slabs
+
+    @property
+    def recycled_slabs(self) -> int:
+        """The number of times a retired slab was reused instead of allocating a new one."""
+        return self._stat_recycled_slabs
+
+    def receive_from(self, sock: socket.socket, ancillary_buffer_size: int = 0) \
+            -> typing.Tuple[memoryview, typing.Any, typing.List[typing.Tuple[int, int, bytes]]]:
+        """
+        Reads one datagram from the socket into the pool using ``recvfrom_into()``,
+        or ``recvmsg_into()`` if ancillary data is requested (not available on all platforms).
+        Returns a view of the received data, the remote endpoint, and the ancillary data (empty if not requested).
+        Exceptions raised by the socket are propagated; the pool state remains consistent.
+        """
+        if self._slab_size - self._offset < self._max_datagram_size:
+            self._rotate()
+
+        window = memoryview(self._slab)
+        try:
+            target = window[self._offset:self._offset + self._max_datagram_size]
+            if ancillary_buffer_size > 0:
+                size, ancillary, _flags, endpoint = sock.recvmsg_into([target], ancillary_buffer_size)
+            else:
+                size, endpoint = sock.recvfrom_into(target)
+                ancillary = []
+            target.release()
+            out = window[self._offset:self._offset + size]
+        finally:
+            window.release()   # Slices remain valid; only they are counted as exports from now on.
+
+        self._offset += size
+        return out, endpoint, ancillary
+
+    def _rotate(self) -> None:
+        self._retired.append(self._slab)
+        # Look for a slab whose views have all been released by the consumers; the oldest ones are most likely.
+        for _ in range(len(self._retired)):
+            candidate = self._retired.popleft()
+            if not self._is_referenced(candidate):
+                self._slab = candidate
+                self._stat_recycled_slabs += 1
+                break
+            self._retired.append(candidate)
+        else:
+            self._slab = bytearray(self._slab_size)
+            self._stat_allocated_slabs += 1
+            while len(self._retired) > self._max_retired_slabs:
+                self._retired.popleft()     # The interpreter will release it once the consumers are done with it.
+        self._offset = 0
+        assert len(self._slab) == self._slab_size
+
+    @staticmethod
+    def _is_referenced(slab: bytearray) -> bool:
+        try:
+            slab.append(0)
+        except BufferError:
+            return True
+        else:
+            del slab[-1]
+            return False
+
+
+def _unittest_receive_buffer_pool() -> None:
+    from pytest import raises
+
+    with raises(ValueError):
+        ReceiveBufferPool(max_datagram_size=100, slab_size=99)
+
+    with raises(ValueError):
+        ReceiveBufferPool(max_datagram_size=0, slab_size=100)
+
+    sock_rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock_rx.bind(('127.0.0.1', 0))
+    sock_rx.settimeout(1.0)
+    sock_tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock_tx.connect(sock_rx.getsockname())
+
+    pool = ReceiveBufferPool(max_datagram_size=100, slab_size=250, max_retired_slabs=1)
+    assert pool.max_datagram_size == 100
+    assert pool.allocated_slabs == 1
+    assert pool.recycled_slabs == 0
+
+    def recv(data: bytes) -> memoryview:
+        sock_tx.send(data)
+        mv, endpoint, ancillary = pool.receive_from(sock_rx)
+        assert endpoint == sock_tx.getsockname()
+        assert ancillary == []
+        assert bytes(mv) == data
+        return mv
+
+    # Each slab accommodates two max-size datagrams; the third one does not fit so a new slab is allocated.
+    a = recv(b'a' * 100)
+    b = recv(b'b' * 100)
+    assert pool.allocated_slabs == 1
+    c = recv(b'c' * 100)
+    d = recv(b'd' * 100)
+    assert pool.allocated_slabs == 2
+    assert bytes(a) == b'a' * 100 and bytes(b) == b'b' * 100   # Not overwritten.
+
+    # Both slabs are still referenced, so another one is allocated; the first one is no longer tracked.
+    e = recv(b'e' * 100)
+    f = recv(b'f' * 100)
+    assert pool.allocated_slabs == 3
+    assert pool.recycled_slabs == 0
+
+    # Release the second slab; it will be recycled on the next rotation.
+    del c, d
+    g = recv(b'g' * 100)
+    h = recv(b'h' * 100)
+    assert pool.allocated_slabs == 3
+    assert pool.recycled_slabs == 1
+    assert bytes(e) == b'e' * 100 and bytes(f) == b'f' * 100 and bytes(g) == b'g' * 100 and bytes(h) == b'h' * 100
+    assert bytes(a) == b'a' * 100 and bytes(b) == b'b' * 100   # The untracked slab is still alive.
+
+    # Oversized datagrams are truncated by the OS; the pool never writes beyond the window.
+    sock_tx.send(b'x' * 150)
+    mv, _, _ = pool.receive_from(sock_rx)
+    assert bytes(mv) == b'x' * 100
+    assert pool.allocated_slabs == 4
+    assert bytes(e) == b'e' * 100 and bytes(h) == b'h' * 100
+
+    # Ancillary data reception, where supported.
+    if hasattr(sock_rx, 'recvmsg_into'):
+        sock_tx.send(b'y' * 10)
+        mv, endpoint, ancillary = pool.receive_from(sock_rx, 64)
+        assert bytes(mv) == b'y' * 10
+        assert endpoint == sock_tx.getsockname()
+        assert ancillary == []  # Nothing was requested from the socket.
+
+    sock_tx.close()
+    sock_rx.close()
@@ -5,6 +5,7 @@
 #
 
 from __future__ import annotations
+import sys
 import time
 import typing
 import asyncio
@@ -14,10 +15,19 @@ import dataclasses
 import socket
 import pyuavcan
 from ._frame import UDPFrame
+from ._buffer_pool import ReceiveBufferPool
 
 
 _READ_TIMEOUT = 1.0
 
+#: Datagrams are read into slabs that accommodate this many max-size datagrams to avoid per-datagram allocation.
+#: The slabs are kept small because a datagram held by the application pins the entire slab it was read into.
+#: See :class:`ReceiveBufferPool` for details and for the worst-case memory footprint.
+_RECEIVE_SLAB_SIZE_IN_MTU = 4
+
+#: GNU/Linux-specific; the constant is not exported by the socket module. See man 7 socket.
+_SO_RXQ_OVFL: typing.Optional[int] = getattr(socket, 'SO_RXQ_OVFL', 40 if sys.platform.startswith('linux') else None)
+
 _logger = logging.getLogger(__name__)
 
 
@@ -36,6 +46,13 @@ class UDPDemultiplexerStatistics:
     #: The counters are invariant to the validity of the frame contained in the datagram.
     dropped_datagrams: typing.Dict[typing.Union[str, int], int] = dataclasses.field(default_factory=dict)
 
+    #: The number of datagrams dropped by the operating system because the socket receive buffer was full;
+    #: i.e., the local node was unable to keep up with the incoming traffic.
+    #: This allows one to tell apart local overload from losses in the network.
+    #: The value is only available on GNU/Linux (``SO_RXQ_OVFL``) and it is always zero elsewhere.
+    #: It is updated upon reception of the next datagram following the drop.
+    kernel_dropped_datagrams: int = 0
+
 
 class UDPDemultiplexer:
     """
@@ -86,6 +103,19 @@ class UDPDemultiplexer:
 
         self._closed = False
         self._listeners: typing.Dict[typing.Optional[int], UDPDemultiplexer.Listener] = {}
+        self._buffer_pool = ReceiveBufferPool(max_datagram_size=self._udp_mtu,
+                                              slab_size=self._udp_mtu * _RECEIVE_SLAB_SIZE_IN_MTU)
+
+        # Ask the OS to report the number of datagrams dropped due to the receive buffer overflow.
+        # If not supported, the counter will remain at zero.
+        self._ancillary_buffer_size = 0
+        if _SO_RXQ_OVFL is not None and hasattr(socket, 'CMSG_SPACE'):
+            try:
+                self._sock.setsockopt(socket.SOL_SOCKET, _SO_RXQ_OVFL, 1)
+            except OSError as ex:  # pragma: no cover
+                _logger.info('%r: Kernel drop counter is not available: %s', self, ex)
+            else:
+                self._ancillary_buffer_size = socket.CMSG_SPACE(4)   # The counter is of type uint32.
 
         self._thread = threading.Thread(target=self._thread_entry_point,
                                         name='demultiplexer_socket_reader',
@@ -139,7 +169,10 @@ class UDPDemultiplexer:
         self._sock.close()
         # We don't wait for the thread to join because who cares?
 
-    def _dispatch_frame(self, source_ip: str, frame: typing.Optional[UDPFrame]) -> None:
+    def _dispatch_frame(self,
+                        source_ip:      str,
+                        frame:          typing.Optional[UDPFrame],
+                        kernel_drops:   typing.Optional[int]) -> None:
         if self._closed:
             # A check for closure is mandatory here because there is a period of uncertainty between the point
             # when this method is invoked from the reader thread and the point where the event loop gets around
@@ -147,6 +180,10 @@ class UDPDemultiplexer:
             # infrastructure (such as the IP address mapper) may become unusable.
             return  # pragma: no cover
 
+        if kernel_drops is not None:
+            # The OS reports the cumulative number of drops since the socket is created.
+            self._statistics.kernel_dropped_datagrams = kernel_drops
+
         # Process the datagram. This is where the actual demultiplexing takes place.
         # The node-ID mapper will return None for datagrams coming from outside of our UAVCAN subnet.
         handled = False
@@ -183,19 +220,25 @@ class UDPDemultiplexer:
     def _thread_entry_point(self) -> None:
         while not self._closed:
             try:
-                # Notice that we MUST create a new buffer for each received datagram to avoid race conditions.
-                # Buffer memory cannot be shared because the rest of the stack is completely zero-copy;
-                # meaning that the data we allocate here, at the very bottom of the protocol stack,
+                # Buffer memory cannot be simply reused because the rest of the stack is completely zero-copy;
+                # meaning that the data we receive here, at the very bottom of the protocol stack,
                 # is likely to be carried all the way up to the application layer without being copied.
-                data, endpoint = self._sock.recvfrom(self._udp_mtu)
+                # The pool takes care of that by recycling its memory only after all consumers have released it.
+                data, endpoint, ancillary = self._buffer_pool.receive_from(self._sock, self._ancillary_buffer_size)
                 source_ip = endpoint[0]
                 assert isinstance(source_ip, str)
 
                 # TODO: use socket timestamping when running on Linux (Windows does not support timestamping).
                 ts = pyuavcan.transport.Timestamp.now()
 
-                frame = UDPFrame.parse(memoryview(data), ts)
-                self._loop.call_soon_threadsafe(self._dispatch_frame, source_ip, frame)
+                # The ancillary data is only present if there have been drops.
+                kernel_drops: typing.Optional[int] = None
+                for level, kind, value in ancillary:
+                    if level == socket.SOL_SOCKET and kind == _SO_RXQ_OVFL and len(value) >= 4:
+                        kernel_drops = int.from_bytes(value[:4], sys.byteorder)
+
+                frame = UDPFrame.parse(data, ts)
+                self._loop.call_soon_threadsafe(self._dispatch_frame, source_ip, frame, kernel_drops)
 
                 if len(data) >= self._udp_mtu:  # pragma: no cover
                     _logger.warning('%r: A datagram from %r is %d bytes long which is not less than '
@@ -462,3 +505,58 @@ def _unittest_demultiplexer() -> None:
     run_until_complete(asyncio.sleep(_READ_TIMEOUT * 2))  # Wait for the reader thread to notice the problem.
     # noinspection PyProtectedMember
     assert demux._closed
+
+
+def _unittest_demultiplexer_kernel_drops() -> None:
+    from pyuavcan.transport import Priority, Timestamp
+
+    if _SO_RXQ_OVFL is None:  # pragma: no cover
+        return  # Not supported on this platform.
+
+    loop = asyncio.get_event_loop()
+    run_until_complete = loop.run_until_complete
+
+    sock_rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock_rx.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)   # Very small to provoke an overflow.
+    sock_rx.setsockopt(socket.SOL_SOCKET, _SO_RXQ_OVFL, 1)          # Drops are counted from this point on.
+    sock_rx.bind(('127.100.0.100', 0))
+    sock_tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock_tx.bind(('127.100.0.1', 0))
+    sock_tx.connect(sock_rx.getsockname())
+
+    # The reader is not running yet, so the receive buffer will overflow.
+    datagram = b''.join(UDPFrame(timestamp=Timestamp.now(),
+                                 priority=Priority.LOW,
+                                 transfer_id=0,
+                                 index=0,
+                                 end_of_transfer=True,
+                                 payload=memoryview(b'x' * 1000),
+                                 data_type_hash=0).compile_header_and_payload())
+    for _ in range(100):
+        sock_tx.send(datagram)
+
+    stats = UDPDemultiplexerStatistics()
+    demux = UDPDemultiplexer(sock=sock_rx,
+                             udp_mtu=10240,
+                             node_id_mapper={'127.100.0.1': 1}.get,
+                             local_node_id=None,
+                             statistics=stats,
+                             loop=loop)
+    received: typing.List[typing.Optional[UDPFrame]] = []
+    demux.add_listener(None, lambda _, f: received.append(f))
+    run_until_complete(asyncio.sleep(1.1))  # Let the handler run in the background.
+    num_queued = len(received)
+    assert 0 < num_queued < 100
+    # The datagrams that made it into the queue were enqueued before the overflow, so they carry no drop counter.
+    assert stats.kernel_dropped_datagrams == 0
+
+    # The counter is reported with the next datagram following the drops.
+    sock_tx.send(datagram)
+    run_until_complete(asyncio.sleep(1.1))
+    assert len(received) == num_queued + 1
+    assert stats.accepted_datagrams == {1: num_queued + 1}
+    assert stats.kernel_dropped_datagrams == 100 - num_queued
+
+    demux.remove_listener(None)
+    demux.close()
+    sock_tx.close()
@@ -12,6 +12,7 @@ import socket
 import logging
 import pyuavcan
 from ._network_map import NetworkMap
+from .._port_mapping import ipv4_multicast_group_from_udp_port
 
 
 _logger = logging.getLogger(__name__)
@@ -21,9 +22,19 @@ class NetworkMapIPv4(NetworkMap):
     """
     In IPv4 networks, the node-ID of zero cannot be used because it represents the subnet address;
     the maximum node-ID can only be used if it is not the same as the broadcast address for the subnet.
+
+    By default, broadcast transfers are sent to the subnet broadcast address, so that every host receives
+    every subject and the irrelevant ones are filtered out in user space.
+    If multicast is enabled, broadcast transfers are sent to per-subject multicast groups instead
+    (see :func:`pyuavcan.transport.udp.ipv4_multicast_group_from_udp_port`),
+    and an input socket joins the group of its port only,
+    letting the network stack, the NIC, and IGMP-snooping switches discard unwanted traffic.
+    The group membership is relinquished automatically by the operating system when the socket is closed.
+    All nodes on the network shall use the same mode.
     """
 
-    def __init__(self, ip_address: str):
+    def __init__(self, ip_address: str, multicast: bool = False):
+        self._multicast = bool(multicast)
         self._local = IPv4Address.parse(ip_address)
         if self._local.netmask == 0 or self._local.hostmask == 0:
             raise ValueError(f'The subnet mask in {ip_address} is invalid or missing. '
@@ -107,8 +118,13 @@ class NetworkMapIPv4(NetworkMap):
                 ) from None
             raise  # pragma: no cover
 
-        # Specify the fixed remote end. The port is always fixed; the host is unicast or broadcast.
-        if remote_node_id is None:
+        # Specify the fixed remote end. The port is always fixed; the host is unicast, multicast, or broadcast.
+        if remote_node_id is None and self._multicast:
+            s.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(str(bind_to)))
+            # Local nodes sharing the same host shall receive our traffic, too.
+            s.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+            s.connect((ipv4_multicast_group_from_udp_port(remote_port), remote_port))
+        elif remote_node_id is None:
             s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
             s.connect((str(self._local.broadcast_address), remote_port))
         elif 0 <= remote_node_id < self._max_nodes:
@@ -155,18 +171,50 @@ class NetworkMapIPv4(NetworkMap):
                     ) from None
                 raise  # pragma: no cover
 
-        # Man 7 IP says that SO_BROADCAST should be set in order to receive broadcast datagrams.
-        # The behavior I am observing does not match that, but we do it anyway because man says so.
-        # If the call fails, ignore because it may not be necessary depending on the OS in use.
-        try:
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        except Exception as ex:  # pragma: no cover
-            _logger.exception('%r: Could not set SO_BROADCAST on %r: %s', self, s, ex)
+        if expect_broadcast and self._multicast:
+            self._join_multicast_group(s, ipv4_multicast_group_from_udp_port(local_port))
+        else:
+            # Man 7 IP says that SO_BROADCAST should be set in order to receive broadcast datagrams.
+            # The behavior I am observing does not match that, but we do it anyway because man says so.
+            # If the call fails, ignore because it may not be necessary depending on the OS in use.
+            try:
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            except Exception as ex:  # pragma: no cover
+                _logger.exception('%r: Could not set SO_BROADCAST on %r: %s', self, s, ex)
 
         _logger.debug('%r: New input socket %r, local port %r, supports broadcast: %r',
                       self, s, local_port, expect_broadcast)
         return s
 
+    @property
+    def multicast(self) -> bool:
+        """
+        True if broadcast transfers are exchanged via per-subject multicast groups instead of the subnet broadcast.
+        """
+        return self._multicast
+
+    def _join_multicast_group(self, s: socket.socket, group: str) -> None:
+        # The group is joined on the interface of the local address. If the local node is anonymous,
+        # its address may be unavailable locally, in which case the OS is left to choose the interface.
+        for iface in (str(self._local.host_address), '0.0.0.0'):
+            try:
+                # struct ip_mreq {struct in_addr imr_multiaddr; struct in_addr imr_interface;}
+                s.setsockopt(socket.IPPROTO_IP,
+                             socket.IP_ADD_MEMBERSHIP,
+                             socket.inet_aton(group) + socket.inet_aton(iface))
+            except OSError as ex:
+                if ex.errno not in (errno.ENODEV, errno.EADDRNOTAVAIL):
+                    s.close()
+                    raise  # pragma: no cover
+                _logger.debug('%r: Could not join multicast group %s on interface %s: %s', self, group, iface, ex)
+            else:
+                _logger.debug('%r: Socket %r joined multicast group %s on interface %s', self, s, group, iface)
+                return
+        s.close()
+        raise pyuavcan.transport.InvalidMediaConfigurationError(
+            f'Bad IP configuration: cannot join multicast group {group} from {self}'
+        )  # pragma: no cover
+
     def __str__(self) -> str:
         return str(self._local)
 
@@ -234,6 +282,53 @@ def _unittest_network_map_ipv4() -> None:
     inp.close()
 
 
+def _unittest_network_map_ipv4_multicast() -> None:
+    import os
+
+    nm = NetworkMapIPv4('127.123.0.123/16', multicast=True)
+    assert nm.multicast
+    assert not NetworkMapIPv4('127.123.0.123/16').multicast
+    assert nm.local_node_id == 123
+
+    # The subject is published into its multicast group rather than to the subnet broadcast address.
+    out = nm.make_output_socket(None, 16384 + 1234)
+    assert out.getpeername() == ('239.0.68.210', 16384 + 1234)
+
+    # Only the groups of subscribed subjects are joined. On GNU/Linux this can be observed via procfs.
+    def is_member(group: str) -> bool:
+        group_hex = socket.inet_aton(group)[::-1].hex().upper()  # Stored in the host byte order.
+        with open('/proc/net/igmp') as f:
+            return any(line.split()[0] == group_hex for line in f if line.startswith('\t'))
+
+    inp = nm.make_input_socket(16384 + 1234, True)
+    if os.path.exists('/proc/net/igmp'):
+        assert is_member('239.0.68.210')
+        assert not is_member('239.0.68.211')
+
+    out.send(b'Would it save you a lot of time if I just gave up and went mad now?')
+    inp.settimeout(1.0)
+    data, sockaddr = inp.recvfrom(1024)
+    assert data == b'Would it save you a lot of time if I just gave up and went mad now?'
+    assert sockaddr[0] == '127.123.0.123'
+
+    # Unicast is not affected.
+    uni_out = nm.make_output_socket(123, 12345)
+    uni_inp = nm.make_input_socket(12345, False)
+    uni_out.send(b'Unicast')
+    uni_inp.settimeout(1.0)
+    assert uni_inp.recvfrom(1024)[0] == b'Unicast'
+
+    for s in (out, inp, uni_out, uni_inp):
+        s.close()
+    if os.path.exists('/proc/net/igmp'):
+        assert not is_member('239.0.68.210')    # Left the group.
+
+    # Anonymous nodes can listen to multicast, too.
+    nm = NetworkMapIPv4('192.168.0.255/24', multicast=True)
+    assert nm.local_node_id is None
+    nm.make_input_socket(16384, True).close()
+
+
 class IPv4Address:
     """
     This class models the IPv4 address of a particular host along with the subnet it is contained in.
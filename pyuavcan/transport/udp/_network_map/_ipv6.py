@@ -4,9 +4,15 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
+from __future__ import annotations
+import os
+import errno
+import struct
 import typing
 import socket
 import logging
+import ipaddress
+import pyuavcan
 from ._network_map import NetworkMap
 
 
@@ -14,26 +20,351 @@ _logger = logging.getLogger(__name__)
 
 
 class NetworkMapIPv6(NetworkMap):
-    def __init__(self, network: str):
-        assert network
-        raise NotImplementedError('Sorry, IPv6 is not yet supported. Please submit patches!')
+    r"""
+    The node-ID is the interface identifier of the IPv6 address (the host bits),
+    just like it is the host address in IPv4.
+    The node-ID of zero maps to the Subnet-Router anycast address, which may make it unusable on some networks.
+
+    There is no broadcast in IPv6; instead, broadcast transfers are emitted into multicast groups,
+    one group per UDP port (hence one per subject).
+    This allows the network stack (and IGMP/MLD-snooping switches) to discard traffic that the local node is not
+    subscribed to, instead of delivering every subject to every host for filtering in user space.
+    The group address is a unicast-prefix-based multicast address as defined in RFC 3306, so that different
+    UAVCAN networks sharing the same link do not interfere with each other::
+
+        ff3S:00PL:PPPP:PPPP:PPPP:PPPP:GGGG:GGGG
+           |    \/ \_________________/ \_______/
+           |  prefix    network         group-ID
+           |  length    prefix          (the UDP port number)
+          scope
+
+    Prefixes longer than 64 bits are truncated to 64 bits as required by the RFC.
+    The scope is link-local; see :attr:`MULTICAST_SCOPE`.
+    Multicast group membership is established when the input socket is created by :meth:`make_input_socket`
+    and relinquished automatically by the operating system when the socket is closed.
+    """
+
+    #: Link-local scope by default: UAVCAN networks are normally confined to one link.
+    MULTICAST_SCOPE = 0x2
+
+    _MAX_MULTICAST_PREFIX_LENGTH = 64
+
+    def __init__(self, ip_address: str):
+        self._local, self._scope = _parse_address(ip_address, 128 - self.NODE_ID_BIT_LENGTH)
+        host_bits = self._local.max_prefixlen - self._local.network.prefixlen
+        if host_bits <= 0:
+            raise ValueError(f'The prefix length in {ip_address} leaves no room for the interface identifier')
+
+        self._scope_id = _resolve_scope_id(self._scope, self._local.ip)
+        self._max_nodes: int = min(2 ** self.NODE_ID_BIT_LENGTH, 2 ** host_bits)
+
+        prefix_length = min(self._local.network.prefixlen, self._MAX_MULTICAST_PREFIX_LENGTH)
+        prefix = int(self._local.network.network_address) >> 64
+        prefix &= ~((1 << (64 - prefix_length)) - 1)
+        self._multicast_base = (0xFF30 | self.MULTICAST_SCOPE) << 112 | prefix_length << 96 | prefix << 32
+
+        maybe_local_node_id = int(self._local.ip) - int(self._local.network.network_address)
+        if maybe_local_node_id < self._max_nodes:
+            self._local_node_id: typing.Optional[int] = maybe_local_node_id
+            # Test the address configuration to detect configuration errors early.
+            # These checks are only valid if the local node is non-anonymous.
+            # The multicast output socket is not checked because some interfaces do not support multicast,
+            # most notably the loopback interface on most systems; it is still usable for unicast and reception.
+            for s in [
+                self.make_output_socket(1, 65535),
+                self.make_input_socket(0, False),
+            ]:
+                # This invariant is supposed to be upheld by the OS, so we use an assertion check.
+                assert ipaddress.IPv6Address(s.getsockname()[0].split('%')[0]) == self._local.ip, \
+                    'Socket API invariant violation'
+                s.close()
+        else:
+            self._local_node_id = None
+
+        # Test the address configuration to detect configuration errors early.
+        # These checks are valid regardless of whether the local node is anonymous.
+        self.make_input_socket(0, True).close()
+
+        self._ip_to_nid_cache: typing.Dict[str, typing.Optional[int]] = {}
 
     @property
     def max_nodes(self) -> int:
-        raise NotImplementedError
+        return self._max_nodes
 
     @property
-    def local_node_id(self) -> int:
-        raise NotImplementedError
+    def local_node_id(self) -> typing.Optional[int]:
+        return self._local_node_id
 
     def map_ip_address_to_node_id(self, ip: str) -> typing.Optional[int]:
-        raise NotImplementedError
+        try:
+            return self._ip_to_nid_cache[ip]
+        except LookupError:
+            node_id: typing.Optional[int] = None
+            try:
+                a = ipaddress.IPv6Address(ip.split('%')[0].strip())
+            except ValueError:
+                pass
+            else:
+                if a in self._local.network:
+                    candidate = int(a) - int(self._local.network.network_address)
+                    assert candidate >= 0
+                    if candidate < self._max_nodes:
+                        node_id = candidate
+
+            _logger.debug('%r: New IP to node-ID mapping: %r --> %s', self, ip, node_id)
+            self._ip_to_nid_cache[ip] = node_id
+            return node_id
+
+    def map_port_to_multicast_group(self, port: int) -> str:
+        """
+        Returns the multicast group address that broadcast transfers sent to the specified UDP port are emitted into.
+
+        >>> NetworkMapIPv6('::1/116').map_port_to_multicast_group(16384)
+        'ff32:40::4000'
+        """
+        port = int(port)
+        if not (0 <= port <= 0xFFFF):
+            raise ValueError(f'Invalid UDP port: {port}')
+        return str(ipaddress.IPv6Address(self._multicast_base | port))
 
     def make_output_socket(self, remote_node_id: typing.Optional[int], remote_port: int) -> socket.socket:
-        raise NotImplementedError
+        if self.local_node_id is None:
+            raise pyuavcan.transport.OperationNotDefinedForAnonymousNodeError(
+                f'Anonymous UDP/IP nodes cannot emit transfers, they can only listen. '
+                f'The local IP address is {self}.'
+            )
+
+        s = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
+        s.setblocking(False)
+        try:
+            # Output sockets shall be bound, too, in order to ensure that outgoing packets have the correct
+            # source IP address specified.
+            s.bind((str(self._local.ip), 0, 0, self._scope_id))  # Bind to an ephemeral port.
+        except OSError as ex:
+            s.close()
+            if ex.errno in (errno.EADDRNOTAVAIL, errno.EINVAL):
+                raise pyuavcan.transport.InvalidMediaConfigurationError(
+                    f'Bad IP configuration: cannot bind output socket to {self} [{errno.errorcode[ex.errno]}]'
+                ) from None
+            raise  # pragma: no cover
+
+        # Specify the fixed remote end. The port is always fixed; the host is unicast or multicast.
+        if remote_node_id is None:
+            if self._scope_id:
+                s.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_MULTICAST_IF, self._scope_id)
+            # Local nodes sharing the same host shall receive our traffic, too.
+            s.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_MULTICAST_LOOP, 1)
+            group = self.map_port_to_multicast_group(remote_port)
+            try:
+                s.connect((group, remote_port, 0, self._scope_id))
+            except OSError as ex:
+                s.close()
+                if ex.errno in (errno.ENETUNREACH, errno.EADDRNOTAVAIL):
+                    raise pyuavcan.transport.InvalidMediaConfigurationError(
+                        f'Bad IP configuration: cannot emit multicast to {group} from {self}; '
+                        f'does the interface support multicast? [{errno.errorcode[ex.errno]}]'
+                    ) from None
+                raise  # pragma: no cover
+        elif 0 <= remote_node_id < self._max_nodes:
+            ip = ipaddress.IPv6Address(int(self._local.network.network_address) + remote_node_id)
+            assert ip in self._local.network
+            s.connect((str(ip), remote_port, 0, self._scope_id))
+        else:
+            s.close()
+            raise ValueError(f'Cannot map the node-ID value {remote_node_id} to an IP address. '
+                             f'The range of valid node-ID values is [0, {self._max_nodes})')
+
+        _logger.debug('%r: New output socket %r connected to remote node %r, remote port %r',
+                      self, s, remote_node_id, remote_port)
+        return s
 
     def make_input_socket(self, local_port: int, expect_broadcast: bool) -> socket.socket:
-        raise NotImplementedError
+        """
+        If broadcast is expected, the socket joins the multicast group of the specified port
+        (see :meth:`map_port_to_multicast_group`) on the local interface.
+        The membership is dropped by the operating system when the socket is closed.
+        """
+        s = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
+        try:
+            s.setblocking(False)
+            # Allow other applications and other instances to listen to multicast traffic.
+            # This option shall be set before the socket is bound.
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            # Do not accept IPv4-mapped traffic if the socket is bound to the wildcard address.
+            s.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+
+            if expect_broadcast or self.local_node_id is None:
+                # Multicast datagrams are not delivered to sockets bound to a unicast address, so we bind to the
+                # wildcard address like in the case of IPv4 broadcast. The difference is that here the kernel
+                # will filter out the groups that we are not members of.
+                s.bind(('', local_port, 0, 0))
+            else:
+                # Binding to the specific address allows multiple nodes on the same host to use the same port.
+                # Read the documentation for the IPv4 network map for the details.
+                try:
+                    s.bind((str(self._local.ip), local_port, 0, self._scope_id))
+                except OSError as ex:
+                    if ex.errno in (errno.EADDRNOTAVAIL, errno.EINVAL):
+                        raise pyuavcan.transport.InvalidMediaConfigurationError(
+                            f'Bad IP configuration: cannot bind input socket to {self} '
+                            f'[{errno.errorcode[ex.errno]}]'
+                        ) from None
+                    raise  # pragma: no cover
+
+            if expect_broadcast:
+                group = self.map_port_to_multicast_group(local_port)
+                # struct ipv6_mreq {struct in6_addr ipv6mr_multiaddr; unsigned int ipv6mr_interface;}
+                mreq = socket.inet_pton(socket.AF_INET6, group) + struct.pack('@I', self._scope_id)
+                s.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_JOIN_GROUP, mreq)
+                _logger.debug('%r: Input socket %r joined multicast group %s on interface #%d',
+                              self, s, group, self._scope_id)
+        except Exception:
+            s.close()   # Leaves the multicast group, if joined.
+            raise
+
+        _logger.debug('%r: New input socket %r, local port %r, supports broadcast: %r',
+                      self, s, local_port, expect_broadcast)
+        return s
 
     def __str__(self) -> str:
-        raise NotImplementedError
+        scope = f'%{self._scope}' if self._scope else ''
+        return f'{self._local.ip}{scope}/{self._local.network.prefixlen}'
+
+
+def _parse_address(text: str, default_prefix_length: int) -> typing.Tuple[ipaddress.IPv6Interface, str]:
+    """
+    The standard library does not support scoped addresses until Python 3.9, so we have to parse them manually.
+
+    >>> _parse_address('fe80::c7b%enp6s0/64', 116)
+    (IPv6Interface('fe80::c7b/64'), 'enp6s0')
+    >>> _parse_address(' ::1 ', 116)
+    (IPv6Interface('::1/116'), '')
+    """
+    text = text.strip()
+    address, _, prefix_length = text.partition('/')
+    address, _, scope = address.partition('%')
+    try:
+        return ipaddress.IPv6Interface(f'{address}/{prefix_length or default_prefix_length}'), scope
+    except ValueError as ex:
+        raise ValueError(f'Malformed IPv6 address: {text!r}; the expected format is "ADDRESS%SCOPE/PREFIX": {ex}') \
+            from None
+
+
+def _resolve_scope_id(scope: str, address: ipaddress.IPv6Address) -> int:
+    """
+    The scope may be specified either as an interface name or as an interface index.
+    If not specified, the operating system is queried for the interface that owns the address;
+    if the information is not available, zero is returned which lets the network stack pick the interface.
+    """
+    if scope:
+        if scope.isdigit():
+            return int(scope)
+        try:
+            return socket.if_nametoindex(scope)
+        except OSError:
+            raise pyuavcan.transport.InvalidMediaConfigurationError(f'Unknown network interface: {scope!r}') \
+                from None
+
+    # This is GNU/Linux-specific; on other systems the scope has to be specified explicitly if needed.
+    try:
+        with open(_PROC_IF_INET6) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and ipaddress.IPv6Address(int(fields[0], 16)) == address:
+                    return int(fields[1], 16)
+    except OSError:
+        pass
+    return 0
+
+
+_PROC_IF_INET6 = '/proc/net/if_inet6'
+
+
+def _unittest_network_map_ipv6() -> None:
+    from pytest import raises
+
+    with raises(ValueError):
+        NetworkMap.new('::1/128')               # No room for the node-ID.
+
+    with raises(ValueError):
+        NetworkMap.new('::1::1/64')             # Malformed.
+
+    with raises(ValueError):
+        NetworkMap.new('::1/129')               # Bad prefix length.
+
+    with raises(pyuavcan.transport.InvalidMediaConfigurationError):
+        NetworkMap.new('fd00:dead:beef::1/64')  # Suppose that the test machine does not have such interface.
+
+    with raises(pyuavcan.transport.InvalidMediaConfigurationError):
+        NetworkMap.new('::1%nonexistent0/64')
+
+    nm = NetworkMap.new('::1:1/64')             # The interface identifier exceeds the node-ID range: anonymous.
+    assert nm.local_node_id is None
+    with raises(pyuavcan.transport.OperationNotDefinedForAnonymousNodeError):
+        nm.make_output_socket(1, 12345)
+
+    nm = NetworkMap.new(' ::1\t')               # The default prefix length is used.
+    assert isinstance(nm, NetworkMapIPv6)
+    assert str(nm) == '::1/116'
+    assert nm.max_nodes == 2 ** NetworkMap.NODE_ID_BIT_LENGTH  # Full capacity available.
+    assert nm.local_node_id == 1
+    assert nm.map_ip_address_to_node_id('::2') == 2
+    assert nm.map_ip_address_to_node_id('::2') == 2     # From cache
+    assert nm.map_ip_address_to_node_id('::fff') == 4095
+    assert nm.map_ip_address_to_node_id('::1000') is None
+    assert nm.map_ip_address_to_node_id('fd00::1') is None
+    assert nm.map_ip_address_to_node_id('::3%lo') == 3
+    assert nm.map_ip_address_to_node_id('127.0.0.1') is None
+
+    nm = NetworkMap.new('::1/120')
+    assert isinstance(nm, NetworkMapIPv6)
+    assert str(nm) == '::1/120'
+    assert nm.max_nodes == 256
+    assert nm.map_ip_address_to_node_id('::ff') == 255
+    assert nm.map_ip_address_to_node_id('::100') is None
+    assert nm.map_port_to_multicast_group(16384) == 'ff32:40::4000'
+    with raises(ValueError):
+        nm.map_port_to_multicast_group(65536)
+
+    with raises(ValueError):
+        assert nm.make_output_socket(256, 65535)  # The node-ID cannot be mapped.
+
+    # Unicast exchange; also ensure the source IP address is specified correctly in outgoing UDP frames.
+    out = nm.make_output_socket(nm.local_node_id, 12345)
+    inp = nm.make_input_socket(12345, False)
+    out.send(b'Well, I got here the same way the coin did.')
+    inp.settimeout(1.0)
+    data, sockaddr = inp.recvfrom(1024)
+    assert data == b'Well, I got here the same way the coin did.'
+    assert sockaddr[0] == '::1'
+    out.close()
+    inp.close()
+
+    # Multicast group membership. On GNU/Linux it can be observed via procfs.
+    group = nm.map_port_to_multicast_group(12345)
+    group_hex = socket.inet_pton(socket.AF_INET6, group).hex()
+
+    def is_member() -> bool:
+        with open('/proc/net/igmp6') as f:
+            return any(line.split()[2] == group_hex for line in f if line.strip())
+
+    inp = nm.make_input_socket(12345, True)
+    if os.path.exists('/proc/net/igmp6'):
+        assert is_member()
+    try:
+        out = nm.make_output_socket(None, 12345)
+    except pyuavcan.transport.InvalidMediaConfigurationError as ex:
+        # Most systems do not enable multicast on the loopback interface by default (no MULTICAST flag).
+        # It can be enabled on GNU/Linux like this: ip link set lo multicast on
+        _logger.warning('Multicast delivery over the loopback interface could not be tested: %s', ex)
+    else:
+        assert out.getpeername()[0] == group
+        out.send(b'All right, then. Keep your secrets.')
+        inp.settimeout(1.0)
+        data, sockaddr = inp.recvfrom(1024)
+        assert data == b'All right, then. Keep your secrets.'
+        assert sockaddr[0] == '::1'
+        out.close()
+    inp.close()
+    if os.path.exists('/proc/net/igmp6'):
+        assert not is_member()   # Left the group.
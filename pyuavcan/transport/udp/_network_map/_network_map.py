@@ -36,16 +36,17 @@ class NetworkMap(abc.ABC):
     NODE_ID_BIT_LENGTH = 12
 
     @staticmethod
-    def new(ip_address: str) -> NetworkMap:
+    def new(ip_address: str, multicast: bool = False) -> NetworkMap:
         """
         Use this factory to create new instances.
+        The multicast option applies only to IPv4 because IPv6 has no broadcast and always uses multicast.
         """
         if ':' in ip_address:
             from ._ipv6 import NetworkMapIPv6
             return NetworkMapIPv6(ip_address)
         else:
             from ._ipv4 import NetworkMapIPv4
-            return NetworkMapIPv4(ip_address)
+            return NetworkMapIPv4(ip_address, multicast=multicast)
 
     @property
     @abc.abstractmethod
@@ -9,6 +9,9 @@ from pyuavcan.transport import DataSpecifier, MessageDataSpecifier, ServiceDataS
 
 SUBJECT_ID_OFFSET = 16384
 
+#: The base of the IPv4 multicast address range used for subjects (239.0.0.0/8, administratively scoped, RFC 2365).
+IPV4_MULTICAST_GROUP_BASE = 0xEF_00_00_00
+
 
 def udp_port_from_data_specifier(ds: DataSpecifier) -> int:
     """
@@ -47,3 +50,37 @@ def udp_port_from_data_specifier(ds: DataSpecifier) -> int:
             return request + 1
 
     raise ValueError(f'Unsupported data specifier: {ds}')  # pragma: no cover
+
+
+def ipv4_multicast_group_from_udp_port(udp_port: int) -> str:
+    """
+    Maps the UDP port number of a subject (see :func:`udp_port_from_data_specifier`)
+    to the IPv4 multicast group address that the subject is published into when multicast is enabled.
+    The 16 least significant bits of the group address equal the port number.
+    Since Ethernet maps the 23 least significant bits of the IPv4 multicast group address to the MAC address,
+    each subject is also assigned a unique multicast MAC address, allowing the NIC to filter traffic in hardware.
+
+    >>> ipv4_multicast_group_from_udp_port(16384)
+    '239.0.64.0'
+    >>> ipv4_multicast_group_from_udp_port(49151)
+    '239.0.191.255'
+    """
+    udp_port = int(udp_port)
+    if not (0 <= udp_port <= 0xFFFF):
+        raise ValueError(f'Invalid UDP port: {udp_port}')
+    return '.'.join(map(str, (IPV4_MULTICAST_GROUP_BASE | udp_port).to_bytes(4, 'big')))
+
+
+def ipv4_multicast_group_from_data_specifier(ds: DataSpecifier) -> str:
+    """
+    The multicast group of a subject is derived from its UDP port number.
+    Services are always unicast, so they have no multicast groups; a :class:`ValueError` is raised for them.
+
+    >>> ipv4_multicast_group_from_data_specifier(MessageDataSpecifier(0))
+    '239.0.64.0'
+    >>> ipv4_multicast_group_from_data_specifier(MessageDataSpecifier(1234))
+    '239.0.68.210'
+    """
+    if not isinstance(ds, MessageDataSpecifier):
+        raise ValueError(f'Only subjects can be mapped to multicast groups: {ds}')
+    return ipv4_multicast_group_from_udp_port(udp_port_from_data_specifier(ds))
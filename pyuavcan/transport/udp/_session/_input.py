@@ -12,7 +12,10 @@ import asyncio
 import logging
 import dataclasses
 import pyuavcan
-from pyuavcan.transport.commons.high_overhead_transport import TransferReassembler
+from pyuavcan.transport.commons.high_overhead_transport import TransferReassembler, TransferQueue
+from pyuavcan.transport.commons.high_overhead_transport import FrameDivertingInputSession, FrameHandler
+from pyuavcan.transport.commons.high_overhead_transport import QueuedInputSession, InputSessionStatistics
+from pyuavcan.transport.commons.high_overhead_transport import PromiscuousInputSessionStatistics, ReassemblerTable
 from .._frame import UDPFrame
 
 
@@ -20,13 +23,11 @@ _logger = logging.getLogger(__name__)
 
 
 @dataclasses.dataclass
-class UDPInputSessionStatistics(pyuavcan.transport.SessionStatistics):
-    #: Keys are data type hash values collected from received frames that did not match the local type configuration.
-    #: Values are the number of times each hash value has been encountered.
-    mismatched_data_type_hashes: typing.Dict[int, int] = dataclasses.field(default_factory=dict)
+class UDPInputSessionStatistics(InputSessionStatistics):
+    pass
 
 
-class UDPInputSession(pyuavcan.transport.InputSession):
+class UDPInputSession(pyuavcan.transport.InputSession, FrameDivertingInputSession, QueuedInputSession):
     """
     As you already know, the UDP port number is a function of the data specifier.
     Hence, the input flow demultiplexing is mostly done by the UDP/IP stack implemented in the operating system
@@ -56,6 +57,10 @@ class UDPInputSession(pyuavcan.transport.InputSession):
 
     - Upon reception of the frame, the input session (one of many) updates its reassembler state machine
       and runs all that meticulous bookkeeping you can't get away from if you need to receive multi-frame transfers.
+      The payload of a multi-frame transfer is delivered as a list of fragments referring to the received frames
+      (zero-copy) unless the transport is configured to reassemble it into one contiguous buffer
+      (see the ``contiguous_payload`` parameter of :class:`UDPTransport`);
+      the copy releases the socket receive buffers the frames were read into and spares the consumer the fragmentation.
 
     - If the received frame happened to complete a transfer, the input session passes it up to the higher layer.
 
@@ -109,7 +114,8 @@ class UDPInputSession(pyuavcan.transport.InputSession):
         assert callable(self._maybe_finalizer)
 
         self._transfer_id_timeout = self.DEFAULT_TRANSFER_ID_TIMEOUT
-        self._queue: asyncio.Queue[pyuavcan.transport.TransferFrom] = asyncio.Queue()
+        self._queue = TransferQueue()
+        self._frame_handler: typing.Optional[FrameHandler] = None
 
     def _process_frame(self, source_node_id: int, frame: typing.Optional[UDPFrame]) -> None:
         """
@@ -135,16 +141,20 @@ class UDPInputSession(pyuavcan.transport.InputSession):
                 self._statistics.mismatched_data_type_hashes[frame.data_type_hash] = 1
             return
 
-        transfer = self._get_reassembler(source_node_id).process_frame(frame, self._transfer_id_timeout)
+        if self._frame_handler is not None:
+            self._frame_handler(source_node_id, frame)
+            return
+
+        reasm = self._get_reassembler(source_node_id, frame.timestamp.monotonic_ns)
+        if reasm.is_duplicate(frame, self._transfer_id_timeout):
+            self._statistics.duplicate_frames += 1
+            return
+        transfer = reasm.process_frame(frame, self._transfer_id_timeout)
         if transfer is not None:
             self._statistics.transfers += 1
             self._statistics.payload_bytes += sum(map(len, transfer.fragmented_payload))
             _logger.debug('%s: Received transfer: %s; current stats: %s', self, transfer, self._statistics)
-            try:
-                self._queue.put_nowait(transfer)
-            except asyncio.QueueFull:  # pragma: no cover
-                # TODO: make the queue capacity configurable
-                self._statistics.drops += len(transfer.fragmented_payload)
+            self._enqueue_transfer(transfer)
 
     async def receive_until(self, monotonic_deadline: float) -> typing.Optional[pyuavcan.transport.TransferFrom]:
         try:
@@ -187,39 +197,60 @@ class UDPInputSession(pyuavcan.transport.InputSession):
             self._maybe_finalizer()
             self._maybe_finalizer = None
 
+    def _set_frame_handler(self, handler: typing.Optional[FrameHandler]) -> None:
+        self._frame_handler = handler
+
     @property
     @abc.abstractmethod
     def _statistics(self) -> UDPInputSessionStatistics:
         raise NotImplementedError
 
     @abc.abstractmethod
-    def _get_reassembler(self, source_node_id: int) -> TransferReassembler:
+    def _get_reassembler(self, source_node_id: int, monotonic_ns: int) -> TransferReassembler:
         raise NotImplementedError
 
 
 @dataclasses.dataclass
-class PromiscuousUDPInputSessionStatistics(UDPInputSessionStatistics):
-    #: Keys are source node-IDs; values are dicts where keys are error enum members and values are counts.
-    reassembly_errors_per_source_node_id: typing.Dict[int, typing.Dict[TransferReassembler.Error, int]] = \
-        dataclasses.field(default_factory=dict)
+class PromiscuousUDPInputSessionStatistics(PromiscuousInputSessionStatistics, UDPInputSessionStatistics):
+    pass
 
 
 class PromiscuousUDPInputSession(UDPInputSession):
+    #: Units are seconds. Can be overridden after instantiation if needed.
+    DEFAULT_REASSEMBLER_IDLE_TIMEOUT = ReassemblerTable.DEFAULT_IDLE_TIMEOUT
+
     def __init__(self,
-                 specifier:        pyuavcan.transport.InputSessionSpecifier,
-                 payload_metadata: pyuavcan.transport.PayloadMetadata,
-                 loop:             asyncio.AbstractEventLoop,
-                 finalizer:        typing.Callable[[], None]):
+                 specifier:          pyuavcan.transport.InputSessionSpecifier,
+                 payload_metadata:   pyuavcan.transport.PayloadMetadata,
+                 loop:               asyncio.AbstractEventLoop,
+                 finalizer:          typing.Callable[[], None],
+                 contiguous_payload: bool = False):
         """
         Do not call this directly, use the factory method instead.
         """
         self._statistics_impl = PromiscuousUDPInputSessionStatistics()
-        self._reassemblers: typing.Dict[int, TransferReassembler] = {}
+        self._reassemblers = ReassemblerTable(max_payload_size_bytes=payload_metadata.max_size_bytes,
+                                              statistics=self._statistics_impl,
+                                              contiguous_payload=contiguous_payload)
+        self._reassemblers.idle_timeout = self.DEFAULT_REASSEMBLER_IDLE_TIMEOUT
         super(PromiscuousUDPInputSession, self).__init__(specifier=specifier,
                                                          payload_metadata=payload_metadata,
                                                          loop=loop,
                                                          finalizer=finalizer)
 
+    @property
+    def reassembler_idle_timeout(self) -> float:
+        """
+        The transfer reassembly state of a remote node that has not sent any frames for this long is discarded.
+        See :class:`pyuavcan.transport.commons.high_overhead_transport.ReassemblerTable` for details.
+        Units are seconds; the value shall be positive, otherwise you get a :class:`ValueError`.
+        """
+        return self._reassemblers.idle_timeout
+
+    @reassembler_idle_timeout.setter
+    def reassembler_idle_timeout(self, value: float) -> None:
+        self._reassemblers.idle_timeout = value
+
     def sample_statistics(self) -> PromiscuousUDPInputSessionStatistics:
         return copy.copy(self._statistics)
 
@@ -227,26 +258,9 @@ class PromiscuousUDPInputSession(UDPInputSession):
     def _statistics(self) -> PromiscuousUDPInputSessionStatistics:
         return self._statistics_impl
 
-    def _get_reassembler(self, source_node_id: int) -> TransferReassembler:
+    def _get_reassembler(self, source_node_id: int, monotonic_ns: int) -> TransferReassembler:
         assert isinstance(source_node_id, int) and source_node_id >= 0, 'Internal protocol violation'
-        try:
-            return self._reassemblers[source_node_id]
-        except LookupError:
-            def on_reassembly_error(error: TransferReassembler.Error) -> None:
-                self._statistics.errors += 1
-                d = self._statistics.reassembly_errors_per_source_node_id[source_node_id]
-                try:
-                    d[error] += 1
-                except LookupError:
-                    d[error] = 1
-
-            self._statistics.reassembly_errors_per_source_node_id.setdefault(source_node_id, {})
-            reasm = TransferReassembler(source_node_id=source_node_id,
-                                        max_payload_size_bytes=self._payload_metadata.max_size_bytes,
-                                        on_error_callback=on_reassembly_error)
-            self._reassemblers[source_node_id] = reasm
-            _logger.debug('%s: New %s (%d total)', self, reasm, len(self._reassemblers))
-            return reasm
+        return self._reassemblers.get(source_node_id, monotonic_ns, self._transfer_id_timeout)
 
 
 @dataclasses.dataclass
@@ -257,10 +271,11 @@ class SelectiveUDPInputSessionStatistics(UDPInputSessionStatistics):
 
 class SelectiveUDPInputSession(UDPInputSession):
     def __init__(self,
-                 specifier:        pyuavcan.transport.InputSessionSpecifier,
-                 payload_metadata: pyuavcan.transport.PayloadMetadata,
-                 loop:             asyncio.AbstractEventLoop,
-                 finalizer:        typing.Callable[[], None]):
+                 specifier:          pyuavcan.transport.InputSessionSpecifier,
+                 payload_metadata:   pyuavcan.transport.PayloadMetadata,
+                 loop:               asyncio.AbstractEventLoop,
+                 finalizer:          typing.Callable[[], None],
+                 contiguous_payload: bool = False):
         """
         Do not call this directly, use the factory method instead.
         """
@@ -278,7 +293,8 @@ class SelectiveUDPInputSession(UDPInputSession):
 
         self._reassembler = TransferReassembler(source_node_id=source_node_id,
                                                 max_payload_size_bytes=payload_metadata.max_size_bytes,
-                                                on_error_callback=on_reassembly_error)
+                                                on_error_callback=on_reassembly_error,
+                                                contiguous_payload=contiguous_payload)
 
         super(SelectiveUDPInputSession, self).__init__(specifier=specifier,
                                                        payload_metadata=payload_metadata,
@@ -292,6 +308,6 @@ class SelectiveUDPInputSession(UDPInputSession):
     def _statistics(self) -> SelectiveUDPInputSessionStatistics:
         return self._statistics_impl
 
-    def _get_reassembler(self, source_node_id: int) -> TransferReassembler:
+    def _get_reassembler(self, source_node_id: int, monotonic_ns: int) -> TransferReassembler:
         assert source_node_id == self._reassembler.source_node_id, 'Internal protocol violation'
         return self._reassembler
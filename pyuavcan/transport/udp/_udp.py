@@ -5,6 +5,7 @@
 #
 
 import copy
+import socket
 import typing
 import asyncio
 import logging
@@ -67,6 +68,10 @@ class UDPTransport(pyuavcan.transport.Transport):
                  ip_address:                  str,
                  mtu:                         int = DEFAULT_MTU,
                  service_transfer_multiplier: int = DEFAULT_SERVICE_TRANSFER_MULTIPLIER,
+                 multicast:                   bool = False,
+                 receive_buffer_size:         typing.Optional[int] = None,
+                 send_buffer_size:            typing.Optional[int] = None,
+                 contiguous_payload:          bool = False,
                  loop:                        typing.Optional[asyncio.AbstractEventLoop] = None):
         """
         :param ip_address: Specifies which local IP address to use for this transport.
@@ -121,7 +126,12 @@ class UDPTransport(pyuavcan.transport.Transport):
 
             IPv6 addresses may be specified without the mask, in which case it will be assumed to be
             equal ``128 - NODE_ID_BIT_LENGTH``.
-            Don't forget to specify the scope-ID for link-local IPv6 addresses.
+            Don't forget to specify the scope-ID for link-local IPv6 addresses;
+            for example, ``fe80::c7b%enp6s0/64``.
+            Since there is no broadcast in IPv6, broadcast transfers are emitted into per-subject multicast groups
+            derived from the network prefix; the local node joins only the groups of the subjects it is subscribed to.
+            For use on localhost, the loopback address can be used with a suitable prefix length, e.g., ``::1/116``;
+            note though that the loopback interface does not support multicast on most systems.
 
         :param mtu: The application-level MTU for outgoing packets.
             In other words, this is the maximum number of payload bytes per UDP frame.
@@ -134,11 +144,39 @@ class UDPTransport(pyuavcan.transport.Transport):
             This parameter specifies the number of times each outgoing service transfer will be repeated.
             This setting does not affect message transfers.
 
+        :param multicast: IPv4 only. If True, message transfers are published into per-subject multicast groups
+            (see :func:`ipv4_multicast_group_from_data_specifier`) instead of the subnet broadcast address,
+            and the local node joins only the groups of the subjects it is subscribed to.
+            This relieves the hosts from receiving and discarding the traffic they are not interested in,
+            and allows IGMP-snooping switches to avoid forwarding it at all.
+            All nodes on the network shall use the same setting.
+            IPv6 always uses multicast regardless of this setting because it has no broadcast.
+
+        :param receive_buffer_size: The size of the kernel receive buffer of each input socket (``SO_RCVBUF``),
+            in bytes. If not specified, the OS default is used, which may be insufficient for bursty traffic:
+            if the application is unable to keep up, the OS will drop the excess datagrams.
+            The number of such drops is reported via
+            :attr:`UDPDemultiplexerStatistics.kernel_dropped_datagrams` where supported.
+            The OS may adjust the requested value; e.g., GNU/Linux doubles it and caps it at ``rmem_max``.
+
+        :param send_buffer_size: The size of the kernel send buffer of each output socket (``SO_SNDBUF``),
+            in bytes. If not specified, the OS default is used.
+
+        :param contiguous_payload: If True, the payload of every received multi-frame transfer is copied into
+            one contiguous buffer upon reassembly and delivered as a single fragment, which releases the receive
+            buffers of the frames immediately and spares the application the fragmentation at the cost of a copy.
+            By default, the payload is delivered as a list of fragments referring to the received frames (zero-copy).
+            Single-frame transfers are always delivered as-is.
+
         :param loop: The event loop to use. Defaults to :func:`asyncio.get_event_loop`.
         """
-        self._network_map = NetworkMap.new(ip_address)
+        self._network_map = NetworkMap.new(ip_address, multicast=multicast)
+        self._multicast = bool(multicast)
         self._mtu = int(mtu)
         self._srv_multiplier = int(service_transfer_multiplier)
+        self._receive_buffer_size = int(receive_buffer_size) if receive_buffer_size is not None else None
+        self._send_buffer_size = int(send_buffer_size) if send_buffer_size is not None else None
+        self._contiguous_payload = bool(contiguous_payload)
         self._loop = loop if loop is not None else asyncio.get_event_loop()
 
         low, high = self.VALID_SERVICE_TRANSFER_MULTIPLIER_RANGE
@@ -149,6 +187,10 @@ class UDPTransport(pyuavcan.transport.Transport):
         if not (low <= self._mtu <= high):
             raise ValueError(f'Invalid MTU: {self._mtu} bytes')
 
+        for buffer_size in (self._receive_buffer_size, self._send_buffer_size):
+            if buffer_size is not None and buffer_size <= 0:
+                raise ValueError(f'Invalid socket buffer size: {buffer_size} bytes')
+
         _logger.debug(f'IP: {self._network_map}; max nodes: {self._network_map.max_nodes}; '
                       f'local node-ID: {self.local_node_id}')
 
@@ -210,6 +252,8 @@ class UDPTransport(pyuavcan.transport.Transport):
                 specifier.remote_node_id,
                 udp_port_from_data_specifier(specifier.data_specifier)
             )
+            if self._send_buffer_size is not None:
+                self._configure_socket_buffer(sock, socket.SO_SNDBUF, self._send_buffer_size)
             self._output_registry[specifier] = UDPOutputSession(
                 specifier=specifier,
                 payload_metadata=payload_metadata,
@@ -238,7 +282,8 @@ class UDPTransport(pyuavcan.transport.Transport):
 
     @property
     def descriptor(self) -> str:
-        return f'<udp srv_mult="{self._srv_multiplier}">{self._network_map}</udp>'
+        multicast = ' multicast="1"' if self._multicast else ''
+        return f'<udp srv_mult="{self._srv_multiplier}"{multicast}>{self._network_map}</udp>'
 
     @property
     def local_ip_address_with_netmask(self) -> str:
@@ -263,8 +308,11 @@ class UDPTransport(pyuavcan.transport.Transport):
                 # Service transfers cannot be broadcast.
                 expect_broadcast = not isinstance(specifier.data_specifier, pyuavcan.transport.ServiceDataSpecifier)
                 udp_port = udp_port_from_data_specifier(specifier.data_specifier)
+                sock = self._network_map.make_input_socket(udp_port, expect_broadcast)
+                if self._receive_buffer_size is not None:
+                    self._configure_socket_buffer(sock, socket.SO_RCVBUF, self._receive_buffer_size)
                 self._demultiplexer_registry[specifier.data_specifier] = UDPDemultiplexer(
-                    sock=self._network_map.make_input_socket(udp_port, expect_broadcast),
+                    sock=sock,
                     udp_mtu=_MAX_UDP_MTU,
                     node_id_mapper=self._network_map.map_ip_address_to_node_id,
                     local_node_id=self.local_node_id,
@@ -279,7 +327,8 @@ class UDPTransport(pyuavcan.transport.Transport):
             session = cls(specifier=specifier,
                           payload_metadata=payload_metadata,
                           loop=self.loop,
-                          finalizer=lambda: self._teardown_input_session(specifier))
+                          finalizer=lambda: self._teardown_input_session(specifier),
+                          contiguous_payload=self._contiguous_payload)
 
             # noinspection PyProtectedMember
             self._demultiplexer_registry[specifier.data_specifier].add_listener(specifier.remote_node_id,
@@ -290,6 +339,17 @@ class UDPTransport(pyuavcan.transport.Transport):
 
         self._input_registry[specifier] = session
 
+    def _configure_socket_buffer(self, sock: socket.socket, option: int, size: int) -> None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, size)
+        except OSError as ex:
+            sock.close()
+            raise pyuavcan.transport.InvalidMediaConfigurationError(
+                f'Could not set the socket buffer size to {size} bytes: {ex}') from ex
+        # The OS is free to adjust the value, so we report what was actually applied.
+        _logger.debug('%r: Socket %r buffer size requested %d, effective %d bytes',
+                      self, sock, size, sock.getsockopt(socket.SOL_SOCKET, option))
+
     def _teardown_input_session(self, specifier: pyuavcan.transport.InputSessionSpecifier) -> None:
         """
         The finalizer may be invoked at any point during the setup process,
@@ -0,0 +1,258 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+import os
+import time
+import random
+import typing
+import asyncio
+import pytest
+import pyuavcan.transport
+from pyuavcan.transport import Timestamp, Priority, TransferFrom
+# Shouldn't import a transport from inside a coroutine because it triggers debug warnings.
+from pyuavcan.transport.redundant import RedundantTransport
+# noinspection PyProtectedMember
+from pyuavcan.transport.redundant._deduplicator import Deduplicator, CyclicDeduplicator, MonotonicDeduplicator
+from pyuavcan.transport.loopback import LoopbackTransport
+from pyuavcan.transport.udp import UDPTransport
+from pyuavcan.transport.can import CANTransport
+from tests.transport.can.media.mock import MockMedia
+
+
+def _unittest_redundant_deduplicator_failover() -> None:
+    """
+    Simulates a remote node publishing periodically over two redundant interfaces, where the primary interface
+    fails halfway through, and measures the failover gap (the time between the last transfer accepted before
+    the failure and the first one accepted after it) and the number of lost transfers at various transfer-ID
+    timeout settings. A deduplicator that relies only on the transfer-ID timeout to switch interfaces would lose
+    every transfer published within the timeout after the failure; the expected gap is therefore one period.
+    The arrival order of the copies is randomized to emulate the latency variations between the interfaces.
+    """
+    period = 0.01
+    num_transfers = 1000
+    failure_at = num_transfers // 2
+
+    def run(dd: Deduplicator, transfer_id_modulo: typing.Optional[int], transfer_id_timeout: float) \
+            -> typing.Tuple[float, int]:
+        accepted: typing.List[typing.Tuple[int, float]] = []
+        for seq in range(num_transfers):
+            arrivals = [(0, seq * period + random.random() * 0.002), (1, seq * period + random.random() * 0.002)]
+            if seq >= failure_at:
+                arrivals = arrivals[1:]   # The primary interface has failed.
+            for iface_index, at in sorted(arrivals, key=lambda x: x[1]):
+                tr = TransferFrom(timestamp=Timestamp(system_ns=0, monotonic_ns=round(at * 1e9)),
+                                  priority=Priority.NOMINAL,
+                                  transfer_id=seq % transfer_id_modulo if transfer_id_modulo else seq,
+                                  fragmented_payload=[],
+                                  source_node_id=42)
+                if dd.should_accept_transfer(iface_index, transfer_id_timeout, tr):
+                    accepted.append((seq, at))
+
+        sequence_numbers = [x for x, _ in accepted]
+        assert len(sequence_numbers) == len(set(sequence_numbers)), 'Duplicates accepted'
+        times = [at for _, at in accepted]
+        gap = max(b - a for a, b in zip(times, times[1:]))
+        return gap, num_transfers - len(accepted)
+
+    for transfer_id_timeout in [0.1, 0.5, 2.0]:
+        for name, dd, modulo in [
+            ('cyclic (CAN, modulo 32)', CyclicDeduplicator(32), 32),
+            ('monotonic', MonotonicDeduplicator(), None),
+        ]:
+            gap, lost = run(dd, modulo, transfer_id_timeout)
+            print(f'Redundant failover with transfer-ID timeout {transfer_id_timeout:.1f} s, {name:24}: '
+                  f'gap {gap * 1e3:5.1f} ms, {lost} transfers lost '
+                  f'(timeout-based failover would lose about {round(transfer_id_timeout / period)})')
+            assert lost == 0
+            assert gap < period * 2
+
+
+#: A pair of transports of the same kind connecting the node A (11) with the node B (22) over one interface.
+#: Loopback transports cannot connect different nodes, so they are the same for both nodes.
+#: The argument is the index of the interface, used to keep the interfaces isolated from each other.
+_InterfaceFactory = typing.Callable[[int], typing.Tuple[pyuavcan.transport.Transport, pyuavcan.transport.Transport]]
+
+
+def _make_loopback(index: int) -> typing.Tuple[pyuavcan.transport.Transport, pyuavcan.transport.Transport]:
+    del index
+    tr = LoopbackTransport(11)
+    return tr, tr
+
+
+def _make_udp(index: int) -> typing.Tuple[pyuavcan.transport.Transport, pyuavcan.transport.Transport]:
+    # Each interface has its own subnet within 127.0.0.0/8, so that the copies do not leak between the interfaces.
+    return UDPTransport(f'127.{index}.0.11/16'), UDPTransport(f'127.{index}.0.22/16')
+
+
+def _make_can(index: int) -> typing.Tuple[pyuavcan.transport.Transport, pyuavcan.transport.Transport]:
+    del index
+    peers: typing.Set[MockMedia] = set()
+    return CANTransport(MockMedia(peers, 64, 10), 11), CANTransport(MockMedia(peers, 64, 10), 22)
+
+
+class _BenchmarkResult(typing.NamedTuple):
+    message_rate: float
+    message_loss: int
+    latencies:    typing.List[float]
+    call_rate:    float
+    round_trips:  typing.List[float]
+
+
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_slow_redundant_transport_throughput() -> None:
+    """
+    Runs publish/subscribe and RPC between two nodes through :class:`RedundantTransport` with one to three
+    inferiors of various kinds and measures the transfer rate and the latency percentiles, compared against
+    the first inferior kind of the configuration used directly, so that the overhead of the redundancy layer
+    is quantified. The results are printed rather than asserted because they depend on the host.
+
+    The loopback transport cannot connect different nodes, so the loopback-only configurations are measured
+    within one node, which yields the pure overhead of the redundancy layer over an almost free inferior.
+    In the mixed configurations, the loopback inferiors are redundant interfaces that do not reach the peer,
+    like a link to a switch the peer is not connected to. UDP and CAN cannot be combined because their
+    transfer-ID counters are incompatible (see :class:`RedundantTransport`).
+    """
+    from pyuavcan.transport import MessageDataSpecifier, ServiceDataSpecifier, PayloadMetadata, Transfer
+    from pyuavcan.transport import InputSessionSpecifier, OutputSessionSpecifier, ProtocolParameters
+
+    loop = asyncio.get_event_loop()
+    num_transfers = 100
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 1024)
+    subject = MessageDataSpecifier(1234)
+    request = ServiceDataSpecifier(123, ServiceDataSpecifier.Role.REQUEST)
+    response = ServiceDataSpecifier(123, ServiceDataSpecifier.Role.RESPONSE)
+
+    async def measure(node_a: pyuavcan.transport.Transport,
+                      node_b: pyuavcan.transport.Transport,
+                      payload_size: int) -> _BenchmarkResult:
+        pub = node_a.get_output_session(OutputSessionSpecifier(subject, None), meta)
+        sub = node_b.get_input_session(InputSessionSpecifier(subject, None), meta)
+        client_tx = node_a.get_output_session(OutputSessionSpecifier(request, node_b.local_node_id), meta)
+        client_rx = node_a.get_input_session(InputSessionSpecifier(response, node_b.local_node_id), meta)
+        server_rx = node_b.get_input_session(InputSessionSpecifier(request, None), meta)
+        server_tx = node_b.get_output_session(OutputSessionSpecifier(response, node_a.local_node_id), meta)
+        payload = [memoryview(os.urandom(payload_size))]
+
+        async def send(ses: pyuavcan.transport.OutputSession, transfer_id: int) -> None:
+            assert await ses.send_until(Transfer(timestamp=Timestamp.now(),
+                                                 priority=Priority.NOMINAL,
+                                                 transfer_id=transfer_id,
+                                                 fragmented_payload=payload),
+                                        loop.time() + 5.0)
+
+        async def serve() -> None:
+            while True:
+                req = await server_rx.receive_until(loop.time() + 1.0)
+                if req is not None:
+                    assert await server_tx.send_until(Transfer(timestamp=Timestamp.now(),
+                                                               priority=req.priority,
+                                                               transfer_id=req.transfer_id,
+                                                               fragmented_payload=req.fragmented_payload),
+                                                      loop.time() + 5.0)
+
+        server = loop.create_task(serve())
+        tid_modulo = node_a.protocol_parameters.transfer_id_modulo
+        try:
+            # Message latency: one transfer at a time.
+            latencies: typing.List[float] = []
+            for tid in range(num_transfers):
+                started_at = time.monotonic()
+                await send(pub, tid)
+                assert await sub.receive_until(loop.time() + 5.0) is not None
+                latencies.append(time.monotonic() - started_at)
+
+            # Message throughput: the publisher is not throttled by the subscriber.
+            # Losses are possible with UDP if the socket buffers overflow, so they are counted instead of asserted.
+            started_at = time.monotonic()
+            publisher = asyncio.gather(*[send(pub, tid) for tid in range(num_transfers, num_transfers * 2)])
+            received = 0
+            while received < num_transfers and await sub.receive_until(loop.time() + 0.5) is not None:
+                received += 1
+            elapsed = time.monotonic() - started_at
+            await publisher
+
+            # RPC: sequential calls; the time spent by the server is included.
+            round_trips: typing.List[float] = []
+            call_started_at = time.monotonic()
+            for tid in range(num_transfers):
+                started_at = time.monotonic()
+                await send(client_tx, tid)
+                resp = await client_rx.receive_until(loop.time() + 5.0)
+                assert resp is not None and resp.transfer_id == tid % tid_modulo
+                round_trips.append(time.monotonic() - started_at)
+            call_elapsed = time.monotonic() - call_started_at
+        finally:
+            server.cancel()
+            await asyncio.sleep(0.01)
+
+        return _BenchmarkResult(message_rate=received / elapsed,
+                                message_loss=num_transfers - received,
+                                latencies=sorted(latencies),
+                                call_rate=num_transfers / call_elapsed,
+                                round_trips=sorted(round_trips))
+
+    async def run(factories:    typing.Sequence[_InterfaceFactory],
+                  payload_size: int,
+                  redundant:    bool) -> _BenchmarkResult:
+        pairs = [f(index) for index, f in enumerate(factories)]
+        if any(isinstance(x, CANTransport) for x, _ in pairs):
+            for x, _ in pairs:  # The loopback inferiors shall use the same transfer-ID modulo as CAN.
+                if isinstance(x, LoopbackTransport):
+                    x.protocol_parameters = ProtocolParameters(transfer_id_modulo=32, max_nodes=128, mtu=64)
+        node_a: pyuavcan.transport.Transport
+        node_b: pyuavcan.transport.Transport
+        if redundant:
+            red_a, red_b = RedundantTransport(), RedundantTransport()
+            for x, y in pairs:
+                red_a.attach_inferior(x)
+                if y is not x:
+                    red_b.attach_inferior(y)
+            node_a, node_b = red_a, red_a if all(x is y for x, y in pairs) else red_b
+        else:
+            assert len(pairs) == 1
+            node_a, node_b = pairs[0]
+        try:
+            return await measure(node_a, node_b, payload_size)
+        finally:
+            for x in {node_a, node_b}:
+                x.close()
+            await asyncio.sleep(0.1)    # Let the transports finalize their resources before the next run.
+
+    def percentiles(x: typing.List[float]) -> str:
+        def p(q: float) -> float:
+            return x[min(len(x) - 1, int(len(x) * q))] * 1e3
+        return f'p50={p(0.5):5.2f} p90={p(0.9):5.2f} p99={p(0.99):5.2f}'
+
+    configurations: typing.List[typing.Tuple[str, typing.Sequence[_InterfaceFactory]]] = [
+        ('loopback x1', [_make_loopback]),
+        ('loopback x2', [_make_loopback] * 2),
+        ('loopback x3', [_make_loopback] * 3),
+        ('udp x1', [_make_udp]),
+        ('udp x2', [_make_udp] * 2),
+        ('udp x3', [_make_udp] * 3),
+        ('udp+loopback', [_make_udp, _make_loopback]),
+        ('can x1', [_make_can]),
+        ('can x2', [_make_can] * 2),
+        ('can x3', [_make_can] * 3),
+        ('can+loopback', [_make_can, _make_loopback]),
+    ]
+    baselines: typing.Dict[typing.Tuple[_InterfaceFactory, int], _BenchmarkResult] = {}
+    for payload_size in [8, 200]:
+        for name, factories in configurations:
+            try:
+                direct = baselines[factories[0], payload_size]
+            except LookupError:
+                direct = await run(factories[:1], payload_size, redundant=False)
+                baselines[factories[0], payload_size] = direct
+            red = await run(factories, payload_size, redundant=True)
+            print(f'Redundant transport {name:12} payload={payload_size:3}: '
+                  f'pub/sub {red.message_rate:7.0f} transfers/s '
+                  f'({red.message_rate / direct.message_rate:4.2f} of direct, '
+                  f'lost {red.message_loss}), latency [ms] {percentiles(red.latencies)} '
+                  f'(direct {percentiles(direct.latencies)}); '
+                  f'RPC {red.call_rate:6.0f} calls/s ({red.call_rate / direct.call_rate:4.2f} of direct), '
+                  f'round trip [ms] {percentiles(red.round_trips)} (direct {percentiles(direct.round_trips)})')
+            assert red.message_rate > 0 and red.call_rate > 0
@@ -278,6 +278,39 @@ async def _unittest_redundant_transport() -> None:
     assert rx.fragmented_payload == [memoryview(b'asd')]
     assert rx.transfer_id == 6
 
+    #
+    # Frame-level redundancy requires the same MTU on all inferiors.
+    #
+    assert not tr_b.frame_level_redundancy
+    with pytest.raises(InconsistentInferiorConfigurationError):
+        tr_b.frame_level_redundancy = True
+    assert not tr_b.frame_level_redundancy
+
+    tr_a.frame_level_redundancy = True
+    assert tr_a.frame_level_redundancy
+    serial_c = SerialTransport(SERIAL_URI, 111, mtu=2048)
+    with pytest.raises(InconsistentInferiorConfigurationError):
+        tr_a.attach_inferior(serial_c)
+    assert tr_a.inferiors == [udp_a, serial_a]
+    serial_c.close()
+
+    payload = memoryview(bytes(range(256)) * 8)     # Multi-frame.
+    assert await pub_b.send_until(
+        Transfer(timestamp=Timestamp.now(),
+                 priority=Priority.LOW,
+                 transfer_id=7,
+                 fragmented_payload=[payload]),
+        monotonic_deadline=loop.time() + 1.0
+    )
+    rx = await sub_any_a.receive_until(loop.time() + 1.0)
+    assert rx is not None
+    assert b''.join(rx.fragmented_payload) == payload
+    assert rx.transfer_id == 7
+    assert not await sub_any_a.receive_until(loop.time() + 0.1)
+    assert all(s.transfers == 0 for s in sub_any_a.sample_statistics().inferiors)
+    assert sub_any_a.sample_statistics().reassembly_errors == 0
+    tr_a.frame_level_redundancy = False
+
     #
     # Termination.
     #
@@ -300,3 +333,5 @@ async def _unittest_redundant_transport() -> None:
                      fragmented_payload=[]),
             monotonic_deadline=loop.time() + 1.0
         )
+
+    await asyncio.sleep(0.1)  # Let the cancelled reader tasks of the input sessions terminate.
@@ -0,0 +1,213 @@
+#
+# Copyright (c) 2019 UAVCAN Development Team
+# This software is distributed under the terms of the MIT License.
+# Author: Pavel Kirienko <pavel.kirienko@zubax.com>
+#
+
+import os
+import time
+import random
+import typing
+import asyncio
+import pytest
+from pyuavcan.transport.serial import SerialFrame, StreamParser, SerialTransport
+# noinspection PyProtectedMember
+from pyuavcan.transport.serial._frame import HeaderTemplate
+
+
+def _unittest_serial_codec_throughput() -> None:
+    """
+    Measures the throughput of the frame encoder (escaping) and the stream parser (unescaping) in bytes per second.
+    The results are printed rather than asserted because they depend on the host;
+    for reference, a 3 Mbaud link carries about 300 KB/s.
+    The payload is random, so about 1 in 128 bytes requires escaping; a worst-case payload is tested separately.
+    """
+    from pyuavcan.transport import Priority, MessageDataSpecifier, Timestamp
+
+    mtu = 1024
+    num_frames = 1000
+
+    def run(payload: bytes) -> typing.Tuple[float, float]:
+        frame = SerialFrame(timestamp=Timestamp.now(),
+                            priority=Priority.NOMINAL,
+                            source_node_id=1,
+                            destination_node_id=None,
+                            data_specifier=MessageDataSpecifier(1234),
+                            data_type_hash=0xdead_beef_bad_c0ffe,
+                            transfer_id=0,
+                            index=0,
+                            end_of_transfer=True,
+                            payload=memoryview(payload))
+        buffer = bytearray(mtu * 3)
+
+        started_at = time.monotonic()
+        stream = bytearray()
+        for _ in range(num_frames):
+            stream += frame.compile_into(buffer)
+        tx_rate = len(stream) / (time.monotonic() - started_at)
+
+        parsed: typing.List[typing.Union[SerialFrame, memoryview]] = []
+        parser = StreamParser(parsed.append, mtu)
+        ts = Timestamp.now()
+        started_at = time.monotonic()
+        for offset in range(0, len(stream), 4096):     # Typical size of a read from a serial port.
+            parser.process_next_chunk(memoryview(stream)[offset:offset + 4096], ts)
+        rx_rate = len(stream) / (time.monotonic() - started_at)
+
+        assert len(parsed) == num_frames
+        assert all(isinstance(x, SerialFrame) and x.payload == payload for x in parsed)
+        return tx_rate, rx_rate
+
+    for name, payload in [
+        ('random', bytes(random.getrandbits(8) for _ in range(mtu))),
+        ('worst-case', bytes([SerialFrame.FRAME_DELIMITER_BYTE, SerialFrame.ESCAPE_PREFIX_BYTE]) * (mtu // 2)),
+    ]:
+        tx_rate, rx_rate = run(payload)
+        print(f'Serial codec throughput with {name} payload: '
+              f'encoding {tx_rate * 1e-6:.1f} MB/s, decoding {rx_rate * 1e-6:.1f} MB/s')
+        assert tx_rate > 0 and rx_rate > 0
+
+
+def _unittest_serial_frame_compilation_rate() -> None:
+    """
+    Measures the per-frame compilation time of small frames with and without a precompiled header template,
+    the latter being the case of frames emitted by an output session.
+    """
+    from pyuavcan.transport import Priority, MessageDataSpecifier, Timestamp
+
+    num_frames = 2000
+    template = HeaderTemplate(1, None, MessageDataSpecifier(1234), 0xdead_beef_bad_c0ffe)
+    buffer = bytearray(1000)
+    for payload_size in [0, 8, 64]:
+        durations: typing.List[float] = []
+        for header_template in [None, template]:
+            frames = [
+                SerialFrame(timestamp=Timestamp.now(),
+                            priority=Priority.NOMINAL,
+                            source_node_id=1,
+                            destination_node_id=None,
+                            data_specifier=MessageDataSpecifier(1234),
+                            data_type_hash=0xdead_beef_bad_c0ffe,
+                            transfer_id=tid,
+                            index=0,
+                            end_of_transfer=True,
+                            payload=memoryview(os.urandom(payload_size)),
+                            header_template=header_template)
+                for tid in range(num_frames)
+            ]
+            started_at = time.monotonic()
+            for fr in frames:
+                fr.compile_into(buffer)
+            durations.append((time.monotonic() - started_at) / num_frames)
+        print(f'Serial frame compilation with payload of {payload_size:2} bytes: '
+              f'{durations[0] * 1e6:.1f} us without header template, {durations[1] * 1e6:.1f} us with template')
+        assert all(x > 0 for x in durations)
+
+
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_slow_serial_transport_throughput() -> None:
+    """
+    Connects two transport instances through a pair of pseudo-terminals bridged in the event loop
+    and measures the transfer rate, the payload throughput, and the end-to-end latency percentiles
+    for single-frame and multi-frame transfers at various MTU and service transfer multiplier settings.
+    A pty does not emulate the baud rate, so the results reflect the processing overhead of the stack
+    rather than the link speed; the baud rate is only used to size the write batches (see the transport docs).
+    The results are printed rather than asserted because they depend on the host.
+    """
+    from pyuavcan.transport import ServiceDataSpecifier, PayloadMetadata, Transfer, TransferFrom
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+
+    if os.name != 'posix':  # pragma: no cover
+        pytest.skip('Serial transport benchmark skipped because pseudo-terminals are not available')
+
+    loop = asyncio.get_event_loop()
+    max_transfers = 50
+    max_bytes = 256 * 1024
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 100_000)
+
+    def bridge(src: int, dst: int) -> None:
+        os.set_blocking(src, False)
+        pending = bytearray()
+
+        def on_writable() -> None:
+            del pending[:os.write(dst, pending)]
+            if not pending:
+                loop.remove_writer(dst)
+
+        def on_readable() -> None:
+            if not pending:
+                loop.add_writer(dst, on_writable)
+            pending.extend(os.read(src, 65536))
+
+        loop.add_reader(src, on_readable)
+
+    async def run(mtu: int, multiplier: int, payload_size: int, non_blocking_io: bool) -> None:
+        # A new pty pair is used for each run to avoid interference with the leftovers of the previous one.
+        # The masters are cross-connected, so that whatever one slave transmits, the other slave receives.
+        master_a, slave_a = os.openpty()
+        master_b, slave_b = os.openpty()
+        bridge(master_a, master_b)
+        bridge(master_b, master_a)
+        tr_a = SerialTransport(os.ttyname(slave_a), 1, mtu=mtu, service_transfer_multiplier=multiplier,
+                               baudrate=3_000_000, non_blocking_io=non_blocking_io)
+        tr_b = SerialTransport(os.ttyname(slave_b), 2, mtu=mtu, service_transfer_multiplier=multiplier,
+                               baudrate=3_000_000, non_blocking_io=non_blocking_io)
+        ds = ServiceDataSpecifier(123, ServiceDataSpecifier.Role.REQUEST)
+        client = tr_a.get_output_session(OutputSessionSpecifier(ds, 2), meta)
+        server = tr_b.get_input_session(InputSessionSpecifier(ds, None), meta)
+        payload = [memoryview(os.urandom(payload_size))]
+        num_transfers = max(5, min(max_transfers, max_bytes // payload_size))
+
+        async def send(transfer_id: int) -> None:
+            assert await client.send_until(Transfer(timestamp=Timestamp.now(),
+                                                    priority=Priority.NOMINAL,
+                                                    transfer_id=transfer_id,
+                                                    fragmented_payload=payload),
+                                           loop.time() + 30.0)
+
+        async def receive() -> float:
+            tr = await server.receive_until(loop.time() + 30.0)
+            assert isinstance(tr, TransferFrom)
+            return time.monotonic()
+
+        # Latency: one transfer at a time.
+        latencies: typing.List[float] = []
+        for tid in range(num_transfers):
+            started_at = time.monotonic()
+            await send(tid)
+            latencies.append(await receive() - started_at)
+        latencies.sort()
+
+        # Throughput: the sender is not throttled by the receiver.
+        started_at = time.monotonic()
+        sender = asyncio.gather(*[send(tid) for tid in range(num_transfers, num_transfers * 2)])
+        for _ in range(num_transfers):
+            await receive()
+        elapsed = time.monotonic() - started_at
+        await sender
+
+        stats = tr_a.sample_statistics()
+        tr_a.close()
+        tr_b.close()
+        for fd in [master_a, master_b]:
+            loop.remove_reader(fd)
+            loop.remove_writer(fd)
+        for fd in [master_a, master_b, slave_a, slave_b]:
+            os.close(fd)
+
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1e3
+
+        print(f'Serial transport over pty: mtu={mtu:5} multiplier={multiplier} payload={payload_size:5} '
+              f'frames/transfer={stats.out_frames // (num_transfers * 2 * multiplier):2} '
+              f'non_blocking_io={non_blocking_io!s:5}: '
+              f'{num_transfers / elapsed:7.1f} transfers/s, {num_transfers * payload_size / elapsed * 1e-3:8.1f} KB/s; '
+              f'latency [ms] p50={percentile(0.5):.2f} p90={percentile(0.9):.2f} p99={percentile(0.99):.2f} '
+              f'max={latencies[-1] * 1e3:.2f}')
+        assert elapsed > 0
+
+    for non_blocking_io in [False, True]:
+        for mtu in [SerialTransport.DEFAULT_MTU, max(SerialTransport.VALID_MTU_RANGE)]:
+            for multiplier in [1, 2]:
+                for payload_size in [10, mtu * 4]:
+                    await run(mtu, multiplier, payload_size, non_blocking_io)
@@ -4,7 +4,9 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
+import os
 import typing
+import socket
 import asyncio
 import xml.etree.ElementTree
 import pytest
@@ -314,6 +316,31 @@ async def _unittest_serial_transport() -> None:
     print(tr.sample_statistics())
     assert tr.sample_statistics() == stats_reference
 
+    # Out-of-band data stream: the fragments separated by frame delimiters are read as one contiguous stream.
+    assert tr.out_of_band_stream.capacity == 0
+    tr.out_of_band_stream.capacity = 16
+    assert b'' == await tr.out_of_band_stream.read_until(get_monotonic() + 0.1)
+    tr.serial_port.write(b'hello' + bytes([SerialFrame.FRAME_DELIMITER_BYTE]) + b' world')
+    tr.serial_port.write(bytes([SerialFrame.FRAME_DELIMITER_BYTE]) + b'!' + bytes([SerialFrame.FRAME_DELIMITER_BYTE]))
+    stats_reference.in_bytes += 15
+    stats_reference.in_out_of_band_bytes += 12
+    received = b''
+    while len(received) < 12:
+        chunk = await tr.out_of_band_stream.read_until(get_monotonic() + 1.0)
+        assert chunk
+        received += chunk
+    assert received == b'hello world!'
+
+    tr.serial_port.write(b'0123456789abcdefXYZ' + bytes([SerialFrame.FRAME_DELIMITER_BYTE]))
+    stats_reference.in_bytes += 20
+    stats_reference.in_out_of_band_bytes += 19
+    stats_reference.in_out_of_band_bytes_dropped += 3
+    assert b'3456789abcdefXYZ' == await tr.out_of_band_stream.read_until(get_monotonic() + 1.0)
+    assert tr.out_of_band_stream.dropped_bytes == 3
+    print(tr.sample_statistics())
+    assert tr.sample_statistics() == stats_reference
+    tr.out_of_band_stream.capacity = 0
+
     #
     # Termination.
     #
@@ -345,5 +372,223 @@ async def _unittest_serial_transport() -> None:
         _ = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(12345), None), meta)
 
 
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_serial_transport_priority() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, Transfer, TransferFrom
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+
+    get_monotonic = asyncio.get_event_loop().time
+
+    tr = SerialTransport(serial_port='loop://', local_node_id=1234)
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 100_000)
+
+    bulk_pub = tr.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(100), None), meta)
+    bulk_sub = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(100), None), meta)
+    urgent_pub = tr.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(200), None), meta)
+    urgent_sub = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(200), None), meta)
+
+    num_bulk_frames = 50
+    bulk_payload = [_mem('x' * SerialTransport.DEFAULT_MTU)] * (num_bulk_frames - 1)
+
+    # Start a long low-priority transfer, then a high-priority one while the former is in progress.
+    bulk_task = asyncio.ensure_future(bulk_pub.send_until(
+        Transfer(timestamp=Timestamp.now(),
+                 priority=Priority.SLOW,
+                 transfer_id=1,
+                 fragmented_payload=bulk_payload),
+        monotonic_deadline=get_monotonic() + 5.0
+    ))
+    await asyncio.sleep(0)
+    assert await urgent_pub.send_until(
+        Transfer(timestamp=Timestamp.now(),
+                 priority=Priority.EXCEPTIONAL,
+                 transfer_id=2,
+                 fragmented_payload=[_mem('urgent')]),
+        monotonic_deadline=get_monotonic() + 5.0
+    )
+    # The urgent transfer has overtaken the bulk transfer, which was preempted at the frame boundary.
+    assert not bulk_task.done()
+    assert 0 < tr.sample_statistics().out_frames_per_priority[Priority.SLOW] < num_bulk_frames
+    assert await bulk_task
+
+    rx_transfer = await urgent_sub.receive_until(get_monotonic() + 5.0)
+    assert isinstance(rx_transfer, TransferFrom)
+    assert rx_transfer.fragmented_payload == [b'urgent']  # type: ignore
+    rx_transfer = await bulk_sub.receive_until(get_monotonic() + 5.0)
+    assert isinstance(rx_transfer, TransferFrom)
+    assert b''.join(rx_transfer.fragmented_payload) == b''.join(bulk_payload)
+
+    stats = tr.sample_statistics()
+    print(stats)
+    assert stats.out_transfers == 2
+    assert stats.out_frames_per_priority == {Priority.SLOW: num_bulk_frames, Priority.EXCEPTIONAL: 1}
+    assert set(stats.out_max_queueing_delay_per_priority) == {Priority.SLOW, Priority.EXCEPTIONAL}
+
+    # A transfer that cannot get access to the port before its deadline is not emitted.
+    bulk_task = asyncio.ensure_future(bulk_pub.send_until(
+        Transfer(timestamp=Timestamp.now(),
+                 priority=Priority.SLOW,
+                 transfer_id=3,
+                 fragmented_payload=bulk_payload),
+        monotonic_deadline=get_monotonic() + 5.0
+    ))
+    await asyncio.sleep(0)
+    assert not await urgent_pub.send_until(
+        Transfer(timestamp=Timestamp.now(),
+                 priority=Priority.OPTIONAL,
+                 transfer_id=4,
+                 fragmented_payload=[_mem('late')]),
+        monotonic_deadline=get_monotonic() + 0.001
+    )
+    assert await bulk_task
+    stats = tr.sample_statistics()
+    assert stats.out_transfers == 3
+    assert stats.out_incomplete == 1
+    assert stats.out_frames_per_priority == {Priority.SLOW: num_bulk_frames * 2, Priority.EXCEPTIONAL: 1}
+
+    tr.close()
+
+
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_serial_transport_coalescing() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, Transfer, TransferFrom
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+
+    get_monotonic = asyncio.get_event_loop().time
+
+    num_frames = 50
+    payload = [_mem('x' * SerialTransport.DEFAULT_MTU)] * (num_frames - 1)
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 100_000)
+
+    async def run(baudrate: int) -> SerialTransportStatistics:
+        tr = SerialTransport(serial_port='loop://', local_node_id=1234, baudrate=baudrate)
+        pub = tr.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(100), None), meta)
+        sub = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(100), None), meta)
+        assert await pub.send_until(
+            Transfer(timestamp=Timestamp.now(),
+                     priority=Priority.NOMINAL,
+                     transfer_id=1,
+                     fragmented_payload=payload),
+            monotonic_deadline=get_monotonic() + 5.0
+        )
+        rx_transfer = await sub.receive_until(get_monotonic() + 5.0)
+        assert isinstance(rx_transfer, TransferFrom)
+        assert b''.join(rx_transfer.fragmented_payload) == b''.join(payload)
+        stats = tr.sample_statistics()
+        print(stats)
+        tr.close()
+        assert stats.out_frames == stats.in_frames == num_frames
+        assert stats.out_bytes == stats.in_bytes
+        return stats
+
+    # 10 ms at 100 Mbaud is 100 KB, which is enough to fit the entire transfer into one write.
+    assert (await run(100_000_000)).out_writes == 1
+    # 10 ms at 10 Mbaud is 10 KB; the limit is reached by the tenth frame, so the frames are written in tens.
+    assert (await run(10_000_000)).out_writes == 5
+    # At low baud rates, each frame is written separately because a single frame takes longer than 10 ms.
+    assert (await run(115200)).out_writes == num_frames
+
+
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_serial_transport_non_blocking_io() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, Transfer, TransferFrom
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+    from pyuavcan.transport import InvalidMediaConfigurationError, ResourceClosedError
+
+    if os.name != 'posix':  # pragma: no cover
+        pytest.skip('Non-blocking I/O test skipped because it is not supported on this platform')
+
+    loop = asyncio.get_event_loop()
+    get_monotonic = loop.time
+
+    with pytest.raises(InvalidMediaConfigurationError, match=r'.*[Nn]on-blocking.*'):
+        SerialTransport(serial_port='loop://', local_node_id=None, non_blocking_io=True)
+
+    # Large enough to overflow the OS buffers, so that the writer has to wait for the descriptor to become writable.
+    payload = [_mem('y' * SerialTransport.DEFAULT_MTU)] * 99
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 200_000)
+
+    def start_echo(fd: int) -> None:
+        # The data is looped back to the transport, so it receives its own transfers.
+        os.set_blocking(fd, False)
+        pending = bytearray()
+
+        def on_writable() -> None:
+            del pending[:os.write(fd, pending)]
+            if not pending:
+                loop.remove_writer(fd)
+
+        def on_readable() -> None:
+            try:
+                data = os.read(fd, 65536)
+            except OSError:     # The other end is closed.
+                loop.remove_reader(fd)
+                return
+            if not pending:
+                loop.add_writer(fd, on_writable)
+            pending.extend(data)
+
+        loop.add_reader(fd, on_readable)
+
+    async def run(tr: SerialTransport) -> None:
+        assert tr.serial_port.is_open
+        pub = tr.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(100), None), meta)
+        sub = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(100), None), meta)
+        for transfer_id in range(3):
+            assert await pub.send_until(
+                Transfer(timestamp=Timestamp.now(),
+                         priority=Priority.NOMINAL,
+                         transfer_id=transfer_id,
+                         fragmented_payload=payload),
+                monotonic_deadline=get_monotonic() + 10.0
+            )
+            rx_transfer = await sub.receive_until(get_monotonic() + 10.0)
+            assert isinstance(rx_transfer, TransferFrom)
+            assert rx_transfer.transfer_id == transfer_id
+            assert b''.join(rx_transfer.fragmented_payload) == b''.join(payload)
+        stats = tr.sample_statistics()
+        print(stats)
+        assert stats.out_frames == stats.in_frames == 300
+        assert stats.out_bytes == stats.in_bytes
+        assert stats.in_out_of_band_bytes == 0
+
+    # Pseudo-terminal; the transport is connected to the slave end.
+    master, slave = os.openpty()
+    try:
+        start_echo(master)
+        tr = SerialTransport(serial_port=os.ttyname(slave), local_node_id=1234, non_blocking_io=True)
+        await run(tr)
+        tr.close()
+        tr.close()  # Idempotency.
+        with pytest.raises(ResourceClosedError):
+            tr.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(100), None), meta)
+    finally:
+        loop.remove_reader(master)
+        loop.remove_writer(master)
+        os.close(master)
+        os.close(slave)
+
+    # TCP connection; the transport is the client.
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    host, port = listener.getsockname()
+    tr = SerialTransport(serial_port=f'socket://{host}:{port}', local_node_id=1234, non_blocking_io=True)
+    server, _ = listener.accept()
+    start_echo(server.fileno())
+    await run(tr)
+
+    # When the remote end closes the connection, the transport terminates itself.
+    loop.remove_reader(server.fileno())
+    loop.remove_writer(server.fileno())
+    server.close()
+    listener.close()
+    await asyncio.sleep(0.5)
+    assert not tr.serial_port.is_open
+    with pytest.raises(ResourceClosedError):
+        tr.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(100), None), meta)
+    tr.close()
+
+
 def _mem(data: typing.Union[str, bytes, bytearray]) -> memoryview:
     return memoryview(data.encode() if isinstance(data, str) else data)
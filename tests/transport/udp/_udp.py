@@ -4,6 +4,7 @@
 # Author: Pavel Kirienko <pavel.kirienko@zubax.com>
 #
 
+import os
 import typing
 import asyncio
 import xml.etree.ElementTree
@@ -29,6 +30,14 @@ async def _unittest_udp_transport() -> None:
         _ = UDPTransport(ip_address='127.0.0.111/8',
                          service_transfer_multiplier=100)
 
+    with pytest.raises(ValueError):
+        _ = UDPTransport(ip_address='127.0.0.111/8',
+                         receive_buffer_size=0)
+
+    with pytest.raises(ValueError):
+        _ = UDPTransport(ip_address='127.0.0.111/8',
+                         send_buffer_size=-1)
+
     tr = UDPTransport('127.0.0.111/8', mtu=9000)
     tr2 = UDPTransport('127.0.0.222/8', service_transfer_multiplier=2)
 
@@ -185,6 +194,12 @@ async def _unittest_udp_transport() -> None:
     assert tr.sample_statistics().demultiplexer[
         ServiceDataSpecifier(444, ServiceDataSpecifier.Role.REQUEST)
     ].accepted_datagrams == {222: 3 * 2}  # Deterministic data loss mitigation is enabled, multiplication factor 2
+    # The second copy of the transfer is rejected frame by frame without being processed by the reassembler.
+    server_listener_stats = server_listener.sample_statistics()
+    assert isinstance(server_listener_stats, pyuavcan.transport.udp.UDPInputSessionStatistics)
+    assert server_listener_stats.frames == 3 * 2
+    assert server_listener_stats.duplicate_frames == 3
+    assert server_listener_stats.transfers == 1
     print('tr2:', tr2.sample_statistics())
     assert tr2.sample_statistics().demultiplexer[
         ServiceDataSpecifier(444, ServiceDataSpecifier.Role.RESPONSE)
@@ -231,5 +246,273 @@ async def _unittest_udp_transport() -> None:
         _ = tr2.get_input_session(InputSessionSpecifier(MessageDataSpecifier(12345), None), meta)
 
 
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_udp_transport_multicast() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, Transfer, TransferFrom
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+
+    get_monotonic = asyncio.get_event_loop().time
+
+    tr = UDPTransport('127.0.0.111/8', multicast=True)
+    tr2 = UDPTransport('127.0.0.222/8', multicast=True)
+    assert tr.descriptor == '<udp srv_mult="1" multicast="1">127.0.0.111/8</udp>'
+
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 10000)
+    publisher = tr2.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(2345), None), meta)
+    subscriber = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(2345), None), meta)
+    # This subject is published into a different group, so the datagrams never reach the other socket.
+    unrelated = tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(2346), None), meta)
+
+    assert await publisher.send_until(
+        Transfer(timestamp=Timestamp.now(),
+                 priority=Priority.LOW,
+                 transfer_id=77777,
+                 fragmented_payload=[_mem('hello')]),
+        monotonic_deadline=get_monotonic() + 5.0
+    )
+
+    rx_transfer = await subscriber.receive_until(get_monotonic() + 5.0)
+    assert isinstance(rx_transfer, TransferFrom)
+    assert rx_transfer.transfer_id == 77777
+    assert rx_transfer.source_node_id == 222
+    assert rx_transfer.fragmented_payload == [b'hello']  # type: ignore
+
+    assert None is await unrelated.receive_until(get_monotonic() + 0.5)
+    assert tr.sample_statistics().demultiplexer[MessageDataSpecifier(2345)].accepted_datagrams == {222: 1}
+    assert tr.sample_statistics().demultiplexer[MessageDataSpecifier(2346)].accepted_datagrams == {}
+    assert tr.sample_statistics().demultiplexer[MessageDataSpecifier(2346)].dropped_datagrams == {}
+
+    tr.close()
+    tr2.close()
+
+
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_udp_transport_ipv6() -> None:
+    import socket
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, Transfer, TransferFrom
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+    from pyuavcan.transport import InvalidMediaConfigurationError
+
+    if not os.path.exists('/proc/net/igmp6'):
+        pytest.skip('The joined IPv6 multicast groups can only be inspected on GNU/Linux')
+
+    get_monotonic = asyncio.get_event_loop().time
+
+    # The loopback interface has only one IPv6 address, which is mapped to the node-ID 1.
+    # The datagrams whose source node-ID equals the local node-ID are discarded, so the subscriber is anonymous.
+    # The scope identifier makes it join the groups on the loopback interface rather than on the default one.
+    pub_tr = UDPTransport('::1/116')
+    sub_tr = UDPTransport('::1:1%lo/64')
+    assert pub_tr.local_node_id == 1
+    assert pub_tr.local_ip_address_with_netmask == '::1/116'
+    assert sub_tr.local_node_id is None
+
+    # Subject 2345 maps to the UDP port 16384 + 2345 = 0x4929; the group is derived from the network prefix.
+    # Only the groups of the subscribed subjects are joined.
+    group, unrelated_group = 'ff32:40::4929', 'ff32:40::492a'
+
+    def joined_groups() -> typing.Set[str]:
+        with open('/proc/net/igmp6') as f:
+            hexes = {line.split()[2] for line in f if line.strip()}
+        return {g for g in (group, unrelated_group) if socket.inet_pton(socket.AF_INET6, g).hex() in hexes}
+
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 10000)
+    subscriber = sub_tr.get_input_session(InputSessionSpecifier(MessageDataSpecifier(2345), None), meta)
+    assert joined_groups() == {group}
+
+    try:
+        publisher = pub_tr.get_output_session(OutputSessionSpecifier(MessageDataSpecifier(2345), None), meta)
+    except InvalidMediaConfigurationError as ex:
+        pub_tr.close()
+        sub_tr.close()
+        pytest.skip(f'The loopback interface cannot emit IPv6 multicast on this system '
+                    f'(it can be enabled with "ip link set lo multicast on"): {ex}')
+
+    assert publisher.socket.getpeername()[0] == group
+    assert await publisher.send_until(
+        Transfer(timestamp=Timestamp.now(),
+                 priority=Priority.LOW,
+                 transfer_id=77777,
+                 fragmented_payload=[_mem('hello')]),
+        monotonic_deadline=get_monotonic() + 5.0
+    )
+    rx_transfer = await subscriber.receive_until(get_monotonic() + 5.0)
+    pub_tr.close()
+    sub_tr.close()
+    await asyncio.sleep(2.0)    # The sockets are released when the reader threads notice the closure.
+    assert joined_groups() == set()
+    if rx_transfer is None:
+        pytest.skip('IPv6 multicast is not routed over the loopback interface on this system')
+
+    assert isinstance(rx_transfer, TransferFrom)
+    assert rx_transfer.transfer_id == 77777
+    assert rx_transfer.source_node_id == 1
+    assert rx_transfer.fragmented_payload == [b'hello']  # type: ignore
+
+
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_udp_transport_socket_buffers() -> None:
+    import socket
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, InputSessionSpecifier, OutputSessionSpecifier
+
+    tr = UDPTransport('127.0.0.111/8', receive_buffer_size=100_000, send_buffer_size=50_000)
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 10000)
+    ds = MessageDataSpecifier(2345)
+    _ = tr.get_input_session(InputSessionSpecifier(ds, None), meta)
+    _ = tr.get_output_session(OutputSessionSpecifier(ds, None), meta)
+
+    # The OS may round the values up (e.g., GNU/Linux doubles them) but never below the requested size
+    # as long as it is within the system limits.
+    # noinspection PyProtectedMember
+    rx_sock = tr._demultiplexer_registry[ds]._sock
+    tx_sock = tr.output_sessions[0].socket
+    assert rx_sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 100_000
+    assert tx_sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) >= 50_000
+    assert tr.sample_statistics().demultiplexer[ds].kernel_dropped_datagrams == 0
+
+    tr.close()
+
+
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_udp_transport_contiguous_payload() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, Transfer, TransferFrom
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+
+    get_monotonic = asyncio.get_event_loop().time
+
+    tr = UDPTransport('127.0.0.111/8', contiguous_payload=True)
+    tr2 = UDPTransport('127.0.0.222/8')
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 10000)
+    ds = MessageDataSpecifier(2345)
+    publisher = tr2.get_output_session(OutputSessionSpecifier(ds, None), meta)
+    subscribers = [
+        tr.get_input_session(InputSessionSpecifier(ds, None), meta),
+        tr.get_input_session(InputSessionSpecifier(ds, 222), meta),
+    ]
+
+    payload = _mem('0123456789' * 250)     # Three frames with the default MTU.
+    assert await publisher.send_until(
+        Transfer(timestamp=Timestamp.now(),
+                 priority=Priority.LOW,
+                 transfer_id=0,
+                 fragmented_payload=[payload]),
+        monotonic_deadline=get_monotonic() + 5.0
+    )
+    for ses in subscribers:
+        rx_transfer = await ses.receive_until(get_monotonic() + 5.0)
+        assert isinstance(rx_transfer, TransferFrom)
+        assert len(rx_transfer.fragmented_payload) == 1
+        assert rx_transfer.fragmented_payload[0] == payload
+
+    tr.close()
+    tr2.close()
+
+
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_udp_transport_transfer_queue_capacity() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, Transfer, TransferFrom
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+    from pyuavcan.transport.udp import UDPInputSessionStatistics
+    from pyuavcan.transport.commons.high_overhead_transport import TransferQueue
+
+    get_monotonic = asyncio.get_event_loop().time
+
+    tr = UDPTransport('127.0.0.111/8')
+    tr2 = UDPTransport('127.0.0.222/8')
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 10000)
+    ds = MessageDataSpecifier(2345)
+    publisher = tr2.get_output_session(OutputSessionSpecifier(ds, None), meta)
+    newest = tr.get_input_session(InputSessionSpecifier(ds, None), meta)
+    oldest = tr.get_input_session(InputSessionSpecifier(ds, 222), meta)
+    assert newest.transfer_queue_capacity is None
+    assert newest.transfer_queue_overflow_policy == TransferQueue.OverflowPolicy.DROP_NEWEST
+    with pytest.raises(ValueError):
+        newest.transfer_queue_capacity = 0
+    newest.transfer_queue_capacity = 2
+    oldest.transfer_queue_capacity = 2
+    oldest.transfer_queue_overflow_policy = TransferQueue.OverflowPolicy.DROP_OLDEST
+
+    for transfer_id in range(5):
+        assert await publisher.send_until(
+            Transfer(timestamp=Timestamp.now(),
+                     priority=Priority.LOW,
+                     transfer_id=transfer_id,
+                     fragmented_payload=[_mem('hello')]),
+            monotonic_deadline=get_monotonic() + 5.0
+        )
+    await asyncio.sleep(0.5)    # Let the transfers accumulate in the queues.
+
+    async def receive_transfer_ids(ses: pyuavcan.transport.InputSession) -> typing.List[int]:
+        out: typing.List[int] = []
+        while True:
+            transfer = await ses.receive_until(get_monotonic() + 0.1)
+            if transfer is None:
+                return out
+            assert isinstance(transfer, TransferFrom)
+            out.append(transfer.transfer_id)
+
+    for ses in (newest, oldest):
+        stats = ses.sample_statistics()
+        assert isinstance(stats, UDPInputSessionStatistics)
+        assert stats.transfers == 5
+        assert stats.dropped_transfers == 3
+        assert stats.drops == 3
+    assert await receive_transfer_ids(newest) == [0, 1]
+    assert await receive_transfer_ids(oldest) == [3, 4]
+
+    tr.close()
+    tr2.close()
+
+
+@pytest.mark.asyncio    # type: ignore
+async def _unittest_udp_transport_reassembler_eviction() -> None:
+    from pyuavcan.transport import MessageDataSpecifier, PayloadMetadata, Transfer
+    from pyuavcan.transport import Priority, Timestamp, InputSessionSpecifier, OutputSessionSpecifier
+    from pyuavcan.transport.udp import PromiscuousUDPInputSession
+
+    get_monotonic = asyncio.get_event_loop().time
+
+    tr = UDPTransport('127.0.0.111/8')
+    publishers = [UDPTransport(f'127.0.0.{i}/8') for i in (1, 2)]
+    meta = PayloadMetadata(0x_bad_c0ffee_0dd_f00d, 10000)
+    ds = MessageDataSpecifier(2345)
+    subscriber = tr.get_input_session(InputSessionSpecifier(ds, None), meta)
+    assert isinstance(subscriber, PromiscuousUDPInputSession)
+    with pytest.raises(ValueError):
+        subscriber.reassembler_idle_timeout = -1
+    subscriber.reassembler_idle_timeout = 0.2
+    subscriber.transfer_id_timeout = 0.2
+
+    async def publish(pub_tr: UDPTransport) -> None:
+        ses = pub_tr.get_output_session(OutputSessionSpecifier(ds, None), meta)
+        assert await ses.send_until(
+            Transfer(timestamp=Timestamp.now(),
+                     priority=Priority.LOW,
+                     transfer_id=0,
+                     fragmented_payload=[_mem('hello')]),
+            monotonic_deadline=get_monotonic() + 5.0
+        )
+        assert await subscriber.receive_until(get_monotonic() + 5.0) is not None
+
+    await publish(publishers[0])
+    await publish(publishers[1])
+    stats = subscriber.sample_statistics()
+    assert stats.live_reassemblers == 2
+    assert stats.evicted_reassemblers == 0
+    assert stats.reassembly_errors_per_source_node_id.keys() == {1, 2}
+
+    await asyncio.sleep(0.5)
+    await publish(publishers[1])
+    stats = subscriber.sample_statistics()
+    assert stats.live_reassemblers == 1
+    assert stats.evicted_reassemblers == 2      # The second one was evicted and then created anew.
+    assert stats.reassembly_errors_per_source_node_id.keys() == {2}
+    assert stats.transfers == 3
+
+    tr.close()
+    for t in publishers:
+        t.close()
+
+
 def _mem(data: typing.Union[str, bytes, bytearray]) -> memoryview:
     return memoryview(data.encode() if isinstance(data, str) else data)